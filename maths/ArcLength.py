@@ -0,0 +1,306 @@
+from typing import Optional, Self
+from .types import FloatOrArray
+
+from numpy.typing import NDArray
+import numpy as np
+from .Maths import pick, wrap, writeOut
+
+# REF
+# https://www.geometrictools.com/Documentation/MovingAlongCurveSpecifiedSpeed.pdf
+# https://en.wikipedia.org/wiki/Gaussian_quadrature
+
+# 5 point Gauss-Legendre nodes & weights on -1:1
+GL_X, GL_W = np.polynomial.legendre.leggauss(5)
+
+
+# Arc length table of a Spline, maps distance along the curve to u & back. The u range
+# is split adaptively until each piece's length estimate is within the error bound, so
+# tight bends get more entries than straight runs. Lookups binary search the table then
+# refine with newton steps so results stay accurate between entries. The table remembers
+# the spline version it was built from & rebuilds itself once the points change.
+class ArcLength:
+    # region MAIN
+    # tol : bound on the total length error & on the error of each distance lookup,
+    # in the units of the spline
+    def __init__(self, spline, tol: float = 1e-4, maxDepth: int = 16, minDiv: int = 2):
+        self.spline = spline
+        self.tol = tol
+        self.maxDepth = maxDepth
+        self.minDiv = minDiv
+
+        self.version = -1
+        self.u: NDArray = None  # u at every table entry
+        self.dist: NDArray = None  # Distance along the curve at every table entry
+        self.slope0: NDArray = None  # du/dd at the start of every table piece
+        self.slope1: NDArray = None  # du/dd at the end of every table piece
+        self.error = 0.0  # Estimated total length error of the table
+        self._coarsePos: Optional[NDArray] = None
+        self.update()
+
+    def __repr__(self) -> str:
+        return f"ArcLength(length:{self.length}, entries:{self.u.shape[0]}, error:{self.error})"
+
+    # endregion
+
+    # region SETTERS / GETTERS
+
+    @property
+    def length(self) -> float:
+        return float(self.dist[-1])
+
+    @property
+    def isStale(self) -> bool:
+        return self.version != self.spline.version
+
+    # Rebuild the table if the spline changed since it was built
+    def update(self) -> Self:
+        if self.isStale:
+            self.rebuild()
+        return self
+
+    def rebuild(self) -> Self:
+        spl = self.spline
+        knots = spl.knots
+        totalW = knots[-1] - knots[0]
+
+        # Start with minDiv pieces per segment, pieces never cross a segment so
+        # each one only covers a single polynomial
+        t = np.linspace(0, 1, self.minDiv + 1)[:-1]
+        a = (knots[:-1, None] + np.diff(knots)[:, None] * t).ravel()
+        b = np.append(a[1:], knots[-1])
+        ln = self._gauss(a, b)
+
+        doneA, doneLn = [], []
+        self.error = 0.0
+        for depth in range(self.maxDepth + 1):
+            m = (a + b) * 0.5
+            lnA = self._gauss(a, m)
+            lnB = self._gauss(m, b)
+            err = np.abs(lnA + lnB - ln)
+
+            # Pieces get a share of the length error bound by how much of u they
+            # cover. Distance lookups inside a piece must also be within tol.
+            ok = err <= self.tol * (b - a) / totalW
+            ok &= self._lookupError(a, m, b, lnA, lnB) <= self.tol
+            if depth == self.maxDepth:
+                ok[:] = True
+
+            doneA.extend((a[ok], m[ok]))
+            doneLn.extend((lnA[ok], lnB[ok]))
+            self.error += float(np.sum(err[ok]))
+
+            if ok.all():
+                break
+
+            split = ~ok
+            a, b = (
+                np.concatenate((a[split], m[split])),
+                np.concatenate((m[split], b[split])),
+            )
+            ln = np.concatenate((lnA[split], lnB[split]))
+
+        a = np.concatenate(doneA)
+        order = np.argsort(a)
+
+        self.u = np.append(a[order], knots[-1])
+        self.dist = np.concatenate(([0.0], np.cumsum(np.concatenate(doneLn)[order])))
+
+        self.slope0, self.slope1 = self._slopes(
+            self.u[:-1], self.u[1:], np.diff(self.dist)
+        )
+        self.version = spl.version
+        self._coarsePos = None
+        return self
+
+    # endregion
+
+    # region LOOKUPS
+
+    # Distance along the curve at u
+    def uToDist(self, u: FloatOrArray, out: Optional[NDArray] = None) -> FloatOrArray:
+        self.update()
+        u = self._clampU(u)
+        i = np.minimum(
+            np.searchsorted(self.u, u, side="right") - 1, self.u.shape[0] - 2
+        )
+        return writeOut(self.dist[i] + self._gauss(self.u[i], u), out)
+
+    # u at a distance along the curve. Open curves clamp the distance to 0:length,
+    # closed ones wrap around. The table entry is interpolated with the curve speed at
+    # both ends, newton steps can refine it further at the cost of curve evaluations.
+    def distToU(
+        self, d: FloatOrArray, newton: int = 0, out: Optional[NDArray] = None
+    ) -> FloatOrArray:
+        self.update()
+        ln = self.length
+        d = wrap(d, 0.0, ln) if self.spline.closed else np.clip(d, 0.0, ln)
+
+        i = np.minimum(
+            np.searchsorted(self.dist, d, side="right") - 1, self.u.shape[0] - 2
+        )
+        u0, u1 = self.u[i], self.u[i + 1]
+        d0 = self.dist[i]
+        w = self.dist[i + 1] - d0
+        t = (d - d0) / pick(w > 0, w, 1.0)  # Zero length pieces stay at u0
+
+        u = np.clip(alHermite(t, u0, u1, w, self.slope0[i], self.slope1[i]), u0, u1)
+
+        # Newton on dist(u) - d where the derivative of dist is the curve's speed
+        for _ in range(newton):
+            err = d0 + self._gauss(u0, u) - d
+            u = np.clip(u - err / np.maximum(self._speed(u), 1e-12), u0, u1)
+
+        return writeOut(u, out)
+
+    # Position at a distance along the curve
+    def atDist(self, d: FloatOrArray, out: Optional[NDArray] = None) -> NDArray:
+        return self.spline.at(self.distToU(d), out)
+
+    # Positions spaced every step units along the curve, starting at distance
+    # offset. Constant speed motion is sampleEvery( speed * dt )
+    def sampleEvery(
+        self, step: float, offset: float = 0.0, out: Optional[NDArray] = None
+    ) -> NDArray:
+        self.update()
+        d = np.arange(offset, self.length + step * 1e-6, step)
+        return self.atDist(d, out)
+
+    # u of the closest point on the curve for every point in pts, shape (..., dim).
+    # Pass the u of the last frame as hint when tracking moving points, it skips
+    # the coarse search over the whole curve.
+    def closestU(
+        self,
+        pts: NDArray,
+        hint: Optional[FloatOrArray] = None,
+        iters: int = 8,
+        out: Optional[NDArray] = None,
+    ) -> FloatOrArray:
+        self.update()
+        spl = self.spline
+        pts = np.asarray(pts, dtype=np.float32)
+        p = pts.reshape(-1, spl.dim)
+
+        if hint is None:
+            u = self._coarseSearch(p)
+        else:
+            u = np.broadcast_to(np.asarray(hint, dtype=np.float64), p.shape[:1]).copy()
+
+        v = spl.at(u).reshape(p.shape) - p
+        dSq = np.sum(v * v, axis=1)
+        scale = np.ones_like(u)
+        maxStep = (spl.end - spl.start) / spl.segCount
+
+        # Gauss-newton on f(u) = dot( P(u) - p, P'(u) ), zero where the direction to
+        # the point is perpendicular to the curve. Leaving out the curvature term keeps
+        # it stable in tight bends. Steps are capped to a segment & only kept when they
+        # get closer, else the next try for that point is halved.
+        for _ in range(iters):
+            d1 = spl.deriv(u, 1).reshape(p.shape)
+            f = np.sum(v * d1, axis=1)
+            df = np.maximum(np.sum(d1 * d1, axis=1), 1e-12)
+            step = np.clip(f / df * scale, -maxStep, maxStep)
+
+            # Spline evaluates t as float32, smaller steps are just noise
+            if np.max(np.abs(step)) < maxStep * 1e-6:
+                break
+
+            uNew = self._clampU(u - step)
+
+            vNew = spl.at(uNew).reshape(p.shape) - p
+            dNew = np.sum(vNew * vNew, axis=1)
+            better = dNew < dSq
+
+            u = np.where(better, uNew, u)
+            v = np.where(better[:, None], vNew, v)
+            dSq = np.where(better, dNew, dSq)
+            scale = np.where(better, 1.0, scale * 0.5)
+
+        shape = pts.shape[:-1] if spl.dim > 1 else pts.shape
+        return writeOut(u.reshape(shape), out)
+
+    # endregion
+
+    # region INTERNAL
+
+    # Curve speed |P'(u)|
+    def _speed(self, u: FloatOrArray) -> NDArray:
+        u = np.asarray(u)
+        d = self.spline.deriv(u).reshape(u.shape + (self.spline.dim,))
+        return np.sqrt(np.sum(np.square(d, dtype=np.float64), axis=-1))
+
+    # Length of the curve between a & b with gauss-legendre quadrature
+    def _gauss(self, a: FloatOrArray, b: FloatOrArray) -> NDArray:
+        a = np.asarray(a, dtype=np.float64)
+        half = (np.asarray(b, dtype=np.float64) - a) * 0.5
+        u = (a + half)[..., None] + half[..., None] * GL_X
+        return half * np.sum(self._speed(u) * GL_W, axis=-1)
+
+    # du/dd at both ends of pieces a:b of length w. The end is sampled just inside the
+    # piece so it uses the same segment when the curve speed jumps at a knot. Capped at
+    # 3x the slope of the piece so u stays monotonic, which also covers zero speeds.
+    def _slopes(self, a: NDArray, b: NDArray, w: NDArray):
+        cap = 3 * (b - a) / np.maximum(w, 1e-12)
+        s0 = np.minimum(1 / np.maximum(self._speed(a), 1e-12), cap)
+        s1 = np.minimum(1 / np.maximum(self._speed(b - (b - a) * 1e-9), 1e-12), cap)
+        return s0, s1
+
+    # Distance error of table lookups in pieces a:b, checked at the middle & quarter
+    # points so an error curve that crosses zero at one of them is still caught
+    def _lookupError(
+        self, a: NDArray, m: NDArray, b: NDArray, lnA: NDArray, lnB: NDArray
+    ) -> NDArray:
+        w = lnA + lnB
+        s0, s1 = self._slopes(a, b, w)
+
+        q1 = (a + m) * 0.5
+        q3 = (m + b) * 0.5
+        u = np.stack((q1, m, q3))
+        d = np.stack((self._gauss(a, q1), lnA, lnA + self._gauss(m, q3)))
+
+        uPred = alHermite(d / np.maximum(w, 1e-12), a, b, w, s0, s1)
+        return np.max(np.abs(uPred - u) * self._speed(u), axis=0)
+
+    def _clampU(self, u: FloatOrArray) -> FloatOrArray:
+        k = self.spline.knots
+        return wrap(u, k[0], k[-1]) if self.spline.closed else np.clip(u, k[0], k[-1])
+
+    # Nearest table entry as the starting point for newton. Entries are denser where
+    # the curve bends which is where nearby parts of the curve are easy to mix up.
+    def _coarseSearch(self, p: NDArray) -> NDArray:
+        if self._coarsePos is None:
+            self._coarsePos = self.spline.at(self.u).reshape(self.u.shape[0], -1)
+
+        s = self._coarsePos
+        sSq = np.sum(s * s, axis=1)
+        u = np.empty(p.shape[0], dtype=np.float64)
+
+        # |p - s|^2 = |p|^2 - 2 p.s + |s|^2, |p|^2 is the same for every entry.
+        # Points are done in blocks to keep the distance matrix small
+        blk = max(1, (1 << 22) // s.shape[0])
+        for i in range(0, p.shape[0], blk):
+            dSq = sSq - 2 * (p[i : i + blk] @ s.T)
+            u[i : i + blk] = self.u[np.argmin(dSq, axis=1)]
+
+        return u
+
+    # endregion
+
+
+# region REUSABLE OPS
+
+
+# Cubic hermite between u0 & u1 at t, s0 & s1 are the slopes per unit of w
+def alHermite(
+    t: NDArray, u0: NDArray, u1: NDArray, w: NDArray, s0: NDArray, s1: NDArray
+) -> NDArray:
+    t2 = t * t
+    t3 = t2 * t
+    return (
+        (2 * t3 - 3 * t2 + 1) * u0
+        + (t3 - 2 * t2 + t) * w * s0
+        + (t3 - t2) * w * s1
+        + (3 * t2 - 2 * t3) * u1
+    )
+
+
+# endregion
@@ -1,210 +1,269 @@
+from typing import Callable, Dict, Optional
+from .types import FloatOrArray
+from .Maths import pick, writeOut
+from numpy.typing import NDArray
 import numpy as np
 
+# Every easing takes a float or an ndarray of k values. Branches are evaluated
+# for all values & picked with pick() so arrays never loop in python. Pass out=
+# to write array results into an existing buffer.
+
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-def quad_in(k: float) -> float:
-    return k * k
+def quad_in(k: FloatOrArray, out: Optional[NDArray] = None) -> FloatOrArray:
+    return writeOut(k * k, out)
 
 
-def quad_out(k: float) -> float:
-    return k * (2 - k)
+def quad_out(k: FloatOrArray, out: Optional[NDArray] = None) -> FloatOrArray:
+    return writeOut(k * (2 - k), out)
 
 
-def quad_inout(k: float) -> float:
-    k = k * 2
-    if k < 1:
-        return 0.5 * k * k
+def quad_inout(k: FloatOrArray, out: Optional[NDArray] = None) -> FloatOrArray:
+    k2 = k * 2
+    a = 0.5 * k2 * k2
 
-    k = k - 1
-    return -0.5 * (k * (k - 2) - 1)
+    k = k2 - 1
+    b = -0.5 * (k * (k - 2) - 1)
+    return writeOut(pick(k2 < 1, a, b), out)
 
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-def cubic_in(k: float) -> float:
-    return k * k * k
+def cubic_in(k: FloatOrArray, out: Optional[NDArray] = None) -> FloatOrArray:
+    return writeOut(k * k * k, out)
 
 
-def cubic_out(k: float) -> float:
+def cubic_out(k: FloatOrArray, out: Optional[NDArray] = None) -> FloatOrArray:
     k = k - 1
-    return k * k * k + 1
+    return writeOut(k * k * k + 1, out)
 
 
-def cubic_inout(k: float) -> float:
-    k = k * 2
-    if k < 1:
-        return 0.5 * k * k * k
+def cubic_inout(k: FloatOrArray, out: Optional[NDArray] = None) -> FloatOrArray:
+    k2 = k * 2
+    a = 0.5 * k2 * k2 * k2
 
-    k = k - 2
-    return 0.5 * (k * k * k + 2)
+    k = k2 - 2
+    b = 0.5 * (k * k * k + 2)
+    return writeOut(pick(k2 < 1, a, b), out)
 
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-def quart_in(k: float) -> float:
-    return k * k * k * k
+def quart_in(k: FloatOrArray, out: Optional[NDArray] = None) -> FloatOrArray:
+    return writeOut(k * k * k * k, out)
 
 
-def quart_out(k: float) -> float:
+def quart_out(k: FloatOrArray, out: Optional[NDArray] = None) -> FloatOrArray:
     k = k - 1
-    return 1 - (k * k * k * k)
+    return writeOut(1 - (k * k * k * k), out)
 
 
-def quart_inout(k: float) -> float:
-    k = k * 2
-    if k < 1:
-        return 0.5 * k * k * k * k
+def quart_inout(k: FloatOrArray, out: Optional[NDArray] = None) -> FloatOrArray:
+    k2 = k * 2
+    a = 0.5 * k2 * k2 * k2 * k2
 
-    k = k - 2
-    return -0.5 * (k * k * k * k - 2)
+    k = k2 - 2
+    b = -0.5 * (k * k * k * k - 2)
+    return writeOut(pick(k2 < 1, a, b), out)
 
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-def quint_in(k: float) -> float:
-    return k * k * k * k * k
+def quint_in(k: FloatOrArray, out: Optional[NDArray] = None) -> FloatOrArray:
+    return writeOut(k * k * k * k * k, out)
 
 
-def quint_out(k: float) -> float:
+def quint_out(k: FloatOrArray, out: Optional[NDArray] = None) -> FloatOrArray:
     k = k - 1
-    return k * k * k * k * k + 1
+    return writeOut(k * k * k * k * k + 1, out)
 
 
-def quint_inout(k: float) -> float:
-    k = k * 2
-    if k < 1:
-        return 0.5 * k * k * k * k * k
+def quint_inout(k: FloatOrArray, out: Optional[NDArray] = None) -> FloatOrArray:
+    k2 = k * 2
+    a = 0.5 * k2 * k2 * k2 * k2 * k2
 
-    k = k - 2
-    return 0.5 * (k * k * k * k * k + 2)
+    k = k2 - 2
+    b = 0.5 * (k * k * k * k * k + 2)
+    return writeOut(pick(k2 < 1, a, b), out)
 
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-def sine_in(k: float) -> float:
-    return 1 - np.cos(k * np.pi / 2)
+def sine_in(k: FloatOrArray, out: Optional[NDArray] = None) -> FloatOrArray:
+    return writeOut(1 - np.cos(k * np.pi / 2), out)
 
 
-def sine_out(k: float) -> float:
-    return np.sin(k * np.pi / 2)
+def sine_out(k: FloatOrArray, out: Optional[NDArray] = None) -> FloatOrArray:
+    return writeOut(np.sin(k * np.pi / 2), out)
 
 
-def sine_inout(k: float) -> float:
-    return 0.5 * (1 - np.cos(np.pi * k))
+def sine_inout(k: FloatOrArray, out: Optional[NDArray] = None) -> FloatOrArray:
+    return writeOut(0.5 * (1 - np.cos(np.pi * k)), out)
 
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-def exp_in(k: float) -> float:
-    if k == 0:
-        return 0
-
-    return np.pow(1024, k - 1)
+def exp_in(k: FloatOrArray, out: Optional[NDArray] = None) -> FloatOrArray:
+    return writeOut(pick(k == 0, 0, np.pow(1024, k - 1)), out)
 
 
-def exp_out(k: float) -> float:
-    if k == 1:
-        return 1
-    return 1 - np.pow(2, -10 * k)
+def exp_out(k: FloatOrArray, out: Optional[NDArray] = None) -> FloatOrArray:
+    return writeOut(pick(k == 1, 1, 1 - np.pow(2, -10 * k)), out)
 
 
-def exp_inout(k: float) -> float:
-    if k == 0 or k == 1:
-        return k
+def exp_inout(k: FloatOrArray, out: Optional[NDArray] = None) -> FloatOrArray:
+    isEnd = (k == 0) | (k == 1)
 
-    k = k * 2
-    if k < 1:
-        return 0.5 * np.pow(1024, k - 1)
-
-    return 0.5 * (-np.pow(2, -10 * (k - 1)) + 2)
+    k2 = k * 2
+    a = 0.5 * np.pow(1024, k2 - 1)
+    b = 0.5 * (-np.pow(2, -10 * (k2 - 1)) + 2)
+    return writeOut(pick(isEnd, k, pick(k2 < 1, a, b)), out)
 
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-def circ_in(k: float) -> float:
-    return 1 - np.sqrt(1 - k * k)
+def circ_in(k: FloatOrArray, out: Optional[NDArray] = None) -> FloatOrArray:
+    return writeOut(1 - np.sqrt(1 - k * k), out)
 
 
-def circ_out(k: float) -> float:
+def circ_out(k: FloatOrArray, out: Optional[NDArray] = None) -> FloatOrArray:
     k = k - 1
-    return np.sqrt(1 - (k * k))
-
+    return writeOut(np.sqrt(1 - (k * k)), out)
 
-def circ_inout(k: float) -> float:
-    k = k * 2
-    if k < 1:
-        return -0.5 * (np.sqrt(1 - k * k) - 1)
 
-    k = k - 2
-    return 0.5 * (np.sqrt(1 - k * k) + 1)
+def circ_inout(k: FloatOrArray, out: Optional[NDArray] = None) -> FloatOrArray:
+    k2 = k * 2
 
+    # Each half is clamped to its own range so the unused one never takes the sqrt
+    # of a negative number
+    k = np.minimum(k2, 1)
+    a = -0.5 * (np.sqrt(1 - k * k) - 1)
 
-# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-def elastic_in(k: float) -> float:
-    if k == 0 or k == 1:
-        return k
-    return -np.pow(2, 10 * (k - 1)) * np.sin((k - 1.1) * 5 * np.pi)
+    k = np.maximum(k2 - 2, -1)
+    b = 0.5 * (np.sqrt(1 - k * k) + 1)
+    return writeOut(pick(k2 < 1, a, b), out)
 
 
-def elastic_out(k: float) -> float:
-    if k == 0 or k == 1:
-        return k
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+def elastic_in(k: FloatOrArray, out: Optional[NDArray] = None) -> FloatOrArray:
+    v = -np.pow(2, 10 * (k - 1)) * np.sin((k - 1.1) * 5 * np.pi)
+    return writeOut(pick((k == 0) | (k == 1), k, v), out)
 
-    return np.pow(2, -10 * k) * np.sin((k - 0.1) * 5 * np.pi) + 1
 
+def elastic_out(k: FloatOrArray, out: Optional[NDArray] = None) -> FloatOrArray:
+    v = np.pow(2, -10 * k) * np.sin((k - 0.1) * 5 * np.pi) + 1
+    return writeOut(pick((k == 0) | (k == 1), k, v), out)
 
-def elastic_inout(k: float) -> float:
-    if k == 0 or k == 1:
-        return k
 
-    k = k * 2
-    if k < 1:
-        return -0.5 * np.pow(2, 10 * (k - 1)) * np.sin((k - 1.1) * 5 * np.pi)
+def elastic_inout(k: FloatOrArray, out: Optional[NDArray] = None) -> FloatOrArray:
+    isEnd = (k == 0) | (k == 1)
 
-    return 0.5 * np.pow(2, -10 * (k - 1)) * np.sin((k - 1.1) * 5 * np.pi) + 1
+    k2 = k * 2
+    s = np.sin((k2 - 1.1) * 5 * np.pi)
+    a = -0.5 * np.pow(2, 10 * (k2 - 1)) * s
+    b = 0.5 * np.pow(2, -10 * (k2 - 1)) * s + 1
+    return writeOut(pick(isEnd, k, pick(k2 < 1, a, b)), out)
 
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-def back_in(k: float) -> float:
-    return k * k * ((1.70158 + 1) * k - 1.70158)
+def back_in(k: FloatOrArray, out: Optional[NDArray] = None) -> FloatOrArray:
+    return writeOut(k * k * ((1.70158 + 1) * k - 1.70158), out)
 
 
-def back_out(k: float) -> float:
+def back_out(k: FloatOrArray, out: Optional[NDArray] = None) -> FloatOrArray:
     k = k - 1
-    return k * k * ((1.70158 + 1) * k + 1.70158) + 1
+    return writeOut(k * k * ((1.70158 + 1) * k + 1.70158) + 1, out)
 
 
-def back_inout(k: float) -> float:
+def back_inout(k: FloatOrArray, out: Optional[NDArray] = None) -> FloatOrArray:
     s = 1.70158 * 1.525
-    k = k * 2
-    if k < 1:
-        return 0.5 * (k * k * ((s + 1) * k - s))
+    k2 = k * 2
+    a = 0.5 * (k2 * k2 * ((s + 1) * k2 - s))
 
-    k = k - 2
-    return 0.5 * (k * k * ((s + 1) * k + s) + 2)
+    k = k2 - 2
+    b = 0.5 * (k * k * ((s + 1) * k + s) + 2)
+    return writeOut(pick(k2 < 1, a, b), out)
 
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-def bounce_in(k: float) -> float:
-    return 1 - bounce_out(1 - k)
+def bounce_in(k: FloatOrArray, out: Optional[NDArray] = None) -> FloatOrArray:
+    return writeOut(1 - bounce_out(1 - k), out)
+
+
+def bounce_out(k: FloatOrArray, out: Optional[NDArray] = None) -> FloatOrArray:
+    a = 7.5625 * k * k
 
+    kb = k - (1.5 / 2.75)
+    b = 7.5625 * kb * kb + 0.75
 
-def bounce_out(k: float) -> float:
-    if k < (1 / 2.75):
-        return 7.5625 * k * k
-    elif k < (2 / 2.75):
-        k = k - (1.5 / 2.75)
-        return 7.5625 * k * k + 0.75
-    elif k < (2.5 / 2.75):
-        k = k - (2.25 / 2.75)
-        return 7.5625 * k * k + 0.9375
-    else:
-        k = k - (2.625 / 2.75)
-        return 7.5625 * k * k + 0.984375
+    kc = k - (2.25 / 2.75)
+    c = 7.5625 * kc * kc + 0.9375
 
+    kd = k - (2.625 / 2.75)
+    d = 7.5625 * kd * kd + 0.984375
 
-def bounce_inout(k: float) -> float:
-    if k < 0.5:
-        return bounce_in(k * 2) * 0.5
+    v = pick(k < (1 / 2.75), a, pick(k < (2 / 2.75), b, pick(k < (2.5 / 2.75), c, d)))
+    return writeOut(v, out)
 
-    return bounce_out(k * 2 - 1) * 0.5 + 0.5
 
+def bounce_inout(k: FloatOrArray, out: Optional[NDArray] = None) -> FloatOrArray:
+    a = bounce_in(k * 2) * 0.5
+    b = bounce_out(k * 2 - 1) * 0.5 + 0.5
+    return writeOut(pick(k < 0.5, a, b), out)
 
-def bounce(t: float) -> float:
-    return (np.sin(t * np.pi * (0.2 + 2.5 * t * t * t)) * np.pow(1 - t, 2.2) + t) * (
+
+def bounce(t: FloatOrArray, out: Optional[NDArray] = None) -> FloatOrArray:
+    v = (np.sin(t * np.pi * (0.2 + 2.5 * t * t * t)) * np.pow(1 - t, 2.2) + t) * (
         1 + (1.2 * (1 - t))
     )
+    return writeOut(v, out)
+
+
+# region LOOKUP TABLES
+
+
+# Precomputed samples of an easing over 0 to 1 that are linearly interpolated,
+# trades a little accuracy for speed on expensive curves like elastic or bounce.
+# k is clamped to 0:1. maxError is measured against the real curve at build time.
+class EaseLut:
+    def __init__(self, fn: Callable, res: int = 256):
+        self.fn = fn
+        self.res = res
+        self.table = np.asarray(fn(np.linspace(0, 1, res + 1)), dtype=np.float32)
+        self.maxError = self.measureError()
+
+    def __call__(self, k: FloatOrArray, out: Optional[NDArray] = None) -> FloatOrArray:
+        f = np.clip(k, 0, 1) * self.res
+        i = np.minimum(f.astype(np.int32), self.res - 1)
+        t = f - i
+
+        a = self.table[i]
+        v = a + (self.table[i + 1] - a) * t
+        return writeOut(v, out)
+
+    # Largest difference between table & curve, checked at 16 points per table cell
+    def measureError(self, perCell: int = 16) -> float:
+        k = np.linspace(0, 1, self.res * perCell + 1)
+        return float(np.max(np.abs(self(k) - self.fn(k))))
+
+
+# Max LUT error of every easing at a given resolution, {name: error}
+def lutErrors(res: int = 256) -> Dict[str, float]:
+    return {name: EaseLut(fn, res).maxError for name, fn in CURVES.items()}
+
+
+# endregion
+
+# region CURVE LIST
+CURVES: Dict[str, Callable] = {
+    fn.__name__: fn
+    for fn in (
+        quad_in, quad_out, quad_inout,
+        cubic_in, cubic_out, cubic_inout,
+        quart_in, quart_out, quart_inout,
+        quint_in, quint_out, quint_inout,
+        sine_in, sine_out, sine_inout,
+        exp_in, exp_out, exp_inout,
+        circ_in, circ_out, circ_inout,
+        elastic_in, elastic_out, elastic_inout,
+        back_in, back_out, back_inout,
+        bounce_in, bounce_out, bounce_inout,
+        bounce,
+    )
+}  # fmt: skip
+
+# endregion
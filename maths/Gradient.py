@@ -1,34 +1,45 @@
+from typing import Optional
+from .types import FloatOrArray
+from numpy.typing import NDArray
 import numpy as np
-from .Maths import fract
+from .Maths import fract, pick, writeOut
+
+# All gradients take floats or ndarrays, arguments broadcast against each other
+# so a whole field can be evaluated in one call. Pass out= to write array results
+# into an existing buffer.
 
 # region STEP
 
 
-def step(edge: float, x: float) -> float:
-    if x < edge:
-        return 0
-    return 1
+def step(edge: FloatOrArray, x: FloatOrArray, out: Optional[NDArray] = None) -> FloatOrArray:
+    return writeOut(pick(x < edge, 0.0, 1.0), out)
 
 
 # t must be in the range of 0 to 1 : start & ends slowly
-def smoothTStep(t: float) -> float:
-    return t * t * (3 - 2 * t)
+def smoothTStep(t: FloatOrArray, out: Optional[NDArray] = None) -> FloatOrArray:
+    return writeOut(t * t * (3 - 2 * t), out)
 
 
-def smoothStep(min: float, max: float, v: float) -> float:
+def smoothStep(
+    min: FloatOrArray, max: FloatOrArray, v: FloatOrArray, out: Optional[NDArray] = None
+) -> FloatOrArray:
     # https://en.wikipedia.org/wiki/Smoothstep
-    v = np.max(0, np.min(1, (v - min) / (max - min)))
-    return v * v * (3 - 2 * v)
-
+    # Empty ranges step at min like smootherStep
+    hasRange = max > min
+    t = np.clip((v - min) / pick(hasRange, max - min, 1), 0, 1)
+    t = pick(hasRange, t, pick(v > min, 1.0, 0.0))
+    return writeOut(t * t * (3 - 2 * t), out)
 
-def smootherStep(min: float, max: float, v: float) -> float:
-    if v <= min:
-        return 0
-    if v >= max:
-        return 1
 
-    v = (v - min) / (max - min)
-    return v * v * v * (v * (v * 6 - 15) + 10)
+def smootherStep(
+    min: FloatOrArray, max: FloatOrArray, v: FloatOrArray, out: Optional[NDArray] = None
+) -> FloatOrArray:
+    # Clamping to 0:1 gives the same 0 & 1 results as testing v against min & max.
+    # Empty ranges divide by 1 instead & step at min, 0 up to it & 1 past it
+    hasRange = max > min
+    t = np.clip((v - min) / pick(hasRange, max - min, 1), 0, 1)
+    t = pick(hasRange, t, pick(v > min, 1.0, 0.0))
+    return writeOut(t * t * t * (t * (t * 6 - 15) + 10), out)
 
 
 # endregion
@@ -37,49 +48,53 @@ def smootherStep(min: float, max: float, v: float) -> float:
 
 
 # See: https://www.iquilezles.org/www/articles/smin/smin.htm
-def smoothMin(a: float, b: float, k: float) -> float:
-    if k != 0:
-        h = np.max(k - np.abs(a - b), 0.0) / k
-        return np.min(a, b) - h * h * h * k * (1 / 6)
-
-    return np.min(a, b)
+def smoothMin(
+    a: FloatOrArray, b: FloatOrArray, k: FloatOrArray, out: Optional[NDArray] = None
+) -> FloatOrArray:
+    # When k is 0, h is always 0 so dividing by 1 falls back to a plain min
+    h = np.maximum(k - np.abs(a - b), 0.0) / pick(k != 0, k, 1)
+    return writeOut(np.minimum(a, b) - h * h * h * k * (1 / 6), out)
 
 
-def fade(t: float) -> float:
-    return t * t * t * (t * (t * 6.0 - 15.0) + 10.0)
+def fade(t: FloatOrArray, out: Optional[NDArray] = None) -> FloatOrArray:
+    return writeOut(t * t * t * (t * (t * 6.0 - 15.0) + 10.0), out)
 
 
 # Remap 0 > 1 to -1 > 0 > 1
-def remapN01(t: float) -> float:
-    return t * 2 - 1
+def remapN01(t: FloatOrArray, out: Optional[NDArray] = None) -> FloatOrArray:
+    return writeOut(t * 2 - 1, out)
 
 
 # Remap 0 > 1 to 0 > 1 > 0
-def remap010(t: float) -> float:
-    return 1 - np.abs(2 * t - 1)
+def remap010(t: FloatOrArray, out: Optional[NDArray] = None) -> FloatOrArray:
+    return writeOut(1 - np.abs(2 * t - 1), out)
 
 
-def noise(x: float) -> float:
+def noise(x: FloatOrArray, out: Optional[NDArray] = None) -> FloatOrArray:
     # <https://www.shadertoy.com/view/4dS3Wd> By Morgan McGuire @morgan3d, http://graphicscodex.com
     # https://gist.github.com/patriciogonzalezvivo/670c22f3966e662d2f83
     i = np.floor(x)
     f = fract(x)
     t = f * f * (3 - 2 * f)
-    return fract(np.sin(i) * 1e4) * (1 - t) + fract(np.sin(i + 1.0) * 1e4) * t
+    return writeOut(fract(np.sin(i) * 1e4) * (1 - t) + fract(np.sin(i + 1.0) * 1e4) * t, out)
 
 
-def bouncy(t: float, jump: float = 6, offset: float = 1) -> float:
+def bouncy(
+    t: FloatOrArray, jump: float = 6, offset: float = 1, out: Optional[NDArray] = None
+) -> FloatOrArray:
     rad = 6.283185307179586 * t  # PI_2 * t
-    return (offset + np.sin(rad)) / 2 * np.sin(jump * rad)
+    return writeOut((offset + np.sin(rad)) / 2 * np.sin(jump * rad), out)
 
 
 # This is a smooth over-shoot easing : t must be in the range of 0 to 1
-def overShoot(t: float, n: float = 2, k: float = 2) -> float:
+def overShoot(
+    t: FloatOrArray, n: float = 2, k: float = 2, out: Optional[NDArray] = None
+) -> FloatOrArray:
     # https://www.youtube.com/watch?v=pydKWTSGMEM
     t = t * t * (3 - 2 * t)  # SmoothTStep to smooth out the starting & end
     a = n * t * t
     b = 1 - k * ((t - 1) ** 2)
-    return a * (1 - t) + b * t
+    return writeOut(a * (1 - t) + b * t, out)
 
 
 # endregion
@@ -88,26 +103,26 @@ def overShoot(t: float, n: float = 2, k: float = 2) -> float:
 
 
 # Over 0, Eases in the middle, under eases in-out
-def sigmoid(t: float, k: float = 0) -> float:
+def sigmoid(t: FloatOrArray, k: float = 0, out: Optional[NDArray] = None) -> FloatOrArray:
     # this uses the -1 to 1 value of sigmoid which allows to create easing at
     # start and finish. Can pass in range 0:1 and it'll return that range.
     # https://dhemery.github.io/DHE-Modules/technical/sigmoid/
     # https://www.desmos.com/calculator/q6ukniiqwn
-    return (t - k * t) / (k - 2 * k * np.abs(t) + 1)
+    return writeOut((t - k * t) / (k - 2 * k * np.abs(t) + 1), out)
 
 
-def parabola(x: float, k: float) -> float:
-    return np.pow(4 * x * (1 - x), k)
+def parabola(x: FloatOrArray, k: float, out: Optional[NDArray] = None) -> FloatOrArray:
+    return writeOut(np.pow(4 * x * (1 - x), k), out)
 
 
-def bellCurve(t: float) -> float:
-    return (np.sin(2 * np.pi * (t - 0.25)) + 1) * 0.5
+def bellCurve(t: FloatOrArray, out: Optional[NDArray] = None) -> FloatOrArray:
+    return writeOut((np.sin(2 * np.pi * (t - 0.25)) + 1) * 0.5, out)
 
 
 # a = 1.5, 2, 4, 9
-def betaDistCurve(t: float, a: float) -> float:
+def betaDistCurve(t: FloatOrArray, a: float, out: Optional[NDArray] = None) -> FloatOrArray:
     # https://stackoverflow.com/questions/13097005/easing-functions-for-bell-curves
-    return 4**a * (t * (1 - t)) ** a
+    return writeOut(4**a * (t * (1 - t)) ** a, out)
 
 
 # endregion
@@ -48,6 +48,8 @@ def cosine(a: float, b: float, t: float) -> float:
 
 
 # region CURVE BASED
+# To sample many points along a path of control points use Spline, it
+# precomputes these curves per segment.
 
 
 # http://archive.gamedev.net/archive/reference/articles/article1497.html
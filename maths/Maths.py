@@ -1,26 +1,43 @@
-from .types import Vec3Like
+from typing import Optional
+from .types import Vec3Like, FloatOrArray
+from numpy.typing import NDArray
 import math
 import numpy as np
 
+# Kernels take floats or ndarrays (broadcasting like any numpy op) so the same
+# call can remap a single value or a whole field. Pass out= to write array
+# results into an existing buffer.
 
-def fract(f: float) -> float:
-    return f - np.floor(f)
 
+def fract(f: FloatOrArray, out: Optional[NDArray] = None) -> FloatOrArray:
+    return writeOut(f - np.floor(f), out)
 
-def snap(x: float, step: float) -> float:
-    return np.floor(x / step) * step
+
+def snap(x: FloatOrArray, step: FloatOrArray, out: Optional[NDArray] = None) -> FloatOrArray:
+    return writeOut(np.floor(x / step) * step, out)
 
 
 # Adapted from GODOT-engine math_funcs.h
-def wrap(value: float, min: float, max: float) -> float:
+def wrap(
+    value: FloatOrArray, min: FloatOrArray, max: FloatOrArray, out: Optional[NDArray] = None
+) -> FloatOrArray:
     range = max - min
-    if range != 0:
-        return value - (range * np.floor((value - min) / range))
-    return min
+    hasRange = range != 0
+
+    # Zero ranges divide by 1 instead, their result is replaced by min anyway
+    v = value - (range * np.floor((value - min) / pick(hasRange, range, 1)))
+
+    # Scalar bounds pick a single min, keep the shape of the array it replaces
+    res = pick(hasRange, v, min)
+    if np.shape(res) != np.shape(v):
+        res = np.broadcast_to(res, np.shape(v)).astype(np.result_type(v))
+    return writeOut(res, out)
 
 
-def norm(minv: float, maxv: float, v: float) -> float:
-    return (v - minv) / (maxv - minv)
+def norm(
+    minv: FloatOrArray, maxv: FloatOrArray, v: FloatOrArray, out: Optional[NDArray] = None
+) -> FloatOrArray:
+    return writeOut((v - minv) / (maxv - minv), out)
 
 
 def spherical(x: float, y: float) -> Vec3Like:
@@ -32,4 +49,26 @@ def spherical(x: float, y: float) -> Vec3Like:
     ]
 
 
+# region KERNEL HELPERS
+
+
+# Pick a or b by cond. Scalars use a plain python branch, arrays use np.where.
+# Both a & b are already computed, so keep them valid for every input.
+def pick(cond, a, b):
+    if isinstance(cond, (bool, np.bool_)):
+        return a if cond else b
+    return np.where(cond, a, b)
+
+
+# Write a result into out when one is given, else pass it through
+def writeOut(v, out: Optional[NDArray]):
+    if out is None:
+        return v
+    np.copyto(out, v, casting="unsafe")
+    return out
+
+
+# endregion
+
+
 # ts = np.zeros(clip.frameCount, dtype=np.float32)
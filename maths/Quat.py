@@ -5,8 +5,7 @@ from numpy.typing import NDArray
 import math
 import numpy as np
 from .Vec3 import Vec3
-
-BLANK_VEC3 = np.zeros(3, dtype=np.float32)
+from .Vec3Array import vaQuatTransform
 
 
 class Quat(np.ndarray):
@@ -320,16 +319,26 @@ class Quat(np.ndarray):
         out[2] = vz + 2 * z2
         return out
 
+    # Rotate every row of an (N,3) buffer then optionally translate it. Pass rots as
+    # an (N,4) buffer to use one quat per row instead of this one. out can be buf
+    # for in-place work, tmp can be a reusable (7,N) scratch block so repeated calls
+    # do not allocate anything.
     def batchTransformVec3(
-        self, buf: NDArray, translate: Optional[Vec3Like] = BLANK_VEC3
+        self,
+        buf: NDArray,
+        translate: Optional[Vec3Like] = None,
+        out: Optional[NDArray] = None,
+        rots: Optional[NDArray] = None,
+        tmp: Optional[NDArray] = None,
     ) -> NDArray:
-        out = buf.copy()
+        if out is None:
+            out = np.empty_like(buf)
+
+        vaQuatTransform(self if rots is None else rots, buf, out, tmp)
 
-        for i, v in enumerate(buf):
-            self.transformVec3(v, out[i])
-            out[i][0] = out[i][0] + translate[0]
-            out[i][1] = out[i][1] + translate[1]
-            out[i][2] = out[i][2] + translate[2]
+        # translate can be a single Vec3 or one per row
+        if translate is not None:
+            np.add(out, translate, out=out)
 
         return out
 
@@ -0,0 +1,314 @@
+from typing import Optional, Type, Self, Union
+from .types import Vec3Like, QuatLike
+
+from numpy.typing import NDArray
+import numpy as np
+from .Quat import Quat
+from .Vec3Array import Vec3Array, vaQuatTransform
+
+
+# Batch companion to Quat, holds N quaternions in one contiguous (N,4) float32 buffer.
+# Every op accepts a single quat or one per row, so one against N and N against N
+# both broadcast. Math is done in the same order as the scalar Quat methods.
+# Operations default to writing into self, pass out= to write somewhere else.
+class QuatArray(np.ndarray):
+    # region SETUP
+
+    # create new (cnt, 4) buffer and cast it as a QuatArray
+    def __new__(cls: Type[Self], cnt: int = 0, init: QuatLike = [0, 0, 0, 1]) -> Self:
+        return np.full((cnt, 4), init, dtype=np.float32).view(cls)
+
+    def __array_finalize__(self, obj: Optional[np.ndarray]) -> None:
+        if obj is None:
+            return
+
+    # Wrap an existing buffer, no copy is made when its already contiguous float32
+    def fromBuffer(buf: NDArray) -> "QuatArray":
+        return np.asarray(buf, dtype=np.float32).reshape(-1, 4).view(QuatArray)
+
+    # endregion
+
+    # region GETTERS / SETTERS
+
+    @property
+    def count(self) -> int:
+        return self.shape[0]
+
+    # Row as a Quat that shares memory with this buffer
+    def at(self, i: int) -> Quat:
+        return self[i].view(Quat)
+
+    # With no a this is ndarray.copy, which numpy calls internally
+    def copy(self, a: Optional[NDArray] = None, order: str = "C") -> Self:
+        if a is None:
+            return super().copy(order)
+        self[...] = a
+        return self
+
+    def copyTo(self, a: NDArray) -> Self:
+        a[...] = self
+        return self
+
+    def clone(self) -> "QuatArray":
+        return np.array(self, dtype=np.float32).view(QuatArray)
+
+    # endregion
+
+    # region OPERATIONS
+
+    def mul(self, a: Union[QuatLike, NDArray], out: Optional[NDArray] = None) -> NDArray:
+        return qaMul(self, a, self if out is None else out)
+
+    def pmul(self, a: Union[QuatLike, NDArray], out: Optional[NDArray] = None) -> NDArray:
+        return qaMul(a, self, self if out is None else out)
+
+    def norm(self, out: Optional[NDArray] = None) -> NDArray:
+        return qaNorm(self, self if out is None else out)
+
+    def invert(self, out: Optional[NDArray] = None) -> NDArray:
+        return qaInvert(self, self if out is None else out)
+
+    def negate(self, out: Optional[NDArray] = None) -> NDArray:
+        return np.negative(self, out=self if out is None else out)
+
+    # Flip any row that is in the opposite hemisphere of chk, see Quat.dotNegate
+    def dotNegate(self, chk: Union[QuatLike, NDArray], out: Optional[NDArray] = None) -> NDArray:
+        out = self if out is None else out
+        flip = QuatArray.dot(self, chk) < 0
+        np.copyto(out, self)
+        np.negative(out, out=out, where=flip[..., None])
+        return out
+
+    # endregion
+
+    # region FROM OPERATIONS
+
+    def fromMul(self, a: Union[QuatLike, NDArray], b: Union[QuatLike, NDArray]) -> Self:
+        qaMul(a, b, self)
+        return self
+
+    def fromInvert(self, q: Union[QuatLike, NDArray]) -> Self:
+        qaInvert(q, self)
+        return self
+
+    # axis can be a single Vec3 or one per row, rad a single angle or one per row
+    def fromAxisAngle(
+        self, axis: Union[Vec3Like, NDArray], rad: Union[float, NDArray]
+    ) -> Self:
+        axis = np.asarray(axis)
+        half = np.asarray(rad, dtype=np.float64) * 0.5
+        s = np.sin(half).astype(np.result_type(axis.dtype, np.float32))
+        self[..., 0] = axis[..., 0] * s
+        self[..., 1] = axis[..., 1] * s
+        self[..., 2] = axis[..., 2] * s
+        self[..., 3] = np.cos(half)
+        return self
+
+    # x, y, z can be single angles or one per row
+    def fromEulerOrder(
+        self,
+        x: Union[float, NDArray],
+        y: Union[float, NDArray],
+        z: Union[float, NDArray],
+        order: str = "YXZ",
+    ) -> Self:
+        c1 = np.cos(x * 0.5)
+        c2 = np.cos(y * 0.5)
+        c3 = np.cos(z * 0.5)
+        s1 = np.sin(x * 0.5)
+        s2 = np.sin(y * 0.5)
+        s3 = np.sin(z * 0.5)
+
+        match order:
+            case "XYZ":
+                self[..., 0] = s1 * c2 * c3 + c1 * s2 * s3
+                self[..., 1] = c1 * s2 * c3 - s1 * c2 * s3
+                self[..., 2] = c1 * c2 * s3 + s1 * s2 * c3
+                self[..., 3] = c1 * c2 * c3 - s1 * s2 * s3
+            case "YXZ":
+                self[..., 0] = s1 * c2 * c3 + c1 * s2 * s3
+                self[..., 1] = c1 * s2 * c3 - s1 * c2 * s3
+                self[..., 2] = c1 * c2 * s3 - s1 * s2 * c3
+                self[..., 3] = c1 * c2 * c3 + s1 * s2 * s3
+            case "ZXY":
+                self[..., 0] = s1 * c2 * c3 - c1 * s2 * s3
+                self[..., 1] = c1 * s2 * c3 + s1 * c2 * s3
+                self[..., 2] = c1 * c2 * s3 + s1 * s2 * c3
+                self[..., 3] = c1 * c2 * c3 - s1 * s2 * s3
+            case "ZYX":
+                self[..., 0] = s1 * c2 * c3 - c1 * s2 * s3
+                self[..., 1] = c1 * s2 * c3 + s1 * c2 * s3
+                self[..., 2] = c1 * c2 * s3 - s1 * s2 * c3
+                self[..., 3] = c1 * c2 * c3 + s1 * s2 * s3
+            case "YZX":
+                self[..., 0] = s1 * c2 * c3 + c1 * s2 * s3
+                self[..., 1] = c1 * s2 * c3 + s1 * c2 * s3
+                self[..., 2] = c1 * c2 * s3 - s1 * s2 * c3
+                self[..., 3] = c1 * c2 * c3 - s1 * s2 * s3
+            case "XZY":
+                self[..., 0] = s1 * c2 * c3 - c1 * s2 * s3
+                self[..., 1] = c1 * s2 * c3 - s1 * c2 * s3
+                self[..., 2] = c1 * c2 * s3 + s1 * s2 * c3
+                self[..., 3] = c1 * c2 * c3 + s1 * s2 * s3
+
+        qaNorm(self, self)
+        return self
+
+    def fromSlerp(
+        self, a: Union[QuatLike, NDArray], b: Union[QuatLike, NDArray], t: Union[float, NDArray]
+    ) -> Self:
+        QuatArray.slerp(a, b, t, self)
+        return self
+
+    def fromNblend(
+        self, a: Union[QuatLike, NDArray], b: Union[QuatLike, NDArray], t: Union[float, NDArray]
+    ) -> Self:
+        QuatArray.nblend(a, b, t, self)
+        return self
+
+    # endregion
+
+    # region TRANSFORMING
+
+    # v can be a single Vec3 or one per row, results come back as a Vec3Array
+    def transformVec3(
+        self, v: Union[Vec3Like, NDArray], out: Optional[NDArray] = None
+    ) -> NDArray:
+        if out is None:
+            shape = np.broadcast_shapes(self.shape[:-1], np.shape(v)[:-1])
+            out = np.empty((*shape, 3), dtype=np.float32).view(Vec3Array)
+
+        return vaQuatTransform(self, v, out)
+
+    # endregion
+
+    # region STATIC
+
+    def dot(a: Union[QuatLike, NDArray], b: Union[QuatLike, NDArray]) -> NDArray:
+        a = np.asarray(a, dtype=np.float32)
+        b = np.asarray(b, dtype=np.float32)
+        return (
+            a[..., 0] * b[..., 0]
+            + a[..., 1] * b[..., 1]
+            + a[..., 2] * b[..., 2]
+            + a[..., 3] * b[..., 3]
+        )
+
+    def slerp(
+        a: Union[QuatLike, NDArray],
+        b: Union[QuatLike, NDArray],
+        t: Union[float, NDArray],
+        out: Optional[NDArray] = None,
+    ) -> NDArray:
+        a = np.asarray(a, dtype=np.float32)
+        b = np.asarray(b, dtype=np.float32)
+        out = _alloc(out, a, b, t)
+
+        # calc cosine, then adjust signs (if necessary)
+        cosom = QuatArray.dot(a, b)
+        sign = np.where(cosom < 0.0, np.float32(-1), np.float32(1))
+        cosom = cosom * sign
+
+        # Standard slerp for most rows, rows that are very close
+        # fall back to a linear interpolation
+        with np.errstate(divide="ignore", invalid="ignore"):
+            omega = np.arccos(cosom)
+            sinom = np.sin(omega)
+            scale0 = np.sin((1.0 - t) * omega) / sinom
+            scale1 = np.sin(t * omega) / sinom
+
+        isLinear = (1.0 - cosom) <= 0.000001
+        scale0 = np.where(isLinear, 1.0 - t, scale0).astype(np.float32)
+        scale1 = np.where(isLinear, t, scale1).astype(np.float32) * sign
+
+        # calculate final values, temps first so out can alias a or b
+        rtn = a * scale0[..., None] + b * scale1[..., None]
+        out[...] = rtn
+        return out
+
+    # Cheaper alternative to slerp
+    def nblend(
+        a: Union[QuatLike, NDArray],
+        b: Union[QuatLike, NDArray],
+        t: Union[float, NDArray],
+        out: Optional[NDArray] = None,
+    ) -> NDArray:
+        a = np.asarray(a, dtype=np.float32)
+        b = np.asarray(b, dtype=np.float32)
+        out = _alloc(out, a, b, t)
+
+        # Switch the sign of the To quat in opposite hemispheres to avoid artifacts
+        dot = QuatArray.dot(a, b)
+        s = np.where(dot < 0, np.float32(-1), np.float32(1))[..., None]
+
+        t = np.asarray(t)[..., None] if np.ndim(t) else t
+        ti = 1 - t
+
+        rtn = ti * a + t * b * s
+        return qaNorm(rtn, out)
+
+    def createBuffer(cnt: int, init: QuatLike = [0, 0, 0, 1]) -> "QuatArray":
+        return QuatArray(cnt, init)
+
+    # endregion
+
+
+# region REUSABLE OPS
+
+
+# out = a * b, where a & b are (4,) or (N,4). out can alias either input
+def qaMul(a: Union[QuatLike, NDArray], b: Union[QuatLike, NDArray], out: NDArray) -> NDArray:
+    a = np.asarray(a, dtype=np.float32)
+    b = np.asarray(b, dtype=np.float32)
+    ax = a[..., 0]
+    ay = a[..., 1]
+    az = a[..., 2]
+    aw = a[..., 3]
+    bx = b[..., 0]
+    by = b[..., 1]
+    bz = b[..., 2]
+    bw = b[..., 3]
+
+    x = ax * bw + aw * bx + ay * bz - az * by
+    y = ay * bw + aw * by + az * bx - ax * bz
+    z = az * bw + aw * bz + ax * by - ay * bx
+    w = aw * bw - ax * bx - ay * by - az * bz
+
+    out[..., 0] = x
+    out[..., 1] = y
+    out[..., 2] = z
+    out[..., 3] = w
+    return out
+
+
+# Zero length quats invert to zero, same as qInvert
+def qaInvert(q: Union[QuatLike, NDArray], out: NDArray) -> NDArray:
+    q = np.asarray(q, dtype=np.float32)
+    dot = QuatArray.dot(q, q)
+    iDot = np.divide(1.0, dot, out=np.zeros_like(dot), where=dot != 0)
+
+    rtn = q * iDot[..., None]
+    np.negative(rtn[..., 0:3], out=rtn[..., 0:3])
+    out[...] = rtn
+    return out
+
+
+# Zero length quats are left as is, same as qNorm
+def qaNorm(a: Union[QuatLike, NDArray], out: NDArray) -> NDArray:
+    a = np.asarray(a, dtype=np.float32)
+    len = QuatArray.dot(a, a)
+    iLen = np.ones_like(len)
+    np.sqrt(len, out=iLen, where=len > 0)
+    np.divide(1, iLen, out=iLen)
+    return np.multiply(a, iLen[..., None], out=out)
+
+
+# Output for interpolating a & b, t adds rows when one pair is blended at many t
+def _alloc(out: Optional[NDArray], a: NDArray, b: NDArray, t=0.0) -> NDArray:
+    if out is not None:
+        return out
+    shape = np.broadcast_shapes(np.shape(a), np.shape(b), np.shape(t) + (1,))
+    return np.empty(shape, dtype=np.float32).view(QuatArray)
+
+
+# endregion
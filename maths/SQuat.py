@@ -0,0 +1,371 @@
+from typing import Iterator, Self
+from .types import Vec3Like, QuatLike
+
+from numpy.typing import NDArray
+import math
+import numpy as np
+from .Quat import Quat
+from .SVec3 import SVec3, _xyz, _xyzw
+
+
+# Scalar Quat backed by plain python floats in __slots__, the SVec3 equivalent
+# for rotations. Same method names & chaining as Quat. Use fromRow / toRow to
+# move data in & out of (N,4) buffers like QuatArray.
+class SQuat:
+    __slots__ = ("x", "y", "z", "w")
+
+    # region SETUP
+
+    def __init__(self, x: float = 0.0, y: float = 0.0, z: float = 0.0, w: float = 1.0):
+        self.x = x
+        self.y = y
+        self.z = z
+        self.w = w
+
+    def __str__(self) -> str:
+        return self.__repr__()
+
+    def __repr__(self) -> str:
+        return f"[{self.x}, {self.y}, {self.z}, {self.w}]"
+
+    # Allows SQuat to be used anywhere a QuatLike is expected
+    def __getitem__(self, i: int) -> float:
+        return (self.x, self.y, self.z, self.w)[i]
+
+    def __setitem__(self, i: int, v: float) -> None:
+        match i:
+            case 0 | -4:
+                self.x = v
+            case 1 | -3:
+                self.y = v
+            case 2 | -2:
+                self.z = v
+            case 3 | -1:
+                self.w = v
+            case _:
+                raise IndexError("SQuat index out of range")
+
+    def __len__(self) -> int:
+        return 4
+
+    def __iter__(self) -> Iterator[float]:
+        return iter((self.x, self.y, self.z, self.w))
+
+    def __array__(self, dtype=None, copy=None) -> NDArray:
+        return np.array((self.x, self.y, self.z, self.w), dtype=dtype or np.float32)
+
+    # endregion
+
+    # region CONVERSION
+
+    # Read row i of an (N,4) buffer, or a (4,) array when i is None
+    def fromRow(self, buf: NDArray, i: int = None) -> Self:
+        self.x, self.y, self.z, self.w = (buf if i is None else buf[i]).tolist()
+        return self
+
+    # Write into row i of an (N,4) buffer, or a (4,) array when i is None
+    def toRow(self, buf: NDArray, i: int = None) -> Self:
+        if i is None:
+            buf[...] = (self.x, self.y, self.z, self.w)
+        else:
+            buf[i] = (self.x, self.y, self.z, self.w)
+        return self
+
+    def toQuat(self) -> Quat:
+        return Quat([self.x, self.y, self.z, self.w])
+
+    # endregion
+
+    # region GETTERS / SETTERS
+
+    def copy(self, a: QuatLike) -> Self:
+        self.x, self.y, self.z, self.w = _xyzw(a)
+        return self
+
+    def copyTo(self, a: QuatLike) -> Self:
+        a[0] = self.x
+        a[1] = self.y
+        a[2] = self.z
+        a[3] = self.w
+        return self
+
+    def clone(self) -> "SQuat":
+        return SQuat(self.x, self.y, self.z, self.w)
+
+    # endregion
+
+    # region OPERATIONS
+
+    def mul(self, a: QuatLike) -> Self:
+        return self.fromMul(self, a)
+
+    def pmul(self, a: QuatLike) -> Self:
+        return self.fromMul(a, self)
+
+    def norm(self) -> Self:
+        len = self.x * self.x + self.y * self.y + self.z * self.z + self.w * self.w
+        if len > 0:
+            len = 1 / math.sqrt(len)
+            self.x *= len
+            self.y *= len
+            self.z *= len
+            self.w *= len
+        return self
+
+    def invert(self) -> Self:
+        return self.fromInvert(self)
+
+    def negate(self) -> Self:
+        self.x = -self.x
+        self.y = -self.y
+        self.z = -self.z
+        self.w = -self.w
+        return self
+
+    # endregion
+
+    # region FROM OPERATIONS
+
+    def fromMul(self, a: QuatLike, b: QuatLike) -> Self:
+        ax, ay, az, aw = _xyzw(a)
+        bx, by, bz, bw = _xyzw(b)
+        self.x = ax * bw + aw * bx + ay * bz - az * by
+        self.y = ay * bw + aw * by + az * bx - ax * bz
+        self.z = az * bw + aw * bz + ax * by - ay * bx
+        self.w = aw * bw - ax * bx - ay * by - az * bz
+        return self
+
+    def fromInvert(self, q: QuatLike) -> Self:
+        a0, a1, a2, a3 = _xyzw(q)
+        dot = a0 * a0 + a1 * a1 + a2 * a2 + a3 * a3
+
+        if dot == 0:
+            self.x = self.y = self.z = self.w = 0.0
+            return self
+
+        iDot = 1.0 / dot
+        self.x = -a0 * iDot
+        self.y = -a1 * iDot
+        self.z = -a2 * iDot
+        self.w = a3 * iDot
+        return self
+
+    def fromLook(self, fwd: Vec3Like, up: Vec3Like = [0, 1, 0]) -> Self:
+        # Orthogonal axes to make a mat3x3
+        zAxis = SVec3().copy(fwd)
+        yAxis = SVec3().copy(up)
+        xAxis = SVec3().fromCross(yAxis, zAxis).norm()
+
+        # Z & UP are parallel
+        if xAxis.lenSq == 0:
+            if abs(yAxis.z) == 1:
+                zAxis.x += 0.0001  # shift x when Fwd or Bak
+            else:
+                zAxis.z += 0.0001  # shift z
+
+            zAxis.norm()  # ReNormalize updated Fwd
+            xAxis.fromCross(yAxis, zAxis).norm()  # Redo Left
+
+        yAxis.fromCross(zAxis, xAxis).norm()  # realign up
+
+        return self.fromAxes(xAxis, yAxis, zAxis)
+
+    def fromAxisAngle(self, axis: Vec3Like, rad: float) -> Self:
+        ax, ay, az = _xyz(axis)
+        half = rad * 0.5
+        s = math.sin(half)
+        self.x = ax * s
+        self.y = ay * s
+        self.z = az * s
+        self.w = math.cos(half)
+        return self
+
+    def fromAxes(self, xAxis: Vec3Like, yAxis: Vec3Like, zAxis: Vec3Like) -> Self:
+        # Mat3 to Quat
+        # Algorithm in Ken Shoemake's article in 1987 SIGGRAPH course notes
+        # article "Quat Calculus and Fast Animation".
+        m = [*_xyz(xAxis), *_xyz(yAxis), *_xyz(zAxis)]
+        fTrace = m[0] + m[4] + m[8]  # Diagonal axis
+
+        if fTrace > 0.0:
+            # |w| > 1/2, may as well choose w > 1/2
+            fRoot = math.sqrt(fTrace + 1.0)  # 2w
+            self.w = 0.5 * fRoot
+
+            fRoot = 0.5 / fRoot  # 1/(4w)
+            self.x = (m[5] - m[7]) * fRoot
+            self.y = (m[6] - m[2]) * fRoot
+            self.z = (m[1] - m[3]) * fRoot
+        else:
+            # |w| <= 1/2
+            i = 0
+            if m[4] > m[0]:
+                i = 1
+            if m[8] > m[i * 3 + i]:
+                i = 2
+
+            j = (i + 1) % 3
+            k = (i + 2) % 3
+
+            fRoot = math.sqrt(m[i * 3 + i] - m[j * 3 + j] - m[k * 3 + k] + 1.0)
+            self[i] = 0.5 * fRoot
+            fRoot = 0.5 / fRoot
+            self.w = (m[j * 3 + k] - m[k * 3 + j]) * fRoot
+            self[j] = (m[j * 3 + i] + m[i * 3 + j]) * fRoot
+            self[k] = (m[k * 3 + i] + m[i * 3 + k]) * fRoot
+
+        return self
+
+    def fromSwing(self, a: Vec3Like, b: Vec3Like) -> Self:
+        # http://physicsforgames.blogspot.com/2010/03/Quat-tricks.html
+        d = SVec3.dot(a, b)
+
+        if d < -0.999999:  # 180 opposites
+            tmp = SVec3.cross([-1, 0, 0], a)
+            if tmp.len < 0.000001:
+                tmp.fromCross([0, 1, 0], a)
+
+            return self.fromAxisAngle(tmp.norm(), math.pi)
+
+        elif d > 0.999999:  # Same Direction
+            self.x = self.y = self.z = 0.0
+            self.w = 1.0
+            return self
+
+        v = SVec3.cross(a, b)
+        self.x = v.x
+        self.y = v.y
+        self.z = v.z
+        self.w = 1 + d
+        return self.norm()
+
+    def fromEulerOrder(self, x: float, y: float, z: float, order: str = "YXZ") -> Self:
+        # https://github.com/mrdoob/three.js/blob/dev/src/math/Quat.js
+        c1 = math.cos(x * 0.5)
+        c2 = math.cos(y * 0.5)
+        c3 = math.cos(z * 0.5)
+        s1 = math.sin(x * 0.5)
+        s2 = math.sin(y * 0.5)
+        s3 = math.sin(z * 0.5)
+
+        match order:
+            case "XYZ":
+                self.x = s1 * c2 * c3 + c1 * s2 * s3
+                self.y = c1 * s2 * c3 - s1 * c2 * s3
+                self.z = c1 * c2 * s3 + s1 * s2 * c3
+                self.w = c1 * c2 * c3 - s1 * s2 * s3
+            case "YXZ":
+                self.x = s1 * c2 * c3 + c1 * s2 * s3
+                self.y = c1 * s2 * c3 - s1 * c2 * s3
+                self.z = c1 * c2 * s3 - s1 * s2 * c3
+                self.w = c1 * c2 * c3 + s1 * s2 * s3
+            case "ZXY":
+                self.x = s1 * c2 * c3 - c1 * s2 * s3
+                self.y = c1 * s2 * c3 + s1 * c2 * s3
+                self.z = c1 * c2 * s3 + s1 * s2 * c3
+                self.w = c1 * c2 * c3 - s1 * s2 * s3
+            case "ZYX":
+                self.x = s1 * c2 * c3 - c1 * s2 * s3
+                self.y = c1 * s2 * c3 + s1 * c2 * s3
+                self.z = c1 * c2 * s3 - s1 * s2 * c3
+                self.w = c1 * c2 * c3 + s1 * s2 * s3
+            case "YZX":
+                self.x = s1 * c2 * c3 + c1 * s2 * s3
+                self.y = c1 * s2 * c3 + s1 * c2 * s3
+                self.z = c1 * c2 * s3 - s1 * s2 * c3
+                self.w = c1 * c2 * c3 - s1 * s2 * s3
+            case "XZY":
+                self.x = s1 * c2 * c3 - c1 * s2 * s3
+                self.y = c1 * s2 * c3 - s1 * c2 * s3
+                self.z = c1 * c2 * s3 + s1 * s2 * c3
+                self.w = c1 * c2 * c3 + s1 * s2 * s3
+
+        return self.norm()
+
+    def fromSlerp(self, a: QuatLike, b: QuatLike, t: float) -> Self:
+        return SQuat.slerp(a, b, t, self)
+
+    # endregion
+
+    # region SPECIAL OPERATIONS
+
+    # Inverts the quaternion passed in, then pre multiplies to this quaternion.
+    # Note: Used often from World to Local space transformation of rotation
+    def pmulInvert(self, q: QuatLike) -> Self:
+        return self.fromMul(SQuat().fromInvert(q), self)
+
+    # Negates this quat when its in the opposite hemisphere of chk, see Quat.dotNegate
+    def dotNegate(self, chk: QuatLike) -> Self:
+        if SQuat.dot(self, chk) < 0:
+            self.negate()
+        return self
+
+    # endregion
+
+    # region TRANSFORMING
+
+    def transformVec3(self, v: Vec3Like, out: SVec3 = None) -> SVec3:
+        return (out or SVec3()).fromQuat(self, v)
+
+    # endregion
+
+    # region STATIC
+
+    def dot(a: QuatLike, b: QuatLike) -> float:
+        ax, ay, az, aw = _xyzw(a)
+        bx, by, bz, bw = _xyzw(b)
+        return ax * bx + ay * by + az * bz + aw * bw
+
+    def slerp(a: QuatLike, b: QuatLike, t: float, out: "SQuat" = None) -> "SQuat":
+        # benchmarks: http://jsperf.com/Quat-slerp-implementations
+        ax, ay, az, aw = _xyzw(a)
+        bx, by, bz, bw = _xyzw(b)
+
+        # calc cosine
+        cosom = ax * bx + ay * by + az * bz + aw * bw
+
+        # adjust signs (if necessary)
+        if cosom < 0.0:
+            cosom = -cosom
+            bx = -bx
+            by = -by
+            bz = -bz
+            bw = -bw
+
+        # calculate coefficients
+        if (1.0 - cosom) > 0.000001:
+            # standard case (slerp)
+            omega = math.acos(cosom)
+            sinom = math.sin(omega)
+            scale0 = math.sin((1.0 - t) * omega) / sinom
+            scale1 = math.sin(t * omega) / sinom
+        else:
+            # "from" and "to" Quats are very close so we can do a linear interpolation
+            scale0 = 1.0 - t
+            scale1 = t
+
+        # calculate final values
+        out = out or SQuat()
+        out.x = scale0 * ax + scale1 * bx
+        out.y = scale0 * ay + scale1 * by
+        out.z = scale0 * az + scale1 * bz
+        out.w = scale0 * aw + scale1 * bw
+        return out
+
+    # Cheaper alternative to slerp
+    def nblend(a: QuatLike, b: QuatLike, t: float, out: "SQuat" = None) -> "SQuat":
+        # https://physicsforgames.blogspot.com/2010/02/quaternions.html
+        ax, ay, az, aw = _xyzw(a)
+        bx, by, bz, bw = _xyzw(b)
+        dot = ax * bx + ay * by + az * bz + aw * bw
+        ti = 1 - t
+        s = -1 if dot < 0 else 1
+
+        out = out or SQuat()
+        out.x = ti * ax + t * bx * s
+        out.y = ti * ay + t * by * s
+        out.z = ti * az + t * bz * s
+        out.w = ti * aw + t * bw * s
+        return out.norm()
+
+    # endregion
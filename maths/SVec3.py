@@ -0,0 +1,353 @@
+from typing import Iterator, Self, Union, Tuple
+from .types import Vec3Like, QuatLike
+
+from numpy.typing import NDArray
+import math
+import numpy as np
+from .Vec3 import Vec3
+
+F32_MAX = float(np.finfo(np.float32).max)
+
+
+# Scalar Vec3 backed by plain python floats in __slots__ instead of a numpy array.
+# Same method names & chaining as Vec3 but without ndarray item access overhead,
+# meant for per object gameplay style code. Use fromRow / toRow to move data in &
+# out of (N,3) buffers like Vec3Array. Python floats can not share memory with a
+# buffer so the values are copied, but its a single numpy call per row with no
+# intermediate Vec3 or array objects.
+class SVec3:
+    __slots__ = ("x", "y", "z")
+
+    # region SETUP
+
+    def __init__(self, x: float = 0.0, y: float = 0.0, z: float = 0.0):
+        self.x = x
+        self.y = y
+        self.z = z
+
+    def __str__(self) -> str:
+        return self.__repr__()
+
+    def __repr__(self) -> str:
+        return f"[{self.x}, {self.y}, {self.z}]"
+
+    # Allows SVec3 to be used anywhere a Vec3Like is expected
+    def __getitem__(self, i: int) -> float:
+        return (self.x, self.y, self.z)[i]
+
+    def __setitem__(self, i: int, v: float) -> None:
+        match i:
+            case 0 | -3:
+                self.x = v
+            case 1 | -2:
+                self.y = v
+            case 2 | -1:
+                self.z = v
+            case _:
+                raise IndexError("SVec3 index out of range")
+
+    def __len__(self) -> int:
+        return 3
+
+    def __iter__(self) -> Iterator[float]:
+        return iter((self.x, self.y, self.z))
+
+    def __array__(self, dtype=None, copy=None) -> NDArray:
+        return np.array((self.x, self.y, self.z), dtype=dtype or np.float32)
+
+    # endregion
+
+    # region CONVERSION
+
+    # Read row i of an (N,3) buffer, or a (3,) array when i is None
+    def fromRow(self, buf: NDArray, i: int = None) -> Self:
+        self.x, self.y, self.z = (buf if i is None else buf[i]).tolist()
+        return self
+
+    # Write into row i of an (N,3) buffer, or a (3,) array when i is None
+    def toRow(self, buf: NDArray, i: int = None) -> Self:
+        if i is None:
+            buf[...] = (self.x, self.y, self.z)
+        else:
+            buf[i] = (self.x, self.y, self.z)
+        return self
+
+    def toVec3(self) -> Vec3:
+        return Vec3(self.x, self.y, self.z)
+
+    # endregion
+
+    # region GETTERS / SETTERS
+
+    @property
+    def len(self) -> float:
+        return math.sqrt(self.x * self.x + self.y * self.y + self.z * self.z)
+
+    @property
+    def lenSq(self) -> float:
+        return self.x * self.x + self.y * self.y + self.z * self.z
+
+    def xyz(self, x: float, y: float, z: float) -> Self:
+        self.x = x
+        self.y = y
+        self.z = z
+        return self
+
+    def copy(self, a: Vec3Like) -> Self:
+        self.x, self.y, self.z = _xyz(a)
+        return self
+
+    def copyTo(self, a: Vec3Like) -> Self:
+        a[0] = self.x
+        a[1] = self.y
+        a[2] = self.z
+        return self
+
+    def clone(self) -> "SVec3":
+        return SVec3(self.x, self.y, self.z)
+
+    def toMin(self) -> Self:
+        self.x = self.y = self.z = -F32_MAX
+        return self
+
+    def toMax(self) -> Self:
+        self.x = self.y = self.z = F32_MAX
+        return self
+
+    # endregion
+
+    # region DUNDER METHODS
+
+    # vc = va + vb,  vc = va + [1,2,3]
+    def __add__(self, v: Vec3Like) -> "SVec3":
+        x, y, z = _xyz(v)
+        return SVec3(self.x + x, self.y + y, self.z + z)
+
+    # va += vb,  va += [1,2,3]
+    def __iadd__(self, v: Vec3Like) -> Self:
+        return self.add(v)
+
+    # vc = va - vb,  vc = va - [1,2,3]
+    def __sub__(self, v: Vec3Like) -> "SVec3":
+        x, y, z = _xyz(v)
+        return SVec3(self.x - x, self.y - y, self.z - z)
+
+    # va -= vb,  va -= [1,2,3]
+    def __isub__(self, v: Vec3Like) -> Self:
+        return self.sub(v)
+
+    # vc = va * vb, vc = va * [1,2,3],  vc = va * 5
+    def __mul__(self, v: Union[float, Vec3Like]) -> "SVec3":
+        if isinstance(v, (int, float)):
+            return SVec3(self.x * v, self.y * v, self.z * v)
+
+        x, y, z = _xyz(v)
+        return SVec3(self.x * x, self.y * y, self.z * z)
+
+    # va *= vb, va *= [1,2,3],  va *= 5
+    def __imul__(self, v: Union[float, Vec3Like]) -> Self:
+        if isinstance(v, (int, float)):
+            return self.scale(v)
+        return self.mul(v)
+
+    # vc = 5 * va
+    def __rmul__(self, v: float) -> "SVec3":
+        if isinstance(v, (int, float)):
+            return self.__mul__(v)
+        return NotImplemented
+
+    # endregion
+
+    # region OPERATIONS
+
+    def add(self, v: Vec3Like) -> Self:
+        x, y, z = _xyz(v)
+        self.x += x
+        self.y += y
+        self.z += z
+        return self
+
+    def sub(self, v: Vec3Like) -> Self:
+        x, y, z = _xyz(v)
+        self.x -= x
+        self.y -= y
+        self.z -= z
+        return self
+
+    def mul(self, v: Vec3Like) -> Self:
+        x, y, z = _xyz(v)
+        self.x *= x
+        self.y *= y
+        self.z *= z
+        return self
+
+    def scale(self, s: Union[int, float]) -> Self:
+        self.x *= s
+        self.y *= s
+        self.z *= s
+        return self
+
+    def norm(self) -> Self:
+        mag = math.sqrt(self.x * self.x + self.y * self.y + self.z * self.z)
+        if mag == 0:
+            return self
+
+        mag = 1 / mag
+        self.x *= mag
+        self.y *= mag
+        self.z *= mag
+        return self
+
+    def negate(self) -> Self:
+        self.x = -self.x
+        self.y = -self.y
+        self.z = -self.z
+        return self
+
+    def min(self, v: Vec3Like) -> Self:
+        x, y, z = _xyz(v)
+        self.x = min(self.x, x)
+        self.y = min(self.y, y)
+        self.z = min(self.z, z)
+        return self
+
+    def max(self, v: Vec3Like) -> Self:
+        x, y, z = _xyz(v)
+        self.x = max(self.x, x)
+        self.y = max(self.y, y)
+        self.z = max(self.z, z)
+        return self
+
+    def quatTransform(self, q: QuatLike) -> Self:
+        return self.fromQuat(q, self)
+
+    # endregion
+
+    # region FROM OPERATORS
+
+    def fromAdd(self, a: Vec3Like, b: Vec3Like) -> Self:
+        ax, ay, az = _xyz(a)
+        bx, by, bz = _xyz(b)
+        self.x = ax + bx
+        self.y = ay + by
+        self.z = az + bz
+        return self
+
+    def fromSub(self, a: Vec3Like, b: Vec3Like) -> Self:
+        ax, ay, az = _xyz(a)
+        bx, by, bz = _xyz(b)
+        self.x = ax - bx
+        self.y = ay - by
+        self.z = az - bz
+        return self
+
+    def fromMul(self, a: Vec3Like, b: Vec3Like) -> Self:
+        ax, ay, az = _xyz(a)
+        bx, by, bz = _xyz(b)
+        self.x = ax * bx
+        self.y = ay * by
+        self.z = az * bz
+        return self
+
+    def fromInvert(self, a: Vec3Like) -> Self:
+        ax, ay, az = _xyz(a)
+        self.x = 1 / ax
+        self.y = 1 / ay
+        self.z = 1 / az
+        return self
+
+    def fromNegate(self, a: Vec3Like) -> Self:
+        ax, ay, az = _xyz(a)
+        self.x = -ax
+        self.y = -ay
+        self.z = -az
+        return self
+
+    def fromCross(self, a: Vec3Like, b: Vec3Like) -> Self:
+        ax, ay, az = _xyz(a)
+        bx, by, bz = _xyz(b)
+        self.x = ay * bz - az * by
+        self.y = az * bx - ax * bz
+        self.z = ax * by - ay * bx
+        return self
+
+    def fromLerp(self, a: Vec3Like, b: Vec3Like, t: float) -> Self:
+        ax, ay, az = _xyz(a)
+        bx, by, bz = _xyz(b)
+        ti = 1 - t
+        self.x = ax * ti + bx * t
+        self.y = ay * ti + by * t
+        self.z = az * ti + bz * t
+        return self
+
+    def fromScaleThenAdd(self, s: float, v: Vec3Like, a: Vec3Like) -> Self:
+        vx, vy, vz = _xyz(v)
+        ax, ay, az = _xyz(a)
+        self.x = vx * s + ax
+        self.y = vy * s + ay
+        self.z = vz * s + az
+        return self
+
+    def fromQuat(self, q: QuatLike, v: Vec3Like) -> Self:
+        qx, qy, qz, qw = _xyzw(q)
+        vx, vy, vz = _xyz(v)
+        x1 = qy * vz - qz * vy
+        y1 = qz * vx - qx * vz
+        z1 = qx * vy - qy * vx
+        x2 = qw * x1 + qy * z1 - qz * y1
+        y2 = qw * y1 + qz * x1 - qx * z1
+        z2 = qw * z1 + qx * y1 - qy * x1
+        self.x = vx + 2 * x2
+        self.y = vy + 2 * y2
+        self.z = vz + 2 * z2
+        return self
+
+    # endregion
+
+    # region STATIC OPERATIONS
+
+    def dot(a: Vec3Like, b: Vec3Like) -> float:
+        ax, ay, az = _xyz(a)
+        bx, by, bz = _xyz(b)
+        return ax * bx + ay * by + az * bz
+
+    def cross(a: Vec3Like, b: Vec3Like) -> "SVec3":
+        return SVec3().fromCross(a, b)
+
+    def lerp(a: Vec3Like, b: Vec3Like, t: float) -> "SVec3":
+        return SVec3().fromLerp(a, b, t)
+
+    def dist(a: Vec3Like, b: Vec3Like) -> float:
+        return math.sqrt(SVec3.distSq(a, b))
+
+    def distSq(a: Vec3Like, b: Vec3Like) -> float:
+        ax, ay, az = _xyz(a)
+        bx, by, bz = _xyz(b)
+        return (ax - bx) ** 2 + (ay - by) ** 2 + (az - bz) ** 2
+
+    # endregion
+
+
+# region HELPERS
+
+
+# Components of any Vec3Like as a tuple, SVec3 skips the indexing path
+def _xyz(v: Vec3Like) -> Tuple[float, float, float]:
+    if v.__class__ is SVec3:
+        return (v.x, v.y, v.z)
+    if isinstance(v, np.ndarray):
+        return tuple(v.tolist())
+    return (v[0], v[1], v[2])
+
+
+# Same as _xyz for QuatLike objects. Checked by slot layout so SQuat does
+# not need to be imported here
+def _xyzw(q: QuatLike) -> Tuple[float, float, float, float]:
+    if isinstance(q, np.ndarray):
+        return tuple(q.tolist())
+    if hasattr(q, "w"):
+        return (q.x, q.y, q.z, q.w)
+    return (q[0], q[1], q[2], q[3])
+
+
+# endregion
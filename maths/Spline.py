@@ -0,0 +1,225 @@
+from typing import Optional, Self
+from .types import FloatOrArray
+
+from numpy.typing import NDArray
+import numpy as np
+from .Maths import wrap, writeOut
+from .ArcLength import ArcLength
+
+# REF
+# http://paulbourke.net/miscellaneous/interpolation/
+# https://www.cubic.org/docs/hermite.htm
+
+
+# Piecewise cubic through N control points of any dimension ( floats, Vec3s, colors ).
+# Uses the same curves as Lerp.cubicSpline, cubicSmooth & hermite but each segment's
+# polynomial is computed once when the points are set. Evaluating only looks up the
+# segment with np.searchsorted & runs the polynomial, for any amount of u values at once.
+# Segment i goes from pts[i] to pts[i+1], its outer neighbors are clamped to the end
+# points on open splines & wrap around on closed ones.
+class Spline:
+
+    # region MAIN
+    # mode : cubicSpline, cubicSmooth (catmull-rom) or hermite
+    # knots : u value at every control point (one extra when closed), uniform 0 to 1 if None
+    def __init__(
+        self,
+        pts: NDArray,
+        mode: str = "cubicSmooth",
+        closed: bool = False,
+        knots: Optional[NDArray] = None,
+        tension: float = 0.0,
+        bias: float = 0.0,
+    ):
+        self.mode = mode
+        self.closed = closed
+        self.tension = tension
+        self.bias = bias
+        self.version = 0  # Incremented every time the points change, for caches built on the curve
+        self._arc: Optional[ArcLength] = None
+        self.setPoints(pts, knots)
+
+    def __repr__(self) -> str:
+        return f"Spline({self.mode}, pts:{self.pts.shape[0]}, segments:{self.segCount}, closed:{self.closed})"
+
+    # endregion
+
+    # region SETTERS / GETTERS
+
+    @property
+    def segCount(self) -> int:
+        return self.coef.shape[0]
+
+    @property
+    def dim(self) -> int:
+        return self.coef.shape[2]
+
+    # u range covered by the spline
+    @property
+    def start(self) -> float:
+        return float(self.knots[0])
+
+    @property
+    def end(self) -> float:
+        return float(self.knots[-1])
+
+    # Arc length table, built on first use & rebuilt after the points change
+    @property
+    def arc(self) -> ArcLength:
+        if self._arc is None:
+            self._arc = ArcLength(self)
+        return self._arc.update()
+
+    def setPoints(self, pts: NDArray, knots: Optional[NDArray] = None) -> Self:
+        pts = np.array(pts, dtype=np.float32)
+        self._isScalar = pts.ndim == 1
+        self.pts = pts.reshape(pts.shape[0], -1)
+
+        cnt = self.pts.shape[0]
+        segCnt = cnt if self.closed else cnt - 1
+        if cnt < 2:
+            raise ValueError("Spline needs at least 2 control points")
+
+        if knots is None:
+            knots = np.linspace(0, 1, segCnt + 1)
+        else:
+            knots = np.asarray(knots, dtype=np.float64)
+            if knots.shape != (segCnt + 1,):
+                raise ValueError(f"Expected {segCnt + 1} knots, got shape {knots.shape}")
+            if np.any(np.diff(knots) <= 0):
+                raise ValueError("Knots must be strictly increasing")
+
+        # Uniform knots can find the segment with a multiply instead of a search
+        step = np.diff(knots)
+        self._invStep = 1 / step[0] if np.allclose(step, step[0]) else None
+
+        self.knots = knots
+        self.invLen = (1 / np.diff(knots)).astype(np.float32)
+        self.coef = self._computeCoef()
+        self.version += 1
+        return self
+
+    # Update some control points in place, only rebuilds the coefficients
+    def updatePoints(self, idx, pts: NDArray) -> Self:
+        self.pts[idx] = np.reshape(pts, self.pts[idx].shape)
+        self.coef = self._computeCoef()
+        self.version += 1
+        return self
+
+    # endregion
+
+    # region EVALUATE
+
+    # Segment index & local 0 to 1 t for every u. Open splines clamp u to their
+    # range, closed ones wrap around
+    def segment(self, u: FloatOrArray):
+        k = self.knots
+        u = wrap(u, k[0], k[-1]) if self.closed else np.clip(u, k[0], k[-1])
+
+        if self._invStep is not None:
+            i = ((u - k[0]) * self._invStep).astype(np.intp)
+        else:
+            i = np.searchsorted(k, u, side="right") - 1
+
+        i = np.minimum(i, self.segCount - 1)
+        t = ((u - k[i]) * self.invLen[i]).astype(np.float32)
+        return i, t
+
+    # Position at u
+    def at(self, u: FloatOrArray, out: Optional[NDArray] = None) -> NDArray:
+        i, t = self.segment(u)
+        c = np.take(self.coef, i, axis=0)
+        t = t[..., None]
+
+        v = c[..., 3, :] * t
+        v += c[..., 2, :]
+        v *= t
+        v += c[..., 1, :]
+        v *= t
+        v += c[..., 0, :]
+        return writeOut(self._shape(v), out)
+
+    # Derivative of position with respect to u. Order 1 is the tangent ( velocity )
+    # & order 2 is the acceleration. Tangents are not normalized.
+    def deriv(self, u: FloatOrArray, order: int = 1, out: Optional[NDArray] = None) -> NDArray:
+        i, t = self.segment(u)
+        c = np.take(self.coef, i, axis=0)
+        t = t[..., None]
+        s = self.invLen[i][..., None]  # dt/du of the segment
+
+        match order:
+            case 1:
+                v = ((3 * c[..., 3, :] * t + 2 * c[..., 2, :]) * t + c[..., 1, :]) * s
+            case 2:
+                v = (6 * c[..., 3, :] * t + 2 * c[..., 2, :]) * (s * s)
+            case 3:
+                v = 6 * c[..., 3, :] * (s * s * s)
+            case _:
+                raise ValueError(f"Derivative order must be 1 to 3, got {order}")
+
+        return writeOut(self._shape(v), out)
+
+    # Evaluate cnt evenly spaced u values over the whole spline
+    def sample(self, cnt: int, out: Optional[NDArray] = None) -> NDArray:
+        # Closed splines skip the last u since it lands back on the first point
+        u = np.linspace(self.start, self.end, cnt, endpoint=not self.closed)
+        return self.at(u, out)
+
+    # endregion
+
+    # region INTERNAL
+
+    # Per segment polynomial coefficients, (segments, 4, dim). Each segment
+    # is c[0] + c[1] * t + c[2] * t^2 + c[3] * t^3
+    def _computeCoef(self) -> NDArray:
+        p = self.pts
+        if self.closed:
+            a = np.roll(p, 1, axis=0)
+            b = p
+            c = np.roll(p, -1, axis=0)
+            d = np.roll(p, -2, axis=0)
+        else:
+            a = np.concatenate((p[:1], p[:-2]))
+            b = p[:-1]
+            c = p[1:]
+            d = np.concatenate((p[2:], p[-1:]))
+
+        coef = np.empty((b.shape[0], 4, p.shape[1]), dtype=np.float32)
+        match self.mode:
+            case "cubicSpline":
+                a0 = d - c - a + b
+                coef[:, 3] = a0
+                coef[:, 2] = a - b - a0
+                coef[:, 1] = c - a
+                coef[:, 0] = b
+
+            case "cubicSmooth":
+                coef[:, 3] = -0.5 * a + 1.5 * b - 1.5 * c + 0.5 * d
+                coef[:, 2] = a - 2.5 * b + 2 * c - 0.5 * d
+                coef[:, 1] = -0.5 * a + 0.5 * c
+                coef[:, 0] = b
+
+            case "hermite":
+                btPN = (1 + self.bias) * (1 - self.tension) / 2
+                btNP = (1 - self.bias) * (1 - self.tension) / 2
+                m0 = (b - a) * btPN + (c - b) * btNP
+                m1 = (c - b) * btPN + (d - c) * btNP
+                coef[:, 3] = 2 * b + m0 + m1 - 2 * c
+                coef[:, 2] = -3 * b - 2 * m0 - m1 + 3 * c
+                coef[:, 1] = m0
+                coef[:, 0] = b
+
+            case _:
+                raise ValueError(f"Unknown spline mode: {self.mode}")
+
+        return coef
+
+    # Splines made of floats return floats instead of 1 wide vectors, or float
+    # arrays for an array of u
+    def _shape(self, v: NDArray) -> FloatOrArray:
+        if not self._isScalar:
+            return v
+        v = v[..., 0]
+        return float(v) if v.ndim == 0 else v
+
+    # endregion
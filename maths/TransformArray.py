@@ -0,0 +1,203 @@
+from typing import Optional, Self, Union, List
+from .types import Vec3Like
+
+from numpy.typing import NDArray
+import numpy as np
+
+from .Transform import Transform
+from .Vec3Array import Vec3Array, vaQuatTransform
+from .QuatArray import QuatArray, qaMul, qaInvert
+
+# REF
+# https://gabormakesgames.com/blog_transforms_transforms.html
+# https://gabormakesgames.com/blog_transforms_transform_world.html
+
+
+# Batch companion to Transform. Holds N transforms as rot (N,4), pos (N,3) & scl (N,3)
+# buffers plus a parent index per node (-1 for roots). Nodes are grouped by depth so a
+# whole hierarchy can be evaluated level by level, one vectorized pass per level.
+class TransformArray:
+
+    # region MAIN
+    def __init__(self, cnt: int = 0, parents: Optional[NDArray] = None):
+        self.rot = QuatArray(cnt)
+        self.pos = Vec3Array(cnt)
+        self.scl = Vec3Array(cnt, [1, 1, 1])
+        self.parents = np.full(cnt, -1, dtype=np.int32)
+        self.levels: List[NDArray] = [np.arange(cnt, dtype=np.int32)]
+
+        if parents is not None:
+            self.setParents(parents)
+
+    def __str__(self) -> str:
+        return self.__repr__()
+
+    def __repr__(self) -> str:
+        return f"rot:{self.rot} \npos:{self.pos} \nscl:{self.scl} \nparents:{self.parents}"
+
+    # endregion
+
+    # region SETTERS / GETTERS
+
+    @property
+    def count(self) -> int:
+        return self.parents.shape[0]
+
+    # Set the parent index of every node, -1 marks a root. Parents do not need
+    # to come before their children in the buffer.
+    def setParents(self, parents: NDArray) -> Self:
+        parents = np.asarray(parents, dtype=np.int32)
+        cnt = self.count
+        if parents.shape != (cnt,):
+            raise ValueError(f"Expected {cnt} parent indices, got shape {parents.shape}")
+
+        if np.any((parents < -1) | (parents >= cnt)):
+            raise ValueError("Parent index out of range")
+
+        # Push depth down the tree one generation at a time. Any node still
+        # changing after cnt passes has to be part of a cycle.
+        isChild = parents >= 0
+        pIdx = parents[isChild]
+        depth = np.zeros(cnt, dtype=np.int32)
+        for _ in range(cnt + 1):
+            nDepth = np.zeros(cnt, dtype=np.int32)
+            nDepth[isChild] = depth[pIdx] + 1
+            if np.array_equal(nDepth, depth):
+                break
+            depth = nDepth
+        else:
+            raise ValueError("Parent indices contain a cycle")
+
+        # Group node indices by depth
+        order = np.argsort(depth, kind="stable").astype(np.int32)
+        splits = np.flatnonzero(np.diff(depth[order])) + 1
+
+        self.parents = parents
+        self.levels = np.split(order, splits) if cnt else []
+        return self
+
+    def copy(self, t: "TransformArray") -> Self:
+        self.rot.copy(t.rot)
+        self.pos.copy(t.pos)
+        self.scl.copy(t.scl)
+        return self
+
+    def clone(self) -> "TransformArray":
+        t = TransformArray()
+        t.rot = self.rot.clone()
+        t.pos = self.pos.clone()
+        t.scl = self.scl.clone()
+        t.parents = self.parents.copy()
+        t.levels = [lvl.copy() for lvl in self.levels]
+        return t
+
+    # Copy a single node out into a Transform
+    def getTransform(self, i: int, out: Optional[Transform] = None) -> Transform:
+        out = out or Transform()
+        out.rot.copy(self.rot[i])
+        out.pos.copy(self.pos[i])
+        out.scl.copy(self.scl[i])
+        return out
+
+    def setTransform(self, i: int, t: Transform) -> Self:
+        self.rot[i] = t.rot
+        self.pos[i] = t.pos
+        self.scl[i] = t.scl
+        return self
+
+    # endregion
+
+    # region FROM OPERATORS
+
+    # Parent -> Child for every row, either side can also be a single Transform
+    def fromMul(
+        self, tp: Union["TransformArray", Transform], tc: Union["TransformArray", Transform]
+    ) -> Self:
+        taMul(tp.rot, tp.pos, tp.scl, tc.rot, tc.pos, tc.scl, self.rot, self.pos, self.scl)
+        return self
+
+    def fromInvert(self, t: Union["TransformArray", Transform]) -> Self:
+        # Invert Rotation
+        qaInvert(t.rot, self.rot)
+
+        # Invert Scale
+        np.divide(1, t.scl, out=self.scl)
+
+        # Invert Position : rotInv * ( invScl * -Pos )
+        np.negative(t.pos, out=self.pos)
+        np.multiply(self.pos, self.scl, out=self.pos)
+        vaQuatTransform(self.rot, self.pos, self.pos)
+        return self
+
+    # Treat this array as local space transforms, write the world space of every
+    # node into out. Each depth level is computed in one vectorized pass.
+    def toWorld(self, out: Optional["TransformArray"] = None) -> "TransformArray":
+        if out is None:
+            out = self.clone()
+        elif out is not self:
+            out.copy(self)
+
+        # Roots are already in world space, every other level
+        # only depends on the level above it
+        for idx in self.levels[1:]:
+            p = self.parents[idx]
+            rot = QuatArray.fromBuffer(out.rot[p])
+            pos = Vec3Array.fromBuffer(out.pos[p])
+            scl = Vec3Array.fromBuffer(out.scl[p])
+            taMul(rot, pos, scl, out.rot[idx], out.pos[idx], out.scl[idx], rot, pos, scl)
+
+            out.rot[idx] = rot
+            out.pos[idx] = pos
+            out.scl[idx] = scl
+
+        return out
+
+    # endregion
+
+    # region TRANSFORMATION
+
+    # Transform one Vec3 per row (or one Vec3 by every row)
+    def transformVec3(
+        self, v: Union[Vec3Like, NDArray], out: Optional[NDArray] = None
+    ) -> NDArray:
+        # GLSL - vecQuatRotation(model.rotation, a_position.xyz * model.scale) + model.position;
+        if out is None:
+            shape = np.broadcast_shapes(self.pos.shape, np.shape(v))
+            out = np.empty(shape, dtype=np.float32).view(Vec3Array)
+
+        np.multiply(v, self.scl, out=out)
+        vaQuatTransform(self.rot, out, out)
+        np.add(out, self.pos, out=out)
+        return out
+
+    # endregion
+
+
+# region REUSABLE OPS
+
+
+# Parent * Child over whole buffers, outputs can alias the parent inputs
+def taMul(
+    pRot: NDArray,
+    pPos: NDArray,
+    pScl: NDArray,
+    cRot: NDArray,
+    cPos: NDArray,
+    cScl: NDArray,
+    oRot: NDArray,
+    oPos: NDArray,
+    oScl: NDArray,
+) -> None:
+    # POSITION - parent.position + (  ( parent.scale * child.position ) * parent.rotation )
+    v = np.multiply(pScl, cPos, dtype=np.float32)
+    vaQuatTransform(pRot, v, v)
+    np.add(pPos, v, out=oPos)
+
+    # SCALE - parent.scale * child.scale
+    np.multiply(pScl, cScl, out=oScl)
+
+    # ROTATION - parent.rotation * child.rotation
+    qaMul(pRot, cRot, oRot)
+
+
+# endregion
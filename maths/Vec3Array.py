@@ -0,0 +1,313 @@
+from typing import Optional, Type, Self, Union
+from .types import Vec3Like, QuatLike
+
+from numpy.typing import NDArray
+import numpy as np
+from .Vec3 import Vec3
+
+
+# Batch companion to Vec3, holds N vectors in one contiguous (N,3) float32 buffer.
+# Methods mirror Vec3 but every op runs as one vectorized numpy call over all rows.
+# Operations default to writing into self, pass out= to write somewhere else.
+class Vec3Array(np.ndarray):
+    # region SETUP
+
+    # create new (cnt, 3) buffer and cast it as a Vec3Array
+    def __new__(cls: Type[Self], cnt: int = 0, init: Vec3Like = [0, 0, 0]) -> Self:
+        return np.full((cnt, 3), init, dtype=np.float32).view(cls)
+
+    def __array_finalize__(self, obj: Optional[np.ndarray]) -> None:
+        if obj is None:
+            return
+
+    # Wrap an existing buffer, no copy is made when its already contiguous float32
+    def fromBuffer(buf: NDArray) -> "Vec3Array":
+        return np.asarray(buf, dtype=np.float32).reshape(-1, 3).view(Vec3Array)
+
+    # endregion
+
+    # region GETTERS / SETTERS
+
+    @property
+    def count(self) -> int:
+        return self.shape[0]
+
+    @property
+    def x(self) -> NDArray:
+        return self[..., 0]
+
+    @property
+    def y(self) -> NDArray:
+        return self[..., 1]
+
+    @property
+    def z(self) -> NDArray:
+        return self[..., 2]
+
+    @property
+    def len(self) -> NDArray:
+        return np.sqrt(self.lenSq)
+
+    @property
+    def lenSq(self) -> NDArray:
+        x = self[..., 0]
+        y = self[..., 1]
+        z = self[..., 2]
+        return x * x + y * y + z * z
+
+    # Row as a Vec3 that shares memory with this buffer
+    def at(self, i: int) -> Vec3:
+        return self[i].view(Vec3)
+
+    # With no a this is ndarray.copy, which numpy calls internally
+    def copy(self, a: Optional[NDArray] = None, order: str = "C") -> Self:
+        if a is None:
+            return super().copy(order)
+        self[...] = a
+        return self
+
+    def copyTo(self, a: NDArray) -> Self:
+        a[...] = self
+        return self
+
+    def clone(self) -> "Vec3Array":
+        return np.array(self, dtype=np.float32).view(Vec3Array)
+
+    # endregion
+
+    # region OPERATIONS
+
+    def add(self, v: Union[Vec3Like, NDArray], out: Optional[NDArray] = None) -> NDArray:
+        return np.add(self, v, out=self if out is None else out)
+
+    def sub(self, v: Union[Vec3Like, NDArray], out: Optional[NDArray] = None) -> NDArray:
+        return np.subtract(self, v, out=self if out is None else out)
+
+    def mul(self, v: Union[Vec3Like, NDArray], out: Optional[NDArray] = None) -> NDArray:
+        return np.multiply(self, v, out=self if out is None else out)
+
+    # s can be a single scalar or one scalar per row
+    def scale(self, s: Union[float, NDArray], out: Optional[NDArray] = None) -> NDArray:
+        return np.multiply(self, _perRow(s), out=self if out is None else out)
+
+    def norm(self, out: Optional[NDArray] = None) -> NDArray:
+        mag = np.sqrt(self.lenSq)
+
+        # Zero length rows are left as is, same as Vec3.norm
+        inv = np.divide(1, mag, out=np.ones_like(mag), where=mag != 0)
+        return np.multiply(self, inv[..., None], out=self if out is None else out)
+
+    def negate(self, out: Optional[NDArray] = None) -> NDArray:
+        return np.negative(self, out=self if out is None else out)
+
+    # Per component min / max against v, Vec3's min & max. Those names stay the
+    # ndarray reductions so np.min(a) & a.min(0) still work
+    def minWith(self, v: Union[Vec3Like, NDArray], out: Optional[NDArray] = None) -> NDArray:
+        return np.minimum(self, v, out=self if out is None else out)
+
+    def maxWith(self, v: Union[Vec3Like, NDArray], out: Optional[NDArray] = None) -> NDArray:
+        return np.maximum(self, v, out=self if out is None else out)
+
+    # q can be a single quat or one quat per row
+    def quatTransform(
+        self, q: Union[QuatLike, NDArray], out: Optional[NDArray] = None
+    ) -> NDArray:
+        return vaQuatTransform(q, self, self if out is None else out)
+
+    # endregion
+
+    # region FROM OPERATORS
+
+    def fromAdd(self, a: NDArray, b: NDArray) -> Self:
+        np.add(a, b, out=self)
+        return self
+
+    def fromSub(self, a: NDArray, b: NDArray) -> Self:
+        np.subtract(a, b, out=self)
+        return self
+
+    def fromMul(self, a: NDArray, b: NDArray) -> Self:
+        np.multiply(a, b, out=self)
+        return self
+
+    def fromInvert(self, a: NDArray) -> Self:
+        np.divide(1, a, out=self)
+        return self
+
+    def fromNegate(self, a: NDArray) -> Self:
+        np.negative(a, out=self)
+        return self
+
+    def fromCross(self, a: NDArray, b: NDArray) -> Self:
+        vaCross(a, b, self)
+        return self
+
+    def fromLerp(self, a: NDArray, b: NDArray, t: Union[float, NDArray]) -> Self:
+        Vec3Array.lerp(a, b, t, self)
+        return self
+
+    def fromScaleThenAdd(self, s: Union[float, NDArray], v: NDArray, a: NDArray) -> Self:
+        np.multiply(v, _perRow(s), out=self)
+        np.add(self, a, out=self)
+        return self
+
+    def fromQuat(self, q: Union[QuatLike, NDArray], v: NDArray) -> Self:
+        vaQuatTransform(q, v, self)
+        return self
+
+    # endregion
+
+    # region STATIC OPERATIONS
+
+    def dot(a: NDArray, b: NDArray, out: Optional[NDArray] = None) -> NDArray:
+        a = np.asarray(a)
+        b = np.asarray(b)
+        rtn = a[..., 0] * b[..., 0] + a[..., 1] * b[..., 1] + a[..., 2] * b[..., 2]
+        if out is None:
+            return rtn
+
+        out[...] = rtn
+        return out
+
+    def cross(a: NDArray, b: NDArray, out: Optional[NDArray] = None) -> NDArray:
+        return vaCross(a, b, _alloc(out, a, b))
+
+    def lerp(
+        a: NDArray, b: NDArray, t: Union[float, NDArray], out: Optional[NDArray] = None
+    ) -> NDArray:
+        t = _perRow(t)
+        ti = 1 - t
+        out = _alloc(out, a, b)
+
+        # Computed into temps first so out can alias a or b
+        rtn = np.multiply(a, ti)
+        rtn += np.multiply(b, t)
+        out[...] = rtn
+        return out
+
+    def dist(a: NDArray, b: NDArray) -> NDArray:
+        return np.sqrt(Vec3Array.distSq(a, b))
+
+    def distSq(a: NDArray, b: NDArray) -> NDArray:
+        d = np.subtract(a, b, dtype=np.float32)
+        x = d[..., 0]
+        y = d[..., 1]
+        z = d[..., 2]
+        return x * x + y * y + z * z
+
+    def createBuffer(cnt: int, init: Vec3Like = [0, 0, 0]) -> "Vec3Array":
+        return Vec3Array(cnt, init)
+
+    # endregion
+
+
+# region REUSABLE OPS
+
+
+# Cross product of (3,) or (N,3) inputs, out can alias either input
+def vaCross(a: NDArray, b: NDArray, out: NDArray) -> NDArray:
+    a = np.asarray(a, dtype=np.float32)
+    b = np.asarray(b, dtype=np.float32)
+    ax = a[..., 0]
+    ay = a[..., 1]
+    az = a[..., 2]
+    bx = b[..., 0]
+    by = b[..., 1]
+    bz = b[..., 2]
+
+    x = ay * bz - az * by
+    y = az * bx - ax * bz
+    z = ax * by - ay * bx
+
+    out[..., 0] = x
+    out[..., 1] = y
+    out[..., 2] = z
+    return out
+
+
+# Rotate (3,) or (N,3) vectors by (4,) or (N,4) quats. Same math as Vec3.quatTransform
+# done in the same order so results match the scalar version. out can alias v.
+# All intermediate values live in a single (7, N) scratch block, pass one in with
+# tmp to keep repeated calls free of allocations.
+def vaQuatTransform(
+    q: Union[QuatLike, NDArray],
+    v: Union[Vec3Like, NDArray],
+    out: NDArray,
+    tmp: Optional[NDArray] = None,
+) -> NDArray:
+    q = np.asarray(q, dtype=np.float32)
+    v = np.asarray(v, dtype=np.float32)
+    shape = np.broadcast_shapes(q.shape[:-1], v.shape[:-1])
+
+    if tmp is None:
+        tmp = np.empty((7, *shape), dtype=np.float32)
+
+    qx = q[..., 0]
+    qy = q[..., 1]
+    qz = q[..., 2]
+    qw = q[..., 3]
+    vx = v[..., 0]
+    vy = v[..., 1]
+    vz = v[..., 2]
+    x1, y1, z1, x2, y2, z2, s = (tmp[i, ...] for i in range(7))
+
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    # c1 = cross(q.xyz, v)
+    np.multiply(qy, vz, out=x1)
+    np.multiply(qz, vy, out=s)
+    np.subtract(x1, s, out=x1)
+
+    np.multiply(qz, vx, out=y1)
+    np.multiply(qx, vz, out=s)
+    np.subtract(y1, s, out=y1)
+
+    np.multiply(qx, vy, out=z1)
+    np.multiply(qy, vx, out=s)
+    np.subtract(z1, s, out=z1)
+
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    # c2 = q.w * c1 + cross(q.xyz, c1)
+    np.multiply(qw, x1, out=x2)
+    np.multiply(qy, z1, out=s)
+    np.add(x2, s, out=x2)
+    np.multiply(qz, y1, out=s)
+    np.subtract(x2, s, out=x2)
+
+    np.multiply(qw, y1, out=y2)
+    np.multiply(qz, x1, out=s)
+    np.add(y2, s, out=y2)
+    np.multiply(qx, z1, out=s)
+    np.subtract(y2, s, out=y2)
+
+    np.multiply(qw, z1, out=z2)
+    np.multiply(qx, y1, out=s)
+    np.add(z2, s, out=z2)
+    np.multiply(qy, x1, out=s)
+    np.subtract(z2, s, out=z2)
+
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    # out = v + 2 * c2
+    np.multiply(x2, 2, out=x2)
+    np.multiply(y2, 2, out=y2)
+    np.multiply(z2, 2, out=z2)
+    np.add(vx, x2, out=out[..., 0])
+    np.add(vy, y2, out=out[..., 1])
+    np.add(vz, z2, out=out[..., 2])
+    return out
+
+
+# Scalars pass through, per row arrays get a trailing axis to broadcast over xyz
+def _perRow(s: Union[float, NDArray]) -> Union[float, NDArray]:
+    if isinstance(s, np.ndarray) and s.ndim > 0:
+        return s[..., None]
+    return s
+
+
+def _alloc(out: Optional[NDArray], a: NDArray, b: NDArray) -> NDArray:
+    if out is not None:
+        return out
+    shape = np.broadcast_shapes(np.shape(a), np.shape(b))
+    return np.empty(shape, dtype=np.float32).view(Vec3Array)
+
+
+# endregion
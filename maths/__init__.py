@@ -1,4 +1,11 @@
 from .Transform import Transform, Vec3, Quat
+from .Vec3Array import Vec3Array
+from .QuatArray import QuatArray
+from .TransformArray import TransformArray
+from .SVec3 import SVec3
+from .SQuat import SQuat
+from .Spline import Spline
+from .ArcLength import ArcLength
 from . import Easing as Easing
 from . import Gradient as Gradient
 from . import Lerp as Lerp
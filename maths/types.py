@@ -7,4 +7,5 @@ if TYPE_CHECKING:
     from .Quat import Quat
 
 type Vec3Like = Union['Vec3', List[float], Tuple[float, float, float], np.ndarray]
-type QuatLike = Union['Quat', List[float], Tuple[float, float, float, float], np.ndarray]
\ No newline at end of file
+type QuatLike = Union['Quat', List[float], Tuple[float, float, float, float], np.ndarray]
+type FloatOrArray = Union[float, np.ndarray]
@@ -0,0 +1,238 @@
+# region IMPORTS
+import numpy as np
+import pygfx as gfx
+from pygfx.renderers.wgpu import Binding, register_wgpu_render_function
+from pygfx.renderers.wgpu.shaders.pointsshader import PointsShader
+from pygfx.renderers.wgpu.shaders.lineshader import (
+    LineSegmentShader,
+    renderer_uniform_type,
+)
+from pygfx.utils import array_from_shadertype
+from pgfx.Util import UPLOAD_CHUNK
+
+# endregion
+
+# Compact vertex formats for DynamicPoints & DynamicLines. gfx binds geometry as
+# storage buffers that only take 4 byte types, so compact data is packed into u32s
+# & the stock points / line shaders get their load_s_* functions swopped out for
+# ones that unpack it.
+#   colors    : unorm8 rgba, 1 u32 per item instead of 4 floats
+#   sizes     : float16, 2 per u32
+#   positions : unorm16 xyz, 2 u32 per item. Relative to the bounds of the chunk
+#               the item is in, each chunk has an offset & range in s_qchunks
+
+# region CONSTANTS
+
+# Items per quantization chunk. Same as the upload chunk so requantizing a chunk
+# never sends more than the dirty range already does
+QUANT_CHUNK = UPLOAD_CHUNK
+QUANT_MAX = 65535
+
+# endregion
+
+# region HELPERS
+
+
+# Set of attributes to store compact. True for all of them, False for none
+def compactAttrs(compact, allowed):
+    if compact is True:
+        return frozenset(allowed)
+    if not compact:
+        return frozenset()
+
+    attrs = frozenset(compact)
+    if not attrs <= set(allowed):
+        raise ValueError(f"Compact formats only for {allowed}, got {sorted(attrs)}")
+    return attrs
+
+
+# Storage for cap quantized positions, xyz + padding as uint16
+def newQuantPositions(cap):
+    return np.zeros((cap, 4), dtype=np.uint16)
+
+
+# Offset & range rows of every quantization chunk for cap items
+def newQuantChunks(cap):
+    return np.zeros((-(-cap // QUANT_CHUNK) * 2, 4), dtype=np.float32)
+
+
+# Storage for cap float16 sizes, padded to fill the last u32
+def newHalfSizes(cap):
+    return np.zeros(cap + (cap & 1), dtype=np.float16)
+
+
+# endregion
+
+# region REUSABLE OPS
+
+
+# Bounds of the first n items from the offset & range of their chunks, (2,3) or
+# None when there are none
+def chunkBounds(chunks, n):
+    if n <= 0:
+        return None
+
+    k = -(-n // QUANT_CHUNK)
+    lo = chunks[0 : k * 2 : 2, :3]
+    hi = lo + chunks[1 : k * 2 : 2, :3]
+    return np.stack((lo.min(axis=0), hi.max(axis=0))).astype(np.float64)
+
+
+# Quantize pos[start:end] into q relative to the bounds of each chunk, chunks gets
+# the offset & range of each one. start must be on a chunk boundary.
+def quantizeChunks(pos, q, chunks, start, end):
+    if end <= start:
+        return
+
+    p = pos[start:end]
+    idx = np.arange(0, end - start, QUANT_CHUNK)
+    lo = np.minimum.reduceat(p, idx, axis=0)
+    rng = np.maximum.reduceat(p, idx, axis=0) - lo
+
+    k = start // QUANT_CHUNK
+    chunks[k * 2 : (k + idx.shape[0]) * 2 : 2, :3] = lo
+    chunks[k * 2 + 1 : (k + idx.shape[0]) * 2 : 2, :3] = rng
+
+    # Flat chunks have a zero range, every item is at the offset
+    scale = QUANT_MAX / np.where(rng > 0, rng, 1)
+    row = np.arange(end - start) // QUANT_CHUNK
+    q[start:end, :3] = np.rint((p - lo[row]) * scale[row])
+
+
+# Back to float positions, for checking quantization error
+def dequantizeChunks(q, chunks, cnt):
+    k = np.arange(cnt) // QUANT_CHUNK
+    n = q[:cnt, :3] / np.float32(QUANT_MAX)
+    return chunks[k * 2, :3] + n * chunks[k * 2 + 1, :3]
+
+
+# endregion
+
+# region WGSL
+
+WGSL_POSITIONS = f"""
+fn load_s_positions(i: i32) -> vec3<f32> {{
+    let q = s_positions[i];
+    let c = (i / {QUANT_CHUNK}) * 2;
+    let n = vec3<f32>(unpack2x16unorm(q.x), unpack2x16unorm(q.y).x);
+    return s_qchunks[c].xyz + n * s_qchunks[c + 1].xyz;
+}}"""
+
+WGSL_COLORS = """
+fn load_s_colors(i: i32) -> vec4<f32> {
+    return unpack4x8unorm(s_colors[i]);
+}"""
+
+WGSL_SIZES = """
+fn load_s_sizes(i: i32) -> f32 {
+    let v = unpack2x16float(s_sizes[i / 2]);
+    return select(v.x, v.y, (i & 1) == 1);
+}"""
+
+
+# Swop the generated load function of a binding. gfx writes one for the raw u32s,
+# the declaration of the buffer before it is kept.
+def replaceLoader(shader, name, code):
+    codes = shader._binding_definitions._binding_codes
+    if name in codes:
+        codes[name] = codes[name].partition("fn load_")[0] + code
+
+
+# Bind the chunk offsets & use the unpacking loaders for compact buffers
+def defineCompact(shader, geometry, bindings):
+    fmt = {
+        b.name: b.resource.format
+        for b in bindings.values()
+        if b.type.startswith("buffer/read_only_storage")
+    }
+
+    if fmt.get("s_positions") == "2xu4":
+        b = Binding("s_qchunks", "buffer/read_only_storage", geometry.qchunks, "VERTEX")
+        bindings[len(bindings)] = b
+        shader.define_bindings(0, {len(bindings) - 1: b})
+        replaceLoader(shader, "s_positions", WGSL_POSITIONS)
+
+    if fmt.get("s_colors") == "u4":
+        replaceLoader(shader, "s_colors", WGSL_COLORS)
+
+    if fmt.get("s_sizes") == "u4":
+        replaceLoader(shader, "s_sizes", WGSL_SIZES)
+
+
+# Packed colors are a single u32 but unpack to rgba
+def fixColorChannels(shader, geometry):
+    if shader["color_mode"] == "vertex" and geometry.colors.format == "u4":
+        shader["color_buffer_channels"] = 4
+
+
+# endregion
+
+# region MATERIALS & SHADERS
+
+
+# Same as the stock materials, only picks the compact shaders
+class CompactPointsMaterial(gfx.PointsMaterial):
+    pass
+
+
+class CompactLineSegmentMaterial(gfx.LineSegmentMaterial):
+    pass
+
+
+@register_wgpu_render_function(gfx.Points, CompactPointsMaterial)
+class CompactPointsShader(PointsShader):
+    def __init__(self, wobject):
+        super().__init__(wobject)
+        fixColorChannels(self, wobject.geometry)
+
+    def get_bindings(self, wobject, shared):
+        out = super().get_bindings(wobject, shared)
+        defineCompact(self, wobject.geometry, out[0])
+        return out
+
+
+@register_wgpu_render_function(gfx.Line, CompactLineSegmentMaterial)
+class CompactLineSegmentShader(LineSegmentShader):
+    def __init__(self, wobject):
+        super().__init__(wobject)
+        fixColorChannels(self, wobject.geometry)
+
+    # Same as LineShader.get_bindings minus the Nx3 positions check & dashing
+    def get_bindings(self, wobject, shared):
+        material = wobject.material
+        geometry = wobject.geometry
+
+        uniform_buffer = gfx.Buffer(
+            array_from_shadertype(renderer_uniform_type), force_contiguous=True
+        )
+        uniform_buffer.data["last_i"] = geometry.positions.nitems - 1
+
+        rbuffer = "buffer/read_only_storage"
+        bindings = [
+            Binding("u_stdinfo", "buffer/uniform", shared.uniform_buffer),
+            Binding("u_wobject", "buffer/uniform", wobject.uniform_buffer),
+            Binding("u_material", "buffer/uniform", material.uniform_buffer),
+            Binding("u_renderer", "buffer/uniform", uniform_buffer),
+            Binding("s_positions", rbuffer, geometry.positions, "VERTEX"),
+        ]
+
+        if self["color_mode"] in ("vertex", "face"):
+            bindings.append(Binding("s_colors", rbuffer, geometry.colors, "VERTEX"))
+        elif self["color_mode"] in ("vertex_map", "face_map"):
+            bindings.append(
+                Binding("s_texcoords", rbuffer, geometry.texcoords, "VERTEX")
+            )
+            bindings.extend(
+                self.define_generic_colormap(material.map, geometry.texcoords)
+            )
+
+        bindings = {i: b for i, b in enumerate(bindings)}
+        self.define_bindings(0, bindings)
+        defineCompact(self, geometry, bindings)
+
+        return {
+            0: bindings,
+        }
+
+
+# endregion
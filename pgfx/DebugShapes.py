@@ -0,0 +1,186 @@
+# region IMPORTS
+from functools import lru_cache
+
+import numpy as np
+from maths.Vec3Array import vaQuatTransform
+
+# endregion
+
+# Line segment generators for debug shapes. Every shape is a unit template of
+# segments, (S,2,3), that gets scaled, rotated & moved for N shapes in one pass.
+# Generators return the a & b points of all N * S segments, ready for
+# DynamicLines.addSegments.
+#   pos   : (N,3) centers
+#   rot   : None, a single quat or (N,4) quats, QuatArray works as is
+#   scale : Scalar for every shape, (N,) uniform per shape or (N,3) per axis
+
+# region TEMPLATES
+# Templates are cached, read only arrays
+
+
+def _template(segs):
+    tpl = np.asarray(segs, dtype=np.float32).reshape(-1, 2, 3)
+    tpl.flags.writeable = False
+    return tpl
+
+
+# Unit circle on the XZ plane, facing +Y
+@lru_cache(maxsize=16)
+def circleTemplate(segs=32):
+    t = np.linspace(0, np.pi * 2, segs + 1)
+    p = np.stack((np.cos(t), np.zeros_like(t), np.sin(t)), axis=1)
+    return _template(np.stack((p[:-1], p[1:]), axis=1))
+
+
+# 12 edges of a unit cube centered on the origin
+@lru_cache(maxsize=1)
+def boxTemplate():
+    c = np.array(
+        [[x, y, z] for x in (-0.5, 0.5) for y in (-0.5, 0.5) for z in (-0.5, 0.5)]
+    )
+    edges = [(i, i ^ bit) for i in range(8) for bit in (1, 2, 4) if i < i ^ bit]
+    return _template([(c[a], c[b]) for a, b in edges])
+
+
+# Unit sphere as 3 circles, one on each axis plane
+@lru_cache(maxsize=16)
+def sphereTemplate(segs=32):
+    xz = circleTemplate(segs)
+    return _template(np.concatenate((xz, xz[..., [1, 0, 2]], xz[..., [0, 2, 1]])))
+
+
+# Unit X, Y & Z segments from the origin
+@lru_cache(maxsize=1)
+def axesTemplate():
+    return _template(
+        [[(0, 0, 0), (1, 0, 0)], [(0, 0, 0), (0, 1, 0)], [(0, 0, 0), (0, 0, 1)]]
+    )
+
+
+# Unit grid on the XZ plane with div cells a side, -0.5 to 0.5
+@lru_cache(maxsize=16)
+def gridTemplate(div=10):
+    t = np.linspace(-0.5, 0.5, div + 1)
+    z = np.zeros_like(t)
+    h = np.full_like(t, 0.5)
+    a = np.concatenate((np.stack((t, z, -h), 1), np.stack((-h, z, t), 1)))
+    b = np.concatenate((np.stack((t, z, h), 1), np.stack((h, z, t), 1)))
+    return _template(np.stack((a, b), axis=1))
+
+
+# Camera frustum looking down -Z like gfx cameras. fov is the vertical angle in
+# degrees, near & far are distances from the origin
+@lru_cache(maxsize=16)
+def frustumTemplate(fov=50, aspect=1.0, near=0.1, far=1.0):
+    t = np.tan(np.radians(fov) * 0.5)
+    quads = []
+    for d in (near, far):
+        h, w = d * t, d * t * aspect
+        quads.append([(-w, -h, -d), (w, -h, -d), (w, h, -d), (-w, h, -d)])
+
+    n, f = quads
+    segs = []
+    for i in range(4):
+        j = (i + 1) % 4
+        segs += [(n[i], n[j]), (f[i], f[j]), (n[i], f[i])]
+    return _template(segs)
+
+
+# endregion
+
+# region REUSABLE OPS
+
+
+# Scale of N shapes shaped to broadcast over their template points
+def _shapeScale(scale):
+    s = np.asarray(scale, dtype=np.float32)
+    if s.ndim == 0:
+        return s
+    if s.ndim == 1:
+        return s.reshape(-1, 1, 1)
+    return s.reshape(-1, 1, 3)
+
+
+# Place N copies of a template, returns the a & b points of every segment
+def placeTemplate(tpl, pos, rot=None, scale=1.0):
+    pos = np.asarray(pos, dtype=np.float32).reshape(-1, 1, 3)
+    pts = tpl.reshape(1, -1, 3) * _shapeScale(scale)
+
+    if rot is not None:
+        q = np.asarray(rot, dtype=np.float32).reshape(-1, 1, 4)
+        n = max(pos.shape[0], q.shape[0], pts.shape[0])
+        out = np.empty((n, pts.shape[1], 3), dtype=np.float32)
+        pts = vaQuatTransform(q, pts, out)
+
+    seg = (pts + pos).reshape(-1, 2, 3)
+    return seg[:, 0], seg[:, 1]
+
+
+def circles(pos, rot=None, radius=1.0, segs=32):
+    return placeTemplate(circleTemplate(segs), pos, rot, radius)
+
+
+def boxes(pos, rot=None, size=1.0):
+    return placeTemplate(boxTemplate(), pos, rot, size)
+
+
+def spheres(pos, rot=None, radius=1.0, segs=32):
+    return placeTemplate(sphereTemplate(segs), pos, rot, radius)
+
+
+def axes(pos, rot=None, size=1.0):
+    return placeTemplate(axesTemplate(), pos, rot, size)
+
+
+def grids(pos, rot=None, size=1.0, div=10):
+    return placeTemplate(gridTemplate(div), pos, rot, size)
+
+
+def frustums(pos, rot=None, fov=50, aspect=1.0, near=0.1, far=1.0):
+    return placeTemplate(frustumTemplate(fov, aspect, near, far), pos, rot)
+
+
+# Arrows from a to b, a shaft & 4 head segments each. head is the length of the
+# head, capped at half the arrow
+def arrows(a, b, head=0.2):
+    a = np.asarray(a, dtype=np.float32).reshape(-1, 3)
+    b = np.asarray(b, dtype=np.float32).reshape(-1, 3)
+    n = max(a.shape[0], b.shape[0])
+
+    d = b - a
+    ln = np.linalg.norm(d, axis=1, keepdims=True)
+    d /= np.where(ln > 0, ln, 1)
+
+    # Side axes of the head, arrows pointing along Y use X to find them
+    u = np.cross(d, (0, 1, 0))
+    flat = np.linalg.norm(u, axis=1) < 1e-6
+    u[flat] = np.cross(d[flat], (1, 0, 0))
+    u /= np.maximum(np.linalg.norm(u, axis=1, keepdims=True), 1e-12)
+    v = np.cross(d, u)
+
+    h = np.minimum(head, ln * 0.5)
+    base = b - d * h
+    u *= h * 0.5
+    v *= h * 0.5
+
+    sa = np.empty((n, 5, 3), dtype=np.float32)
+    sb = np.empty((n, 5, 3), dtype=np.float32)
+    sa[:, 0] = a
+    sb[:, 0] = b
+    sa[:, 1:] = b[:, None]
+    sb[:, 1] = base + u
+    sb[:, 2] = base - u
+    sb[:, 3] = base + v
+    sb[:, 4] = base - v
+    return sa.reshape(-1, 3), sb.reshape(-1, 3)
+
+
+# Colors of N shapes for their segments. Per shape colors are repeated for each
+# of their segs segments, single colors pass through
+def segmentColors(col, segs):
+    if np.ndim(col) == 2:
+        return np.repeat(np.asarray(col), segs, axis=0)
+    return col
+
+
+# endregion
@@ -0,0 +1,425 @@
+# region IMPORTS
+import numpy as np
+import pygfx as gfx
+from pygfx.objects._base import id_provider
+from pygfx.renderers.wgpu import register_wgpu_render_function
+from pygfx.renderers.wgpu.shaders.meshshader import MeshPhongShader
+from pgfx.Util import fillColors, toRgba8, DirtyRanges, requestRedraw
+from pgfx.FrameProfiler import profiler
+
+# endregion
+
+# Instanced solid shapes, one draw call for every instance. Each instance has a
+# position, rotation quat, scale & color stored on the CPU, sync composes the
+# matrices of the changed ranges into the instance buffer & uploads only those.
+# Instances are created, changed & removed by handle like DynamicPoints.
+
+# Instance buffer rows, gfx's InstanceInfo with the color packed as unorm8 into
+# what is padding in the stock layout. Still 80 bytes a row.
+INSTANCE_DTYPE = np.dtype(
+    [
+        ("matrix", np.float32, (4, 4)),
+        ("id", np.uint32),
+        ("color", np.uint32),
+        ("_8_bytes_padding", np.uint8, (8,)),
+    ]
+)
+
+# Instances per upload chunk. Rows are 80 bytes so chunks are smaller than the
+# UPLOAD_CHUNK of points & lines, a chunk is 20KB
+INSTANCE_CHUNK = 256
+
+# region REUSABLE OPS
+
+
+# Column major TRS matrices like gfx stores them, out is (N,4,4)
+def composeMatrices(pos, rot, scl, out):
+    x, y, z, w = (rot[:, i] for i in range(4))
+    xx, yy, zz = x * x, y * y, z * z
+    xy, xz, yz = x * y, x * z, y * z
+    wx, wy, wz = w * x, w * y, w * z
+
+    # Columns are the rotated axes times their scale, then the translation
+    out[:, 0, 0] = (1 - 2 * (yy + zz)) * scl[:, 0]
+    out[:, 0, 1] = 2 * (xy + wz) * scl[:, 0]
+    out[:, 0, 2] = 2 * (xz - wy) * scl[:, 0]
+    out[:, 1, 0] = 2 * (xy - wz) * scl[:, 1]
+    out[:, 1, 1] = (1 - 2 * (xx + zz)) * scl[:, 1]
+    out[:, 1, 2] = 2 * (yz + wx) * scl[:, 1]
+    out[:, 2, 0] = 2 * (xz + wy) * scl[:, 2]
+    out[:, 2, 1] = 2 * (yz - wx) * scl[:, 2]
+    out[:, 2, 2] = (1 - 2 * (xx + yy)) * scl[:, 2]
+    out[:, :3, 3] = 0
+    out[:, 3, :3] = pos
+    out[:, 3, 3] = 1
+    return out
+
+
+# endregion
+
+
+class DynamicInstances(gfx.InstancedMesh):
+    # region MAIN
+    def __init__(self, geometry, initCap=20, growth=1.5, useDepth=True, material=None):
+        mat = material or InstancedColorMaterial(pick_write=True, depth_test=useDepth)
+        super().__init__(geometry, mat, initCap, name="DynInstances")
+
+        # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+        self._dyCapacity = initCap
+        self._dyCount = 0
+        self._dyModified = False
+        self._geoCapacity = 0  # Capacity the current instance buffer was built with
+
+        self.growth = growth
+        self.minGrow = 20
+        self.dyStats = {
+            "reallocs": 0,
+            "bytesCopied": 0,
+            "geoBuilds": 0,
+            "syncs": 0,
+            "bytesUploaded": 0,  # Total sent to the GPU
+            "lastUpload": 0,  # Bytes sent by the last sync
+        }
+
+        # Changed instance slots, sync only composes & uploads these
+        self._dyDirty = DirtyRanges()
+
+        self._datPos = np.zeros((initCap, 3), dtype=np.float32)
+        self._datRot = np.zeros((initCap, 4), dtype=np.float32)
+        self._datScl = np.ones((initCap, 3), dtype=np.float32)
+        self._datCol = np.full((initCap, 4), 255, dtype=np.uint8)
+        self._datRot[:, 3] = 1
+
+        # Picking ids of each slot, claimed by InstancedMesh for its first buffer
+        self._datIds = self.instance_buffer.data["id"].copy()
+
+        # Same handle scheme as DynamicPoints, instance_index of pick info is a slot
+        self._slotHnd = np.zeros(initCap, dtype=np.int32)  # Slot -> Handle
+        self._hndSlot = np.full(initCap, -1, dtype=np.int32)  # Handle -> Slot or -1
+        self._hndFree = []
+        self._hndNext = 0
+
+        self._buildInstances()
+
+    # endregion
+
+    # region METHODS
+    # Add an instance & return its handle. scale is a scalar or xyz, rot a quat
+    def create(self, pos, col="#00ff00", scale=1.0, rot=(0, 0, 0, 1)):
+        if self._dyCount >= self._dyCapacity:
+            self.expandAlloc()
+
+        i = self._dyCount
+        self._datPos[i] = pos
+        self._datRot[i] = rot
+        self._datScl[i] = scale
+        self._datCol[i] = toRgba8(col)
+
+        self._dyCount += 1
+        self._newHandles(i, i + 1)
+        self._markDirty(i, i + 1)
+        return int(self._slotHnd[i])
+
+    # Add N instances at once, pos is (N,3). The rest can be one value for every
+    # instance or one per instance, (N,3)/(N,4) colors, (N,) or (N,3) scales &
+    # (N,4) quats like a QuatArray. Returns the handles of the new instances.
+    def createMany(self, pos, col="#00ff00", scale=1.0, rot=(0, 0, 0, 1)):
+        pos = np.asarray(pos, dtype=np.float32).reshape(-1, 3)
+        i = self._dyCount
+        n = i + pos.shape[0]
+        if n > self._dyCapacity:
+            self.expandAlloc(n - self._dyCapacity)
+
+        self._datPos[i:n] = pos
+        self._datRot[i:n] = rot
+        self._datScl[i:n] = np.reshape(scale, (-1, 1)) if np.ndim(scale) == 1 else scale
+        fillColors(self._datCol[i:n], col)
+
+        self._dyCount = n
+        self._newHandles(i, n)
+        self._markDirty(i, n)
+        return self._slotHnd[i:n].copy()
+
+    def reset(self):
+        self._dyCount = 0
+        self._hndSlot[:] = -1
+        self._hndFree.clear()
+        self._hndNext = 0
+        self._dyModified = True  # Draw range changed
+        return self
+
+    # Make sure there is room for at least cnt instances without reallocating
+    def reserve(self, cnt):
+        if cnt > self._dyCapacity:
+            self._realloc(cnt)
+        return self
+
+    # Bytes used by the instance data on the CPU & the instance buffer on the GPU
+    def memoryUsage(self):
+        cpu = [self._datPos, self._datRot, self._datScl, self._datCol, self._datIds]
+        cpu += [self._slotHnd, self._hndSlot]
+        return {
+            "cpu": sum(a.nbytes for a in cpu),
+            "gpu": self.instance_buffer.nbytes,
+        }
+
+    def sync(self):
+        if self._dyModified:
+            t = profiler.begin()
+            self.dyStats["syncs"] += 1
+            if self._dyCapacity != self._geoCapacity:
+                # Instance buffer is sized to the capacity, rebuild when it changed
+                self._buildInstances()
+            else:
+                self._updateInstances()
+
+            self._dyModified = False
+            profiler.end("sync", t)
+            requestRedraw()
+
+        return self
+
+    # endregion
+
+    # region HANDLES
+    # Setters take a handle or an array of handles, only the slots of those
+    # instances are composed & uploaded on sync
+    def setTransform(self, h, pos=None, rot=None, scale=None):
+        s = self._slotOf(h)
+        if pos is not None:
+            self._datPos[s] = pos
+        if rot is not None:
+            self._datRot[s] = rot
+        if scale is not None:
+            perRow = np.ndim(scale) == 1 and np.ndim(s) == 1
+            self._datScl[s] = np.reshape(scale, (-1, 1)) if perRow else scale
+        self._markSlots(s)
+        return self
+
+    def setColor(self, h, col):
+        s = self._slotOf(h)
+        if np.ndim(s) == 0:
+            self._datCol[s] = toRgba8(col)
+        else:
+            self._datCol[s] = fillColors(np.empty((s.size, 4), dtype=np.uint8), col)
+        self._markSlots(s)
+        return self
+
+    def getPos(self, h):
+        return self._datPos[self._slotOf(h)].copy()
+
+    # Remove an instance by moving the last one into its slot, O(1) but changes
+    # the slot of the moved instance. Its handle still points to it.
+    def remove(self, h):
+        s = int(self._slotOf(h))
+        last = self._dyCount - 1
+
+        if s != last:
+            for a in (self._datPos, self._datRot, self._datScl, self._datCol):
+                a[s] = a[last]
+
+            mh = self._slotHnd[last]
+            self._slotHnd[s] = mh
+            self._hndSlot[mh] = s
+            self._markDirty(s, s + 1)
+
+        self._hndSlot[h] = -1
+        self._hndFree.append(int(h))
+        self._dyCount = last
+        self._dyModified = True  # Draw range changed
+        return self
+
+    # Handle of the instance in a slot, use with the instance_index of pick info
+    def handleAt(self, idx):
+        if idx is not None and 0 <= idx < self._dyCount:
+            return int(self._slotHnd[idx])
+        return -1
+
+    def isValid(self, h):
+        return 0 <= h < self._hndNext and self._hndSlot[h] != -1
+
+    def _slotOf(self, h):
+        s = self._hndSlot[h]
+        if np.any(s < 0):
+            raise IndexError(f"Invalid instance handle: {h}")
+        return s
+
+    # Assign handles to the new instances in slots i:n, reusing removed ones first
+    def _newHandles(self, i, n):
+        cnt = n - i
+        reuse = min(cnt, len(self._hndFree))
+        fresh = cnt - reuse
+
+        h = np.empty(cnt, dtype=np.int32)
+        if reuse:
+            h[:reuse] = self._hndFree[-reuse:]
+            del self._hndFree[-reuse:]
+
+        if fresh:
+            h[reuse:] = np.arange(self._hndNext, self._hndNext + fresh)
+            self._hndNext += fresh
+
+            # Handle table grows like the data buffers
+            hCap = self._hndSlot.shape[0]
+            if self._hndNext > hCap:
+                tbl = np.full(
+                    max(self._hndNext, int(hCap * self.growth), hCap + self.minGrow),
+                    -1,
+                    dtype=np.int32,
+                )
+                tbl[:hCap] = self._hndSlot
+                self._hndSlot = tbl
+
+        self._slotHnd[i:n] = h
+        self._hndSlot[h] = np.arange(i, n, dtype=np.int32)
+
+    # Flag a slot or array of slots, scattered slots flag the span between them
+    def _markSlots(self, s):
+        if np.ndim(s) == 0:
+            self._markDirty(int(s), int(s) + 1)
+        elif np.size(s):
+            self._markDirty(int(np.min(s)), int(np.max(s)) + 1)
+
+    # endregion
+
+    # region MANAGE INSTANCE BUFFER & DATA
+    # Grow capacity to fit at least s more instances. Grows by the growth factor
+    # when that gives more room so appending stays amortized O(1)
+    def expandAlloc(self, s=1):
+        cap = self._dyCapacity
+        self._realloc(cap + max(s, int(cap * (self.growth - 1)), self.minGrow))
+        return self
+
+    def _realloc(self, cap):
+        old = self._dyCapacity
+        cnt = min(self._dyCount, cap)
+
+        def grow(a, fill):
+            b = np.full((cap, *a.shape[1:]), fill, dtype=a.dtype)
+            b[:cnt] = a[:cnt]
+            return b
+
+        self._datPos = grow(self._datPos, 0)
+        self._datRot = grow(self._datRot, 0)
+        self._datRot[cnt:, 3] = 1
+        self._datScl = grow(self._datScl, 1)
+        self._datCol = grow(self._datCol, 255)
+        self._slotHnd = grow(self._slotHnd, 0)
+
+        # Picking ids belong to slots, new slots claim theirs. Capacity only grows.
+        ids = np.zeros(cap, dtype=np.uint32)
+        ids[:old] = self._datIds
+        for i in range(old, cap):
+            ids[i] = id_provider.claim_id(self)
+            self._idmap[int(ids[i])] = i
+        self._datIds = ids
+
+        self._dyCapacity = cap
+        self._dyCount = cnt
+        self._dyModified = True
+
+        self.dyStats["reallocs"] += 1
+        self.dyStats["bytesCopied"] += cnt * (12 + 16 + 12 + 4)
+        return self
+
+    # New instance buffer for the current capacity with every instance composed
+    def _buildInstances(self):
+        cap, n = self._dyCapacity, self._dyCount
+        infos = np.zeros(cap, dtype=INSTANCE_DTYPE)
+        infos["id"] = self._datIds
+        self._composeRange(infos, 0, n)
+
+        buf = gfx.Buffer(infos, chunk_size=INSTANCE_CHUNK, force_contiguous=True)
+        buf.draw_range = 0, n
+        self._store.instance_buffer = buf
+        self._geoCapacity = cap
+
+        self._dyDirty.clear()
+        self._addUploadStats(buf.nbytes)
+        self.dyStats["geoBuilds"] += 1
+
+    def _updateInstances(self):
+        buf = self.instance_buffer
+        nbytes = 0
+        for start, end in self._dyDirty.take(INSTANCE_CHUNK, self._dyCapacity):
+            end = min(end, self._dyCount)
+            if end > start:
+                self._composeRange(buf.data, start, end)
+                buf.update_range(start, end - start)
+                nbytes += (end - start) * INSTANCE_DTYPE.itemsize
+
+        # Only the first count instances are drawn, see InstancedColorShader
+        buf.draw_range = 0, self._dyCount
+        self._addUploadStats(nbytes)
+
+    def _composeRange(self, infos, start, end):
+        s = slice(start, end)
+        mat = infos["matrix"][s]
+        composeMatrices(self._datPos[s], self._datRot[s], self._datScl[s], mat)
+        infos["color"][s] = self._datCol[s].view(np.uint32).reshape(-1)
+
+    def _markDirty(self, start, end):
+        self._dyDirty.add(start, end)
+        self._dyModified = True
+
+    def _addUploadStats(self, nbytes):
+        self.dyStats["bytesUploaded"] += nbytes
+        self.dyStats["lastUpload"] = nbytes
+
+    # endregion
+
+
+# region SHAPES
+# Unit solids for DynamicInstances, scale sets their size
+
+
+def instancedBoxes(initCap=100, **kwargs):
+    return DynamicInstances(gfx.box_geometry(1, 1, 1), initCap, **kwargs)
+
+
+def instancedSpheres(initCap=100, segs=16, **kwargs):
+    geo = gfx.sphere_geometry(0.5, segs, segs // 2)
+    return DynamicInstances(geo, initCap, **kwargs)
+
+
+# endregion
+
+# region MATERIAL & SHADER
+
+
+# Phong material that multiplies its color by the color of each instance
+class InstancedColorMaterial(gfx.MeshPhongMaterial):
+    pass
+
+
+@register_wgpu_render_function(gfx.InstancedMesh, InstancedColorMaterial)
+class InstancedColorShader(MeshPhongShader):
+    # Read the packed color of the instance & only draw the first count instances,
+    # the draw range of the instance buffer
+    def get_code(self):
+        code = super().get_code()
+        code = code.replace(
+            "    id: u32,\n};",
+            "    id: u32,\n    color: u32,\n};",
+        )
+        code = code.replace(
+            "    var varyings: Varyings;\n",
+            "    var varyings: Varyings;\n"
+            "    varyings.instance_color = vec4<f32>(unpack4x8unorm(instance_info.color));\n",
+        )
+        code = code.replace(
+            "    // Apply opacity\n",
+            "    let ic = varyings.instance_color;\n"
+            "    diffuse_color *= vec4f(srgb2physical(ic.rgb), ic.a);\n"
+            "    // Apply opacity\n",
+        )
+        return code
+
+    def get_render_info(self, wobject, shared):
+        info = super().get_render_info(wobject, shared)
+        size, _, offset, first = info["indices"]
+        info["indices"] = size, wobject.instance_buffer.draw_range[1], offset, first
+        return info
+
+
+# endregion
@@ -1,17 +1,68 @@
 # region IMPORTS
 import pygfx as gfx
 import numpy as np
+from pgfx.Util import (
+    fillColors,
+    colorRows,
+    toRgba,
+    toRgba8,
+    Palette,
+    DirtyRanges,
+    UPLOAD_CHUNK,
+    requestRedraw,
+)
+from pgfx.FrameProfiler import profiler
+from pgfx.CompactFormats import (
+    CompactLineSegmentMaterial,
+    chunkBounds,
+    compactAttrs,
+    newQuantChunks,
+    newQuantPositions,
+    quantizeChunks,
+    QUANT_CHUNK,
+)
 
 # endregion
 
 
 class DynamicLines(gfx.Line):
     # region MAIN
-    def __init__(self, initCap=20, useDepth=True):
+    # palette : Palette or list of colors, line points then store a palette index
+    # instead of rgba floats. Colors are uploaded as 1 float instead of 4.
+    # compact : True or some of "positions", "colors" to store in the packed
+    # formats of CompactFormats, less memory & upload for some precision.
+    # ring : Keep initCap lines for trails, once full new lines overwrite the
+    # oldest ones instead of growing the buffers.
+    # fade : Ring only, alpha goes from 1 on the newest line point to fade on the
+    # oldest one
+    def __init__(
+        self,
+        initCap=20,
+        useDepth=True,
+        growth=1.5,
+        palette=None,
+        compact=False,
+        ring=False,
+        fade=None,
+    ):
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        mat = gfx.LineSegmentMaterial(
+        if fade is not None and (not ring or palette is not None):
+            raise ValueError("fade needs a ring buffer with rgba colors")
+
+        if palette is not None and not isinstance(palette, Palette):
+            palette = Palette(palette)
+        self.palette = palette
+        self.ring = ring
+        self.fade = fade
+        self._ringHead = 0  # Next line to write in ring mode
+        self.compact = compactAttrs(compact, ("positions", "colors"))
+        self._toColor = toRgba8 if "colors" in self.compact else toRgba
+
+        Mat = CompactLineSegmentMaterial if self.compact else gfx.LineSegmentMaterial
+        mat = Mat(
             thickness=1,
-            color_mode="vertex",
+            color_mode="vertex" if palette is None else "vertex_map",
+            map=None if palette is None else palette.map,
             thickness_space="screen",
             depth_test=useDepth,
         )
@@ -23,9 +74,29 @@ class DynamicLines(gfx.Line):
         self._dyCapacity = initCap  # how many lines
         self._dyCount = 0
         self._dyModified = False
+        self._geoCapacity = 0  # Capacity the current geometry was built with
+
+        # Capacity is multiplied by growth when the buffers run out, with at
+        # least minGrow new lines so small buffers don't realloc every add
+        self.growth = growth
+        self.minGrow = 20
+        self.dyStats = {
+            "reallocs": 0,
+            "bytesCopied": 0,
+            "geoBuilds": 0,
+            "syncs": 0,
+            "bytesUploaded": 0,  # Total sent to the GPU
+            "lastUpload": 0,  # Bytes sent by the last sync
+        }
+
+        # Changed vertex ranges of each geometry attribute, sync only uploads these
+        self._dyDirty = {"positions": DirtyRanges(), "colors": DirtyRanges()}
 
         self._datPos = np.zeros((initCap * 2, 3), dtype=np.float32)
-        self._datCol = np.ones((initCap * 2, 4), dtype=np.float32)
+        self._datCol = self._newColors(initCap * 2)
+        self._datTex = None  # Palette texcoords, the GPU side of _datCol
+        self._qPos = None  # Quantized positions, the GPU side of _datPos
+        self._qChunks = None
 
         self._buildGeometry()
 
@@ -34,13 +105,11 @@ class DynamicLines(gfx.Line):
     # region METHODS
     def add(self, apos, bpos, acol="#00ff00", bcol=None):
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        # Expand the local buffers if there is a need
-        if self._dyCount >= self._dyCapacity:
-            self.expandAlloc()
+        # Slot for the new line, expands the local buffers if there is a need
+        i = self._nextSlot() * 2
 
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
         # Create new data
-        i = self._dyCount * 2
         self._datPos[i][0] = apos[0]
         self._datPos[i][1] = apos[1]
         self._datPos[i][2] = apos[2]
@@ -49,65 +118,222 @@ class DynamicLines(gfx.Line):
         self._datPos[i + 1][1] = bpos[1]
         self._datPos[i + 1][2] = bpos[2]
 
-        gCol = gfx.Color(acol)
-        self._datCol[i][0] = gCol[0]
-        self._datCol[i][1] = gCol[1]
-        self._datCol[i][2] = gCol[2]
+        if self.palette is None:
+            gCol = self._toColor(acol)
+            self._datCol[i][0] = gCol[0]
+            self._datCol[i][1] = gCol[1]
+            self._datCol[i][2] = gCol[2]
 
-        if bcol:
-            gCol = gfx.Color(bcol)
+            if bcol:
+                gCol = self._toColor(bcol)
 
-        self._datCol[i + 1][0] = gCol[0]
-        self._datCol[i + 1][1] = gCol[1]
-        self._datCol[i + 1][2] = gCol[2]
+            self._datCol[i + 1][0] = gCol[0]
+            self._datCol[i + 1][1] = gCol[1]
+            self._datCol[i + 1][2] = gCol[2]
+        else:
+            self._datCol[i] = self.palette.indexOf(acol)
+            self._datCol[i + 1] = self.palette.indexOf(bcol or acol)
 
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
         # Object management
-        self._dyModified = True
-        self._dyCount += 1
+        self._markDirty(i, i + 2)
+        return self
+
+    # Add N segments at once, apos & bpos are (N,3). Colors can be a single color for
+    # every segment or (N,3)/(N,4) arrays, bcol defaults to acol
+    def addSegments(self, apos, bpos, acol="#00ff00", bcol=None):
+        apos = np.asarray(apos, dtype=np.float32).reshape(-1, 3)
+        bpos = np.asarray(bpos, dtype=np.float32).reshape(-1, 3)
+        bcol = acol if bcol is None else bcol
+
+        if self.ring:
+            ranges = self._ringTake(apos.shape[0])
+        else:
+            # Expand once for everything
+            i = self._dyCount
+            n = i + apos.shape[0]
+            if n > self._dyCapacity:
+                self.expandAlloc(n - self._dyCapacity)
+
+            self._dyCount = n
+            ranges = [(i, n, 0)]
+
+        # Lines i:n get the new segments k onward, ring writes that wrap around
+        # are split in two
+        for i, n, k in ranges:
+            rows = slice(k, k + n - i)
+
+            # Segment points are interleaved, a at even & b at odd rows
+            self._datPos[i * 2 : n * 2 : 2] = apos[rows]
+            self._datPos[i * 2 + 1 : n * 2 : 2] = bpos[rows]
+            self._writeColors(slice(i * 2, n * 2, 2), colorRows(acol, rows))
+            self._writeColors(slice(i * 2 + 1, n * 2, 2), colorRows(bcol, rows))
+
+            self._markDirty(i * 2, n * 2)
+
+        return self
+
+    # Remove every line where mask is False in one pass, mask has a bool per line.
+    # Kept lines are packed to the front in order.
+    def keepWhere(self, mask):
+        if self.ring:
+            raise RuntimeError("Lines can't be removed from a ring buffer")
+
+        n = self._dyCount
+        mask = np.asarray(mask[:n], dtype=bool)
+        keep = np.flatnonzero(mask)
+        k = keep.shape[0]
+        if k == n:
+            return self
+
+        # Lines before the first removed one don't move, the rest is copied by
+        # vertex, 2 per line
+        first = int(np.argmin(mask))
+        v = (keep[first:, None] * 2 + (0, 1)).reshape(-1)
+        for a in (self._datPos, self._datCol):
+            a[first * 2 : k * 2] = a[v]
+
+        self._dyCount = k
+        if k > first:
+            self._markDirty(first * 2, k * 2)
+        self._dyModified = True  # Draw range changed
         return self
 
     def reset(self):
         self._dyCount = 0
+        self._ringHead = 0
         self.geometry.positions.draw_range = 0, self._dyCount * 2
         return self
 
+    # Make sure there is room for at least cnt lines without reallocating.
+    # Ring buffers keep the capacity they were made with.
+    def reserve(self, cnt):
+        if cnt > self._dyCapacity and not self.ring:
+            self._realloc(cnt)
+        return self
+
+    # Release unused capacity, down to the current line count
+    def shrinkToFit(self):
+        cap = max(self._dyCount, 1)
+        if cap < self._dyCapacity and not self.ring:
+            self._realloc(cap)
+        return self
+
+    # Compact positions are packed ints gfx can't read bounds from, they come from
+    # the quantized chunks instead, as of the last sync. Children aren't included.
+    def get_bounding_box(self):
+        if self._qPos is None:
+            return super().get_bounding_box()
+        return chunkBounds(self._qChunks, self._dyCount * 2)
+
+    # Bytes used by the line data on the CPU & the geometry buffers on the GPU.
+    # Buffers shared between both count on each side.
+    def memoryUsage(self):
+        cpu = [self._datPos, self._datCol]
+        cpu += [a for a in (self._datTex, self._qPos, self._qChunks) if a is not None]
+        return {
+            "cpu": sum(a.nbytes for a in cpu),
+            "gpu": sum(b.nbytes for b in self._gpuBuffers()),
+        }
+
     def sync(self):
         if self._dyModified:
-            atCap = self.geometry.positions.data.size / 6  # 6 floats per line
+            t = profiler.begin()
+            if self.fade is not None:
+                self._applyFade()
 
-            if self._dyCapacity > atCap:
-                # Need to geometry buffer to handle expanded data
+            self.dyStats["syncs"] += 1
+            if self._dyCapacity != self._geoCapacity:
+                # Geometry buffers are sized to the capacity, rebuild when it changed
                 self._buildGeometry()
             else:
                 # Data within range, update existing geometry
                 self._updateGeometry()
 
             self._dyModified = False
+            profiler.end("sync", t)
+            requestRedraw()
 
         return self
 
     # endregion
 
     # region MANAGE GEOMETRY & DATA BUFFERS
-    def expandAlloc(self, s=20):
-        oldCap = self._dyCapacity * 2  # 2 points per line
-        self._dyCapacity += s
+    # Grow capacity to fit at least s more lines. Grows by the growth factor when
+    # that gives more room so appending stays amortized O(1)
+    def expandAlloc(self, s=1):
+        cap = self._dyCapacity
+        self._realloc(cap + max(s, int(cap * (self.growth - 1)), self.minGrow))
+        return self
+
+    # Slot for one new line. Appends, growing the buffers if needed, or in ring
+    # mode takes the oldest slot once it's full
+    def _nextSlot(self):
+        if self.ring:
+            i = self._ringHead
+            self._ringHead = (i + 1) % self._dyCapacity
+            self._dyCount = min(self._dyCount + 1, self._dyCapacity)
+            return i
+
+        if self._dyCount >= self._dyCapacity:
+            self.expandAlloc()
+
+        self._dyCount += 1
+        return self._dyCount - 1
+
+    # Line ranges for n new lines in ring mode as (start, end, offset into the new
+    # lines). Only the newest capacity lines are kept.
+    def _ringTake(self, n):
+        cap = self._dyCapacity
+        skip = max(n - cap, 0)
+        n -= skip
+
+        i = self._ringHead
+        first = min(n, cap - i)
+        ranges = [(i, i + first, skip)]
+        if first < n:
+            ranges.append((0, n - first, skip + first))
+
+        self._ringHead = (i + n) % cap
+        self._dyCount = min(self._dyCount + n, cap)
+        return ranges
+
+    # Alpha from 1 on the newest line point down to fade on the oldest. Points age
+    # by the line they're in, a points being older than b points.
+    def _applyFade(self):
+        n = self._dyCount * 2
+        v = np.arange(n)
+        age = ((self._ringHead - 1 - v // 2) % self._dyCapacity) * 2 + 1 - (v & 1)
+        a = 1 - (1 - self.fade) * age / max(n - 1, 1)
+        if self._datCol.dtype == np.uint8:
+            a = np.rint(a * 255)
+
+        self._datCol[:n, 3] = a
+        self._markDirty(0, n, ("colors",))
+
+    def _realloc(self, cap):
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        # new buffers
-        pos = np.zeros((self._dyCapacity * 2, 3), dtype=np.float32)
-        col = np.ones((self._dyCapacity * 2, 4), dtype=np.float32)
+        # new buffers, 2 points per line
+        pos = np.zeros((cap * 2, 3), dtype=np.float32)
+        col = self._newColors(cap * 2)
 
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        # copy data
-        pos[0:oldCap] = self._datPos
-        col[0:oldCap] = self._datCol
+        # copy only the lines in use
+        cnt = min(self._dyCount, cap)
+        pos[0 : cnt * 2] = self._datPos[0 : cnt * 2]
+        col[0 : cnt * 2] = self._datCol[0 : cnt * 2]
 
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
         # swop in new buffer space
         self._datPos = pos
         self._datCol = col
+        self._dyCapacity = cap
+        self._dyCount = cnt
+        self._dyModified = True
 
+        # 2 points of position & color per line
+        self.dyStats["reallocs"] += 1
+        self.dyStats["bytesCopied"] += cnt * 2 * (pos.itemsize * 3 + col[0].nbytes)
         return self
 
     def _buildGeometry(self):
@@ -116,18 +342,114 @@ class DynamicLines(gfx.Line):
         # GC will clean it up will also clear out the GPU resources with it.
 
         # Create new geometry out of np arrays
-        geo = gfx.Geometry(positions=self._datPos, colors=self._datCol)
+        geo = gfx.Geometry()
+        cap, n = self._dyCapacity * 2, self._dyCount * 2
+
+        if "positions" in self.compact:
+            self._qPos = newQuantPositions(cap)
+            self._qChunks = newQuantChunks(cap)
+            quantizeChunks(self._datPos, self._qPos, self._qChunks, 0, n)
+            geo.positions = gfx.Buffer(
+                self._qPos.view(np.uint32), chunk_size=UPLOAD_CHUNK
+            )
+            geo.qchunks = gfx.Buffer(self._qChunks)
+        else:
+            geo.positions = gfx.Buffer(self._datPos, chunk_size=UPLOAD_CHUNK)
+
+        # Palette indices go to the GPU as texcoords into the palette texture
+        if self.palette is not None:
+            self._datTex = np.zeros(cap, dtype=np.float32)
+            self.palette.toCoord(self._datCol[:n], out=self._datTex[:n])
+            geo.texcoords = gfx.Buffer(self._datTex, chunk_size=UPLOAD_CHUNK)
+        elif "colors" in self.compact:
+            geo.colors = gfx.Buffer(
+                self._datCol.view(np.uint32).reshape(-1), chunk_size=UPLOAD_CHUNK
+            )
+        else:
+            geo.colors = gfx.Buffer(self._datCol, chunk_size=UPLOAD_CHUNK)
+
         geo.positions.draw_range = 0, self._dyCount * 2
         self.geometry = geo
+        self._geoCapacity = self._dyCapacity
+
+        # New buffers upload everything
+        for d in self._dyDirty.values():
+            d.clear()
+
+        self._addUploadStats(sum(b.nbytes for b in self._gpuBuffers()))
+        self.dyStats["geoBuilds"] += 1
 
     def _updateGeometry(self):
         geo = self.geometry
 
-        # Copy data over to geometry
-        geo.positions.set_data(self._datPos)
-        geo.colors.set_data(self._datCol)
+        # Geometry buffers share memory with the local arrays, only need to flag
+        # the changed ranges for upload. Ranges are snapped to the upload chunks
+        # so the stats count what is actually sent.
+        nbytes = 0
+        for name, dirty in self._dyDirty.items():
+            for start, end in dirty.take(UPLOAD_CHUNK, self._dyCapacity * 2):
+                nbytes += self._uploadRange(name, start, end)
+
+        self._addUploadStats(nbytes)
 
-        # geo.positions.update_full()
+        # A full ring is drawn whole with the oldest lines in the middle of it. Every
+        # line is drawn on its own so the slot order doesn't change the image.
         geo.positions.draw_range = 0, self._dyCount * 2
 
+    # Flag vertices start:end of an attribute for upload, converting the data to its
+    # GPU format first when it's stored differently. Returns the bytes sent.
+    def _uploadRange(self, name, start, end):
+        geo = self.geometry
+        nbytes = 0
+
+        if name == "positions" and self._qPos is not None:
+            # Ranges are on chunk boundaries, requantize them whole since their
+            # bounds may have changed
+            end = min(end, self._dyCount * 2)
+            quantizeChunks(self._datPos, self._qPos, self._qChunks, start, end)
+            k0, k1 = start // QUANT_CHUNK, -(-end // QUANT_CHUNK)
+            geo.qchunks.update_range(k0 * 2, (k1 - k0) * 2)
+            nbytes += (k1 - k0) * 2 * self._qChunks[0].nbytes
+
+        elif name == "colors" and self.palette is not None:
+            self.palette.toCoord(self._datCol[start:end], out=self._datTex[start:end])
+            name = "texcoords"
+
+        if end <= start:
+            return nbytes
+
+        buf = getattr(geo, name)
+        buf.update_range(start, end - start)
+        return nbytes + (end - start) * (buf.nbytes // buf.nitems)
+
+    def _gpuBuffers(self):
+        geo = self.geometry
+        names = ("positions", "qchunks", "colors", "texcoords")
+        return [getattr(geo, n) for n in names if hasattr(geo, n)]
+
+    # Flag vertices start:end of the named attributes as changed
+    def _markDirty(self, start, end, names=("positions", "colors")):
+        for n in names:
+            self._dyDirty[n].add(start, end)
+        self._dyModified = True
+
+    # Color storage for cnt line points, rgba floats, unorm8 or palette indices
+    def _newColors(self, cnt):
+        if self.palette is not None:
+            return np.zeros(cnt, dtype=self.palette.dtype)
+        if "colors" in self.compact:
+            return np.full((cnt, 4), 255, dtype=np.uint8)
+        return np.ones((cnt, 4), dtype=np.float32)
+
+    # Write colors to a slice of line points
+    def _writeColors(self, s, col):
+        if self.palette is None:
+            fillColors(self._datCol[s], col)
+        else:
+            self._datCol[s] = self.palette.indicesOf(col)
+
+    def _addUploadStats(self, nbytes):
+        self.dyStats["bytesUploaded"] += nbytes
+        self.dyStats["lastUpload"] = nbytes
+
     # endregion
@@ -1,6 +1,27 @@
 # region IMPORTS
 import pygfx as gfx
 import numpy as np
+from pgfx.Util import (
+    fillColors,
+    colorRows,
+    toRgba,
+    toRgba8,
+    Palette,
+    DirtyRanges,
+    UPLOAD_CHUNK,
+    requestRedraw,
+)
+from pgfx.FrameProfiler import profiler
+from pgfx.CompactFormats import (
+    CompactPointsMaterial,
+    chunkBounds,
+    compactAttrs,
+    newHalfSizes,
+    newQuantChunks,
+    newQuantPositions,
+    quantizeChunks,
+    QUANT_CHUNK,
+)
 
 # TODO - Check out the shapes points material, see if it can be used dynamically with geometry
 # # https://github.com/pygfx/pygfx/blob/fbbc0cdd3a72988d5927c7236f0a2f0f9d9e940d/pygfx/materials/_points.py#L340
@@ -9,10 +30,40 @@ import numpy as np
 
 class DynamicPoints(gfx.Points):
     # region MAIN
-    def __init__(self, initCap=20, useDepth=True):
+    # palette : Palette or list of colors, points then store a palette index
+    # instead of rgba floats. Colors are uploaded as 1 float instead of 4.
+    # compact : True or some of "positions", "colors", "sizes" to store in the
+    # packed formats of CompactFormats, less memory & upload for some precision.
+    # ring : Keep initCap points for trails, once full new points overwrite the
+    # oldest ones instead of growing the buffers.
+    # fade : Ring only, alpha goes from 1 on the newest point to fade on the oldest
+    def __init__(
+        self,
+        initCap=20,
+        useDepth=True,
+        growth=1.5,
+        palette=None,
+        compact=False,
+        ring=False,
+        fade=None,
+    ):
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        mat = gfx.PointsMaterial(
-            color_mode="vertex",
+        if fade is not None and (not ring or palette is not None):
+            raise ValueError("fade needs a ring buffer with rgba colors")
+
+        if palette is not None and not isinstance(palette, Palette):
+            palette = Palette(palette)
+        self.palette = palette
+        self.ring = ring
+        self.fade = fade
+        self._ringHead = 0  # Next slot to write in ring mode
+        self.compact = compactAttrs(compact, ("positions", "colors", "sizes"))
+        self._toColor = toRgba8 if "colors" in self.compact else toRgba
+
+        Mat = CompactPointsMaterial if self.compact else gfx.PointsMaterial
+        mat = Mat(
+            color_mode="vertex" if palette is None else "vertex_map",
+            map=None if palette is None else palette.map,
             size_space="world",
             size_mode="vertex",
             pick_write=True,
@@ -26,10 +77,42 @@ class DynamicPoints(gfx.Points):
         self._dyCapacity = initCap
         self._dyCount = 0
         self._dyModified = False
+        self._geoCapacity = 0  # Capacity the current geometry was built with
+
+        # Capacity is multiplied by growth when the buffers run out, with at
+        # least minGrow new items so small buffers don't realloc every add
+        self.growth = growth
+        self.minGrow = 20
+        self.dyStats = {
+            "reallocs": 0,
+            "bytesCopied": 0,
+            "geoBuilds": 0,
+            "syncs": 0,
+            "bytesUploaded": 0,  # Total sent to the GPU
+            "lastUpload": 0,  # Bytes sent by the last sync
+        }
+
+        # Changed item ranges of each geometry attribute, sync only uploads these
+        self._dyDirty = {
+            "positions": DirtyRanges(),
+            "colors": DirtyRanges(),
+            "sizes": DirtyRanges(),
+        }
 
         self._datPos = np.zeros((initCap, 3), dtype=np.float32)
-        self._datCol = np.ones((initCap, 4), dtype=np.float32)
-        self._datSiz = np.zeros(initCap, dtype=np.float32)
+        self._datCol = self._newColors(initCap)
+        self._datSiz = self._newSizes(initCap)
+        self._datTex = None  # Palette texcoords, the GPU side of _datCol
+        self._qPos = None  # Quantized positions, the GPU side of _datPos
+        self._qChunks = None
+
+        # Handles stay valid while points get moved around by remove. Slots are
+        # where the point lives in the buffers, which is what picking returns
+        # as vertex_index. Removed handles get reused by new points.
+        self._slotHnd = np.zeros(initCap, dtype=np.int32)  # Slot -> Handle
+        self._hndSlot = np.full(initCap, -1, dtype=np.int32)  # Handle -> Slot or -1
+        self._hndFree = []
+        self._hndNext = 0
 
         self._buildGeometry()
 
@@ -38,30 +121,74 @@ class DynamicPoints(gfx.Points):
     # region METHODS
     def add(self, pos, col="#00ff00", size=0.2):
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        # Expand the local buffers if there is a need
-        if self._dyCount >= self._dyCapacity:
-            self.expandAlloc()
+        # Slot for the new point, expands the local buffers if there is a need
+        i = self._nextSlot()
 
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
         # Create new data
-        i = self._dyCount
         self._datPos[i][0] = pos[0]
         self._datPos[i][1] = pos[1]
         self._datPos[i][2] = pos[2]
 
-        gCol = gfx.Color(col)
-        self._datCol[i][0] = gCol[0]
-        self._datCol[i][1] = gCol[1]
-        self._datCol[i][2] = gCol[2]
+        if self.palette is None:
+            gCol = self._toColor(col)
+            self._datCol[i][0] = gCol[0]
+            self._datCol[i][1] = gCol[1]
+            self._datCol[i][2] = gCol[2]
+        else:
+            self._datCol[i] = self.palette.indexOf(col)
 
         self._datSiz[i] = size
 
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
         # Object management
-        self._dyModified = True
-        self._dyCount += 1
+        self._newHandles(i, i + 1)
+        self._markDirty(i, i + 1)
         return self
 
+    # Same as add but returns the point's handle instead of self
+    def create(self, pos, col="#00ff00", size=0.2):
+        self.add(pos, col, size)
+        return int(self._slotHnd[self._writeHead() - 1])
+
+    # Add N points at once, pos is (N,3). col & size can be a single value for
+    # every point or one per point, (N,3)/(N,4) colors & (N,) sizes
+    def addMany(self, pos, col="#00ff00", size=0.2):
+        pos = np.asarray(pos, dtype=np.float32).reshape(-1, 3)
+
+        if self.ring:
+            ranges = self._ringTake(pos.shape[0])
+        else:
+            # Expand once for everything
+            i = self._dyCount
+            n = i + pos.shape[0]
+            if n > self._dyCapacity:
+                self.expandAlloc(n - self._dyCapacity)
+
+            self._dyCount = n
+            ranges = [(i, n, 0)]
+
+        # Slots i:j get the new points k onward, ring writes that wrap around
+        # are split in two
+        for i, j, k in ranges:
+            rows = slice(k, k + j - i)
+            self._datPos[i:j] = pos[rows]
+            self._writeColors(slice(i, j), colorRows(col, rows))
+            self._datSiz[i:j] = size[rows] if np.ndim(size) == 1 else size
+
+            self._newHandles(i, j)
+            self._markDirty(i, j)
+
+        return self
+
+    # Same as addMany but returns the handles of the new points, only the ones
+    # still in a ring buffer when there are more points than it holds
+    def createMany(self, pos, col="#00ff00", size=0.2):
+        self.addMany(pos, col, size)
+        n = min(np.asarray(pos).reshape(-1, 3).shape[0], self._dyCapacity)
+        slots = (self._writeHead() - n + np.arange(n)) % self._dyCapacity
+        return self._slotHnd[slots]
+
     def posAt(self, idx):
         if idx < self._dyCount:
             return self._datPos[idx].copy()
@@ -69,48 +196,312 @@ class DynamicPoints(gfx.Points):
 
     def reset(self):
         self._dyCount = 0
+        self._ringHead = 0
+        self._hndSlot[:] = -1
+        self._hndFree.clear()
+        self._hndNext = 0
         self.geometry.positions.draw_range = 0, self._dyCount
         return self
 
+    # Make sure there is room for at least cnt points without reallocating.
+    # Ring buffers keep the capacity they were made with.
+    def reserve(self, cnt):
+        if cnt > self._dyCapacity and not self.ring:
+            self._realloc(cnt)
+        return self
+
+    # Release unused capacity, down to the current point count
+    def shrinkToFit(self):
+        cap = max(self._dyCount, 1)
+        if cap < self._dyCapacity and not self.ring:
+            self._realloc(cap)
+        return self
+
+    # Compact positions are packed ints gfx can't read bounds from, they come from
+    # the quantized chunks instead, as of the last sync. Children aren't included.
+    def get_bounding_box(self):
+        if self._qPos is None:
+            return super().get_bounding_box()
+        return chunkBounds(self._qChunks, self._dyCount)
+
+    # Bytes used by the point data on the CPU & the geometry buffers on the GPU.
+    # Buffers shared between both count on each side.
+    def memoryUsage(self):
+        cpu = [self._datPos, self._datCol, self._datSiz, self._slotHnd, self._hndSlot]
+        cpu += [a for a in (self._datTex, self._qPos, self._qChunks) if a is not None]
+        return {
+            "cpu": sum(a.nbytes for a in cpu),
+            "gpu": sum(b.nbytes for b in self._gpuBuffers()),
+        }
+
     def sync(self):
         if self._dyModified:
-            atCap = self.geometry.positions.data.size / 3
+            t = profiler.begin()
+            if self.fade is not None:
+                self._applyFade()
 
-            if self._dyCapacity > atCap:
-                # Need to geometry buffer to handle expanded data
+            self.dyStats["syncs"] += 1
+            if self._dyCapacity != self._geoCapacity:
+                # Geometry buffers are sized to the capacity, rebuild when it changed
                 self._buildGeometry()
             else:
                 # Data within range, update existing geometry
                 self._updateGeometry()
 
             self._dyModified = False
+            profiler.end("sync", t)
+            requestRedraw()
 
         return self
 
     # endregion
 
+    # region HANDLES
+    # Setters take a handle or an array of handles, only the slots of those points
+    # are flagged for upload so moving a point doesn't resend the whole buffer
+    def setPos(self, h, pos):
+        s = self._slotOf(h)
+        self._datPos[s] = pos
+        self._markSlots(s, ("positions",))
+        return self
+
+    def setColor(self, h, col):
+        s = self._slotOf(h)
+        self._writeColors(s, col)
+        self._markSlots(s, ("colors",))
+        return self
+
+    def setSize(self, h, size):
+        s = self._slotOf(h)
+        self._datSiz[s] = size
+        self._markSlots(s, ("sizes",))
+        return self
+
+    def getPos(self, h):
+        return self._datPos[self._slotOf(h)].copy()
+
+    # Remove a point by moving the last point into its slot, O(1) but changes
+    # the slot of the moved point. Its handle still points to it.
+    def remove(self, h):
+        if self.ring:
+            raise RuntimeError("Points can't be removed from a ring buffer")
+
+        s = int(self._slotOf(h))
+        last = self._dyCount - 1
+
+        if s != last:
+            self._datPos[s] = self._datPos[last]
+            self._datCol[s] = self._datCol[last]
+            self._datSiz[s] = self._datSiz[last]
+
+            mh = self._slotHnd[last]
+            self._slotHnd[s] = mh
+            self._hndSlot[mh] = s
+            self._markDirty(s, s + 1)
+
+        self._hndSlot[h] = -1
+        self._hndFree.append(int(h))
+        self._dyCount = last
+        self._dyModified = True  # Draw range changed
+        return self
+
+    # Remove every point where mask is False in one pass, mask has a bool per slot.
+    # Kept points are packed to the front in order & keep their handles.
+    def keepWhere(self, mask):
+        if self.ring:
+            raise RuntimeError("Points can't be removed from a ring buffer")
+
+        n = self._dyCount
+        mask = np.asarray(mask[:n], dtype=bool)
+        keep = np.flatnonzero(mask)
+        k = keep.shape[0]
+        if k == n:
+            return self
+
+        dropped = self._slotHnd[:n][~mask]
+        self._hndSlot[dropped] = -1
+        self._hndFree.extend(dropped.tolist())
+
+        # Slots before the first removed point don't move
+        first = int(np.argmin(mask))
+        keep = keep[first:]
+        for a in (self._datPos, self._datCol, self._datSiz, self._slotHnd):
+            a[first:k] = a[keep]
+
+        self._hndSlot[self._slotHnd[first:k]] = np.arange(first, k)
+        self._dyCount = k
+        if k > first:
+            self._markDirty(first, k)
+        self._dyModified = True  # Draw range changed
+        return self
+
+    # Handle of the point in a slot, use with the vertex_index of pick info
+    def handleAt(self, idx):
+        if 0 <= idx < self._dyCount:
+            return int(self._slotHnd[idx])
+        return -1
+
+    def isValid(self, h):
+        return 0 <= h < self._hndNext and self._hndSlot[h] != -1
+
+    # Slot for one new point. Appends, growing the buffers if needed, or in ring
+    # mode takes the oldest slot once it's full
+    def _nextSlot(self):
+        if self.ring:
+            i = self._ringHead
+            if self._dyCount == self._dyCapacity:
+                self._freeHandles(i, i + 1)
+            else:
+                self._dyCount += 1
+
+            self._ringHead = (i + 1) % self._dyCapacity
+            return i
+
+        if self._dyCount >= self._dyCapacity:
+            self.expandAlloc()
+
+        self._dyCount += 1
+        return self._dyCount - 1
+
+    # Slot ranges for n new points in ring mode as (start, end, offset into the new
+    # points). Only the newest capacity points are kept.
+    def _ringTake(self, n):
+        cap = self._dyCapacity
+        skip = max(n - cap, 0)
+        n -= skip
+
+        i = self._ringHead
+        first = min(n, cap - i)
+        ranges = [(i, i + first, skip)]
+        if first < n:
+            ranges.append((0, n - first, skip + first))
+
+        # Points being overwritten lose their handles
+        for a, b, _ in ranges:
+            self._freeHandles(a, min(b, self._dyCount))
+
+        self._ringHead = (i + n) % cap
+        self._dyCount = min(self._dyCount + n, cap)
+        return ranges
+
+    # Slot after the newest point
+    def _writeHead(self):
+        return self._ringHead if self.ring else self._dyCount
+
+    # Alpha from 1 on the newest point down to fade on the oldest, by the age of
+    # each slot in the ring
+    def _applyFade(self):
+        n = self._dyCount
+        age = (self._ringHead - 1 - np.arange(n)) % self._dyCapacity
+        a = 1 - (1 - self.fade) * age / max(n - 1, 1)
+        if self._datCol.dtype == np.uint8:
+            a = np.rint(a * 255)
+
+        self._datCol[:n, 3] = a
+        self._markDirty(0, n, ("colors",))
+
+    # Current slot of a handle or array of handles
+    def _slotOf(self, h):
+        s = self._hndSlot[h]
+        if np.any(s < 0):
+            raise IndexError(f"Invalid point handle: {h}")
+        return s
+
+    # Assign handles to the new points in slots i:n, reusing removed ones first
+    def _newHandles(self, i, n):
+        # Single add skips the array work
+        if n == i + 1 and (self._hndFree or self._hndNext < self._hndSlot.shape[0]):
+            if self._hndFree:
+                h = self._hndFree.pop()
+            else:
+                h = self._hndNext
+                self._hndNext += 1
+            self._slotHnd[i] = h
+            self._hndSlot[h] = i
+            return
+
+        cnt = n - i
+        reuse = min(cnt, len(self._hndFree))
+        fresh = cnt - reuse
+
+        h = np.empty(cnt, dtype=np.int32)
+        if reuse:
+            h[:reuse] = self._hndFree[-reuse:]
+            del self._hndFree[-reuse:]
+
+        if fresh:
+            h[reuse:] = np.arange(self._hndNext, self._hndNext + fresh)
+            self._hndNext += fresh
+
+            # Handle table grows like the data buffers
+            hCap = self._hndSlot.shape[0]
+            if self._hndNext > hCap:
+                tbl = np.full(
+                    max(self._hndNext, int(hCap * self.growth), hCap + self.minGrow),
+                    -1,
+                    dtype=np.int32,
+                )
+                tbl[:hCap] = self._hndSlot
+                self._hndSlot = tbl
+
+        self._slotHnd[i:n] = h
+        self._hndSlot[h] = np.arange(i, n, dtype=np.int32)
+
+    # Release the handles of the points in slots i:n
+    def _freeHandles(self, i, n):
+        if n > i:
+            h = self._slotHnd[i:n]
+            self._hndSlot[h] = -1
+            self._hndFree.extend(h.tolist())
+
+    # Flag a slot or array of slots, scattered slots flag the span between them
+    def _markSlots(self, s, names):
+        if np.ndim(s) == 0:
+            self._markDirty(int(s), int(s) + 1, names)
+        elif np.size(s):
+            self._markDirty(int(np.min(s)), int(np.max(s)) + 1, names)
+
+    # endregion
+
     # region MANAGE GEOMETRY & DATA BUFFERS
-    def expandAlloc(self, s=20):
-        oldCap = self._dyCapacity
-        self._dyCapacity += s
+    # Grow capacity to fit at least s more points. Grows by the growth factor when
+    # that gives more room so appending stays amortized O(1)
+    def expandAlloc(self, s=1):
+        cap = self._dyCapacity
+        self._realloc(cap + max(s, int(cap * (self.growth - 1)), self.minGrow))
+        return self
+
+    def _realloc(self, cap):
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
         # new buffers
-        pos = np.zeros((self._dyCapacity, 3), dtype=np.float32)
-        col = np.ones((self._dyCapacity, 4), dtype=np.float32)
-        siz = np.zeros(self._dyCapacity, dtype=np.float32)
+        pos = np.zeros((cap, 3), dtype=np.float32)
+        col = self._newColors(cap)
+        siz = self._newSizes(cap)
+        hnd = np.zeros(cap, dtype=np.int32)
 
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        # copy data
-        pos[0:oldCap] = self._datPos
-        col[0:oldCap] = self._datCol
-        siz[0:oldCap] = self._datSiz
+        # copy only the points in use
+        cnt = min(self._dyCount, cap)
+        pos[0:cnt] = self._datPos[0:cnt]
+        col[0:cnt] = self._datCol[0:cnt]
+        siz[0:cnt] = self._datSiz[0:cnt]
+        hnd[0:cnt] = self._slotHnd[0:cnt]
 
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
         # swop in new buffer space
         self._datPos = pos
         self._datCol = col
         self._datSiz = siz
+        self._slotHnd = hnd
+        self._dyCapacity = cap
+        self._dyCount = cnt
+        self._dyModified = True
 
+        # Position, color, size & handle of every point
+        self.dyStats["reallocs"] += 1
+        self.dyStats["bytesCopied"] += cnt * (
+            pos.itemsize * 3 + col[0].nbytes + siz.itemsize + hnd.itemsize
+        )
         return self
 
     def _buildGeometry(self):
@@ -125,19 +516,132 @@ class DynamicPoints(gfx.Points):
         # print("--DELETE OLD GEOMETRY")
 
         # Create new geometry out of np arrays
-        geo = gfx.Geometry(positions=self._datPos, sizes=self._datSiz, colors=self._datCol)
+        geo = gfx.Geometry()
+        cap, cnt = self._dyCapacity, self._dyCount
+
+        if "positions" in self.compact:
+            self._qPos = newQuantPositions(cap)
+            self._qChunks = newQuantChunks(cap)
+            quantizeChunks(self._datPos, self._qPos, self._qChunks, 0, cnt)
+            geo.positions = gfx.Buffer(
+                self._qPos.view(np.uint32), chunk_size=UPLOAD_CHUNK
+            )
+            geo.qchunks = gfx.Buffer(self._qChunks)
+        else:
+            geo.positions = gfx.Buffer(self._datPos, chunk_size=UPLOAD_CHUNK)
+
+        # Packed sizes are 2 per buffer item
+        if "sizes" in self.compact:
+            geo.sizes = gfx.Buffer(
+                self._datSiz.view(np.uint32), chunk_size=UPLOAD_CHUNK // 2
+            )
+        else:
+            geo.sizes = gfx.Buffer(self._datSiz, chunk_size=UPLOAD_CHUNK)
+
+        # Palette indices go to the GPU as texcoords into the palette texture
+        if self.palette is not None:
+            self._datTex = np.zeros(cap, dtype=np.float32)
+            self.palette.toCoord(self._datCol[:cnt], out=self._datTex[:cnt])
+            geo.texcoords = gfx.Buffer(self._datTex, chunk_size=UPLOAD_CHUNK)
+        elif "colors" in self.compact:
+            geo.colors = gfx.Buffer(
+                self._datCol.view(np.uint32).reshape(-1), chunk_size=UPLOAD_CHUNK
+            )
+        else:
+            geo.colors = gfx.Buffer(self._datCol, chunk_size=UPLOAD_CHUNK)
+
         geo.positions.draw_range = 0, self._dyCount
         self.geometry = geo
+        self._geoCapacity = self._dyCapacity
+
+        # New buffers upload everything
+        for d in self._dyDirty.values():
+            d.clear()
+
+        self._addUploadStats(sum(b.nbytes for b in self._gpuBuffers()))
+        self.dyStats["geoBuilds"] += 1
 
     def _updateGeometry(self):
         geo = self.geometry
 
-        # Copy data over to geometry
-        geo.positions.set_data(self._datPos)
-        geo.sizes.set_data(self._datSiz)
-        geo.colors.set_data(self._datCol)
+        # Geometry buffers share memory with the local arrays, only need to flag
+        # the changed ranges for upload. Ranges are snapped to the upload chunks
+        # so the stats count what is actually sent.
+        nbytes = 0
+        for name, dirty in self._dyDirty.items():
+            for start, end in dirty.take(UPLOAD_CHUNK, self._dyCapacity):
+                nbytes += self._uploadRange(name, start, end)
+
+        self._addUploadStats(nbytes)
 
-        # geo.positions.update_full()
+        # A full ring is drawn whole with the oldest points in the middle of it. Every
+        # point is drawn on its own so the slot order doesn't change the image.
         geo.positions.draw_range = 0, self._dyCount
 
+    # Flag points start:end of an attribute for upload, converting the data to its
+    # GPU format first when it's stored differently. Returns the bytes sent.
+    def _uploadRange(self, name, start, end):
+        geo = self.geometry
+        nbytes = 0
+
+        if name == "positions" and self._qPos is not None:
+            # Ranges are on chunk boundaries, requantize them whole since their
+            # bounds may have changed
+            end = min(end, self._dyCount)
+            quantizeChunks(self._datPos, self._qPos, self._qChunks, start, end)
+            k0, k1 = start // QUANT_CHUNK, -(-end // QUANT_CHUNK)
+            geo.qchunks.update_range(k0 * 2, (k1 - k0) * 2)
+            nbytes += (k1 - k0) * 2 * self._qChunks[0].nbytes
+
+        elif name == "sizes" and "sizes" in self.compact:
+            start, end = start // 2, -(-end // 2)
+
+        elif name == "colors" and self.palette is not None:
+            self.palette.toCoord(self._datCol[start:end], out=self._datTex[start:end])
+            name = "texcoords"
+
+        if end <= start:
+            return nbytes
+
+        buf = getattr(geo, name)
+        buf.update_range(start, end - start)
+        return nbytes + (end - start) * (buf.nbytes // buf.nitems)
+
+    def _gpuBuffers(self):
+        geo = self.geometry
+        names = ("positions", "qchunks", "sizes", "colors", "texcoords")
+        return [getattr(geo, n) for n in names if hasattr(geo, n)]
+
+    # Flag items start:end of the named attributes as changed
+    def _markDirty(self, start, end, names=("positions", "colors", "sizes")):
+        for n in names:
+            self._dyDirty[n].add(start, end)
+        self._dyModified = True
+
+    # Color storage for cap points, rgba floats, unorm8 or palette indices
+    def _newColors(self, cap):
+        if self.palette is not None:
+            return np.zeros(cap, dtype=self.palette.dtype)
+        if "colors" in self.compact:
+            return np.full((cap, 4), 255, dtype=np.uint8)
+        return np.ones((cap, 4), dtype=np.float32)
+
+    def _newSizes(self, cap):
+        if "sizes" in self.compact:
+            return newHalfSizes(cap)
+        return np.zeros(cap, dtype=np.float32)
+
+    # Write colors to a slice or array of slots
+    def _writeColors(self, s, col):
+        if self.palette is not None:
+            self._datCol[s] = self.palette.indicesOf(col)
+        elif isinstance(s, slice):
+            fillColors(self._datCol[s], col)
+        else:
+            self._datCol[s] = fillColors(self._newColors(np.size(s)), col)
+
+    def _addUploadStats(self, nbytes):
+        self.dyStats["bytesUploaded"] += nbytes
+        self.dyStats["lastUpload"] = nbytes
+
     # endregion
@@ -0,0 +1,166 @@
+# region IMPORTS
+import csv
+import io
+import json
+import time
+
+import numpy as np
+
+# endregion
+
+# Per phase frame timings. Code times a phase between begin() & end(name, t), times
+# of the same phase add up within a frame & endFrame() stores them as one sample.
+# Each phase keeps the last size frames in a ring buffer.
+#
+# Disabled, begin() returns 0 & end() returns right away so instrumented code only
+# pays for two calls. The shared profiler below is what pgfx instruments:
+#   fixedUpdate : App.onFixedUpdate calls of the frame
+#   preRender   : App.onPreRender callback
+#   sync        : DynamicPoints / DynamicLines / DynamicInstances sync with changes
+#   gizmo       : Gizmo update, runs inside render
+#   render      : Rendering the scene
+#   postRender  : App.onPostRender callback
+#   imgui       : UseImgui.render, usually inside postRender
+#   frame       : All of the above
+# Phases nest, preRender includes the syncs done in it & render the gizmo update.
+# Displays drawing on demand also count the frames they stayed idle for.
+
+PERCENTILES = (50, 95, 99)
+
+
+class FrameProfiler:
+    # region MAIN
+    def __init__(self, size=600, enabled=False):
+        self.size = size
+        self.enabled = enabled
+        self.frames = 0  # Frames recorded, the ring holds the last size of them
+        self._rings = {}  # Phase -> Seconds of each frame
+        self._cur = {}  # Phase -> Seconds so far in the current frame
+        self.idleFrames = 0  # Frames skipped because nothing changed
+
+    # endregion
+
+    # region RECORDING
+    # Start timing a phase, pass the result to end
+    def begin(self):
+        return time.perf_counter() if self.enabled else 0.0
+
+    def end(self, name, t):
+        if self.enabled:
+            self.add(name, time.perf_counter() - t)
+
+    # Add seconds to a phase of the current frame
+    def add(self, name, sec):
+        self._cur[name] = self._cur.get(name, 0.0) + sec
+
+    def addIdle(self, n=1):
+        if self.enabled:
+            self.idleFrames += n
+
+    # Store the current frame's times, phases that didn't run get 0
+    def endFrame(self):
+        if not self.enabled:
+            return
+
+        i = self.frames % self.size
+        for name in self._cur.keys() - self._rings.keys():
+            self._rings[name] = np.zeros(self.size, dtype=np.float64)
+
+        for name, ring in self._rings.items():
+            ring[i] = self._cur.get(name, 0.0)
+
+        self._cur.clear()
+        self.frames += 1
+
+    def reset(self):
+        self.frames = 0
+        self.idleFrames = 0
+        self._rings.clear()
+        self._cur.clear()
+        return self
+
+    # endregion
+
+    # region QUERIES
+    @property
+    def phases(self):
+        return list(self._rings.keys())
+
+    # Seconds of a phase for the frames in the ring, oldest first
+    def samples(self, name):
+        ring = self._rings.get(name)
+        if ring is None:
+            return np.zeros(0, dtype=np.float64)
+        if self.frames <= self.size:
+            return ring[: self.frames].copy()
+        return np.roll(ring, -(self.frames % self.size))
+
+    # Seconds at percentile q, 0 to 100, of a phase
+    def percentile(self, name, q):
+        s = self.samples(name)
+        return float(np.percentile(s, q)) if s.size else 0.0
+
+    # Mean, max & percentiles of every phase in milliseconds
+    def stats(self):
+        out = {}
+        for name in self._rings:
+            s = self.samples(name) * 1000
+            if not s.size:
+                continue
+
+            row = {"mean": float(s.mean()), "max": float(s.max())}
+            for q, v in zip(PERCENTILES, np.percentile(s, PERCENTILES)):
+                row[f"p{q}"] = float(v)
+            out[name] = row
+        return out
+
+    def printStats(self):
+        cols = ["mean", *(f"p{q}" for q in PERCENTILES), "max"]
+        print(f"{'phase (ms)':<12}" + "".join(f"{c:>9}" for c in cols))
+        for name, row in self.stats().items():
+            print(f"{name:<12}" + "".join(f"{row[c]:>9.3f}" for c in cols))
+        n = self.idleFrames
+        if n:
+            print(f"{'idle frames':<12}{n:>9} of {self.frames + n}")
+
+    # endregion
+
+    # region EXPORT
+    # Stats & the raw samples in ms. Written to path when given, returned either way
+    def toJson(self, path=None):
+        data = {
+            "frames": self.frames,
+            "size": self.size,
+            "idleFrames": self.idleFrames,
+            "stats": self.stats(),
+            "samples": {n: (self.samples(n) * 1000).tolist() for n in self._rings},
+        }
+
+        if path:
+            with open(path, "w") as f:
+                json.dump(data, f, indent=2)
+        return data
+
+    # A row per frame in the ring & a column per phase in ms, index is the frame number
+    def toCsv(self, path=None):
+        names = self.phases
+        cols = [self.samples(n) * 1000 for n in names]
+        first = self.frames - (cols[0].shape[0] if cols else 0)
+
+        buf = io.StringIO()
+        w = csv.writer(buf, lineterminator="\n")
+        w.writerow(["index", *names])
+        for i, row in enumerate(zip(*cols)):
+            w.writerow([first + i, *(f"{v:.4f}" for v in row)])
+
+        text = buf.getvalue()
+        if path:
+            with open(path, "w", newline="") as f:
+                f.write(text)
+        return text
+
+    # endregion
+
+
+# Shared by everything in pgfx, UseGfxDisplay turns it on with its profile prop
+profiler = FrameProfiler()
@@ -0,0 +1,202 @@
+# region IMPORTS
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+from pgfx.Util import requestRedraw
+
+# endregion
+
+# Runs per frame work on a pool of workers so it overlaps with rendering. numpy
+# releases the GIL in most heavy ops, so threads run in parallel for that kind
+# of work. Pure python work needs processes=True, then the function & its args
+# must pickle & there is a copy of them each way.
+#
+# Jobs with a slot write their result to the slot's back buffer when done. swap(),
+# called by UseGfxDisplay at the start of preRender, moves new results to the
+# front so a frame reads the same values from start to end.
+#   jobs.submit(solveIk, pose, slot="ik")  # Frame N, runs while N renders
+#   jobs.slot("ik").value                  # Frame N+1 or later
+#
+# Every job's wait in the queue & run time are kept per name, the slot name or
+# the function's name, for the last size jobs.
+
+
+# region TIMED CALL
+# Module level so process pools can pickle it
+def _timedCall(fn, args, kwargs):
+    t = time.perf_counter()
+    res = fn(*args, **kwargs)
+    return res, time.perf_counter() - t
+
+
+# endregion
+
+
+class ResultSlot:
+    def __init__(self, value=None):
+        self.value = value  # Front, what the current frame reads
+        self.fresh = False  # True on the frames a new value was swapped in
+        self.frame = -1  # Swap the value arrived on
+        self._back = None
+        self._backSeq = -1  # Submit order of the job in the back buffer
+        self._hasBack = False
+
+    # Keep the result of the newest submitted job if several finish between swaps
+    def _write(self, value, seq):
+        if seq > self._backSeq:
+            self._back = value
+            self._backSeq = seq
+            self._hasBack = True
+
+    def _swap(self, frame):
+        self.fresh = self._hasBack
+        if self._hasBack:
+            self.value = self._back
+            self.frame = frame
+            self._back = None
+            self._hasBack = False
+
+
+class JobSystem:
+    # region MAIN
+    def __init__(self, workers=None, processes=False, size=600):
+        pool = ProcessPoolExecutor if processes else ThreadPoolExecutor
+        self.pool = pool(max_workers=workers)
+        self.processes = processes
+        self.size = size
+        self.swaps = 0
+        self.maxDepth = 0  # Most jobs queued or running at once
+        self._depth = 0
+        self._seq = 0
+        self._slots = {}
+        self._times = {}  # Name -> deque of (wait, run) seconds
+        self._errors = []
+        self._lock = threading.Lock()
+
+    def shutdown(self, wait=True):
+        self.pool.shutdown(wait=wait, cancel_futures=not wait)
+
+    # endregion
+
+    # region JOBS
+    # Run fn(*args, **kwargs) on the pool, returns its Future
+    def submit(self, fn, *args, slot=None, name=None, **kwargs):
+        name = name or slot or getattr(fn, "__name__", "job")
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+            self._depth += 1
+            self.maxDepth = max(self.maxDepth, self._depth)
+            if slot is not None and slot not in self._slots:
+                self._slots[slot] = ResultSlot()
+
+        # The pool's future resolves to (result, run time), callers get one that
+        # resolves to just the result. Cancelling it drops the result.
+        out = Future()
+        t = time.perf_counter()
+        fut = self.pool.submit(_timedCall, fn, args, kwargs)
+        fut.add_done_callback(lambda f: self._onDone(f, out, name, slot, seq, t))
+        return out
+
+    # Runs on the worker thread, or the pool's thread for processes
+    def _onDone(self, fut, out, name, slot, seq, t):
+        total = time.perf_counter() - t
+        if fut.cancelled():
+            # Never ran, ie shutdown(wait=False), resolve the caller's future too
+            with self._lock:
+                self._depth -= 1
+            out.cancel()
+            out.set_running_or_notify_cancel()
+            return
+
+        err = fut.exception()
+        keep = out.set_running_or_notify_cancel()
+
+        with self._lock:
+            self._depth -= 1
+            if keep and err is None:
+                res, run = fut.result()
+                times = self._times.get(name)
+                if times is None:
+                    times = self._times[name] = deque(maxlen=self.size)
+                times.append((max(total - run, 0.0), run))
+
+                if slot is not None:
+                    self._slots[slot]._write(res, seq)
+            elif keep and slot is not None:
+                # Slot results are read through swap, so that's where errors go
+                self._errors.append(err)
+
+        if not keep:
+            return  # Caller cancelled their future, drop the result
+
+        if slot is not None:
+            requestRedraw()  # On demand displays need a frame to show it
+
+        if err is None:
+            out.set_result(res)
+        else:
+            out.set_exception(err)
+
+    # Move finished results to the front of their slots. Errors from jobs are
+    # raised here, on the render thread, instead of getting lost on a worker
+    def swap(self):
+        with self._lock:
+            self.swaps += 1
+            for s in self._slots.values():
+                s._swap(self.swaps)
+
+            errors, self._errors = self._errors, []
+
+        if errors:
+            raise errors[0]
+        return self
+
+    # Result slot by name, made empty when it doesn't exist yet
+    def slot(self, name):
+        with self._lock:
+            s = self._slots.get(name)
+            if s is None:
+                s = self._slots[name] = ResultSlot()
+            return s
+
+    # Jobs queued or running
+    @property
+    def queueDepth(self):
+        return self._depth
+
+    # endregion
+
+    # region STATS
+    # Count, mean, p95 & max run time and mean wait in the queue of each job name
+    # in milliseconds
+    def stats(self):
+        with self._lock:
+            rows = {
+                n: np.array(t, dtype=np.float64) * 1000 for n, t in self._times.items()
+            }
+
+        out = {}
+        for name, a in rows.items():
+            run = a[:, 1]
+            out[name] = {
+                "count": int(a.shape[0]),
+                "mean": float(run.mean()),
+                "p95": float(np.percentile(run, 95)),
+                "max": float(run.max()),
+                "wait": float(a[:, 0].mean()),
+            }
+        return out
+
+    def printStats(self):
+        cols = ["mean", "p95", "max", "wait"]
+        print(f"{'job (ms)':<12}{'count':>7}" + "".join(f"{c:>9}" for c in cols))
+        for name, row in self.stats().items():
+            line = "".join(f"{row[c]:>9.3f}" for c in cols)
+            print(f"{name:<12}{row['count']:>7}" + line)
+        print(f"{'queue depth':<12}{self.queueDepth:>7}, max {self.maxDepth}")
+
+    # endregion
@@ -1,26 +1,108 @@
+import os
 import time
 import math
 import numpy as np
 import pygfx as gfx
-from rendercanvas.glfw import RenderCanvas  # Import RenderCanvas specifically for glfw
 import pylinalg as la
+import wgpu
+from pygfx.renderers.wgpu import select_adapter, enable_wgpu_features
+from pgfx.FrameProfiler import profiler
+from pgfx.JobSystem import JobSystem
+from pgfx.Util import addRedrawTarget
 
 
 class UseGfxDisplay:
     # region MAIN
+    # offscreen : Render to an offscreen canvas with no window, show() then runs
+    # frames frames with a fixed dt. PGFX_OFFSCREEN=1 turns it on for any template.
+    # adapter : "cpu" for a software adapter or part of an adapter's name, PGFX_ADAPTER
+    # profile : Record per phase frame times in self.profiler, PGFX_PROFILE=1
+    # fixedStep : Seconds per onFixedUpdate(step) call, run 0 to maxSteps times a
+    # frame to keep up with real time. onPreRender & onPostRender then get a 3rd
+    # arg, alpha, how far the frame is past the last fixed update, 0 to 1 of a step.
+    # onDemand : Only draw when something marks the display dirty, PGFX_ONDEMAND=1.
+    # Camera & gizmo input, Dynamic* syncs with changes, running mixers added with
+    # addMixer & invalidate() all do. Frames that could have drawn but didn't are
+    # counted in idleFrames.
+    # maxFps : Cap on the frame rate of the window
+    # jobs : Workers for self.jobs, a JobSystem whose result slots swap at the start
+    # of preRender. 0 leaves it None, a JobSystem can also be set later.
     def __init__(self, _props={}):
-        props = {"width": 800, "height": 600, "stats": True, "ortho": False, "zup": False, **_props}
+        props = {
+            "width": 800,
+            "height": 600,
+            "stats": True,
+            "ortho": False,
+            "zup": False,
+            "offscreen": bool(os.environ.get("PGFX_OFFSCREEN")),
+            "adapter": os.environ.get("PGFX_ADAPTER"),
+            "frames": int(os.environ.get("PGFX_FRAMES", 60)),
+            "profile": bool(os.environ.get("PGFX_PROFILE")),
+            "fixedStep": None,
+            "maxSteps": 5,
+            "onDemand": bool(os.environ.get("PGFX_ONDEMAND")),
+            "maxFps": 30,
+            "jobs": 0,
+            **_props,
+        }
 
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
         self.onPreRender = None
         self.onPostRender = None
+        self.onFixedUpdate = None
         self.isZup = props.get("zup")
+        self.isOffscreen = props.get("offscreen")
+        self.offscreenFrames = props.get("frames")
+        self._stepDt = None  # Fixed dt while runFrames is stepping
+
+        # Fixed step simulation, frames run the steps their time adds up to. When
+        # more than maxSteps are due the rest is dropped instead of catching up.
+        self.fixedStep = props.get("fixedStep")
+        self.maxSteps = props.get("maxSteps")
+        self.fixedTime = 0  # Simulated time
+        self.droppedTime = 0  # Time given up to the maxSteps cap
+        self.alpha = 0.0
+        self._accum = 0.0
+
+        # Render on demand, a frame only asks for the next one when it's dirty
+        self.isOnDemand = props.get("onDemand")
+        self.maxFps = props.get("maxFps")
+        self.mixers = []  # AnimationMixers that keep the display drawing while running
+        self.idleFrames = 0
+        self._frameEnd = 0.0  # When the last frame finished, 0 before the first
+        addRedrawTarget(self)
+
+        # Work submitted here runs while frames render, see JobSystem
+        self.jobs = JobSystem(props.get("jobs")) if props.get("jobs") else None
+
+        # Shared FrameProfiler, see it for the phases
+        self.profiler = profiler
+        self._frameStart = 0.0
+        self._renderStart = 0.0
+        if props.get("profile"):
+            profiler.enabled = True
 
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
         # Core
         w = props.get("width")
         h = props.get("height")
-        self.canvas = RenderCanvas(title=props.get("title", "Prototype Alpha Omega"), size=(w, h))
+        if props.get("adapter") or self.isOffscreen:
+            selectAdapter(props.get("adapter"))
+
+        if self.isOffscreen:
+            from rendercanvas.offscreen import RenderCanvas
+
+            self.canvas = RenderCanvas(size=(w, h), pixel_ratio=1)
+        else:
+            from rendercanvas.glfw import RenderCanvas  # Import RenderCanvas specifically for glfw
+
+            self.canvas = RenderCanvas(
+                title=props.get("title", "Prototype Alpha Omega"),
+                size=(w, h),
+                max_fps=self.maxFps,
+                min_fps=0 if self.isOnDemand else 1,
+            )
+
         self.renderer = gfx.WgpuRenderer(self.canvas)
         self.scene = gfx.Scene()
 
@@ -56,15 +138,48 @@ class UseGfxDisplay:
             controller=self.camCtrl,
         )
 
-        self.display.stats = props.get("stats")
+        self.display.stats = props.get("stats") and not self.isOffscreen
         self.display.before_render = self.preRender
         self.display.after_render = self.postRender
+        if self.isOnDemand:
+            self.display.draw_function = self._drawOnDemand
 
     def show(self):
         t = time.perf_counter()
         self.lastFrameTime = t
         self.startTime = t
-        self.display.show(self.scene)
+
+        if not self.isOffscreen:
+            self.display.show(self.scene)
+            return
+
+        # No window to keep open, run a set number of frames & report the time
+        n = self.offscreenFrames
+        self.runFrames(n)
+        t = time.perf_counter() - t
+        print(f"Offscreen: {n} frames in {t:.3f}s, {t / max(n, 1) * 1000:.2f}ms a frame")
+        if profiler.enabled:
+            profiler.printStats()
+            if self.jobs:
+                self.jobs.printStats()
+
+    # Render n frames offscreen, stepping time by a fixed dt so runs are repeatable.
+    # Returns the last frame as an (h,w,4) uint8 array.
+    def runFrames(self, n, dt=1 / 60):
+        if not self.isOffscreen:
+            raise RuntimeError("runFrames needs an offscreen display")
+
+        self.display.scene = self.scene
+        self.canvas.request_draw(self.display.draw_function)
+
+        img = None
+        self._stepDt = dt
+        try:
+            for _ in range(n):
+                img = self.canvas.draw()
+        finally:
+            self._stepDt = None
+        return None if img is None else np.asarray(img)
 
     # endregion
 
@@ -96,27 +211,121 @@ class UseGfxDisplay:
         self.camera.show_pos(target)
         return self
 
+    # Ask for another frame, in onDemand mode nothing draws until something does
+    def invalidate(self):
+        self.canvas.request_draw()
+        return self
+
+    # Keep drawing while the mixer has running actions
+    def addMixer(self, mixer):
+        self.mixers.append(mixer)
+        return self
+
     # endregion
 
     # region RENDER LOOP
     def preRender(self):
+        self._frameStart = profiler.begin()
+
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
         # Compute Times
         curTime = time.perf_counter()
-        self.deltaTime = curTime - self.lastFrameTime
-        self.elapseTime = curTime - self.startTime
+        if self._stepDt is None:
+            self.deltaTime = curTime - self.lastFrameTime
+            self.elapseTime = curTime - self.startTime
+            if self.isOnDemand and self._frameEnd:
+                self._countIdle(curTime)
+        else:
+            self.deltaTime = self._stepDt
+            self.elapseTime += self._stepDt
         self.lastFrameTime = curTime
 
         # print(f"Delta time: {deltaTime:.6f} seconds")
         # print(f"Elapse time: {elapseTime:.6f} seconds")
 
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+        # Results of jobs that finished since the last frame
+        if self.jobs:
+            self.jobs.swap()
+
+        if self.fixedStep:
+            self._runFixedSteps()
+
         if self.onPreRender:
-            self.onPreRender(self.deltaTime, self.elapseTime)
+            t = profiler.begin()
+            self.onPreRender(*self._renderArgs())
+            profiler.end("preRender", t)
+
+        self._renderStart = profiler.begin()
 
     def postRender(self):
+        profiler.end("render", self._renderStart)
+
         if self.onPostRender:
-            self.onPostRender(self.deltaTime, self.elapseTime)
+            t = profiler.begin()
+            self.onPostRender(*self._renderArgs())
+            profiler.end("postRender", t)
+
+        profiler.end("frame", self._frameStart)
+        profiler.endFrame()
+
+        if self.isOnDemand and any(_mixerRunning(m) for m in self.mixers):
+            self.invalidate()
+        self._frameEnd = time.perf_counter()
+
+    # Display.default_draw without asking for the next frame at the end, only
+    # invalidating the display does that in onDemand mode
+    def _drawOnDemand(self):
+        d = self.display
+        self.preRender()
+
+        if d.stats:
+            d.stats.start()
+        self.renderer.render(d.scene, d.camera, flush=not d.stats)
+        if d.stats:
+            d.stats.stop()
+            d.stats.render()
+
+        self.postRender()
+
+    # Frames at maxFps that fit in the gap since the last one finished are idle,
+    # less one for the wait & present that follow every frame. The sleep isn't
+    # time the scene moved through, so dt restarts at one frame.
+    def _countIdle(self, curTime):
+        slot = 1 / self.maxFps
+        n = int((curTime - self._frameEnd) / slot) - 1
+        if n > 0:
+            self.idleFrames += n
+            profiler.addIdle(n)
+            self.deltaTime = min(self.deltaTime, slot)
+
+    def _runFixedSteps(self):
+        step = self.fixedStep
+        self._accum += self.deltaTime
+        # Small bias so float error in the sum doesn't lose a step, ie 0.3 / 0.1
+        n = min(int(self._accum / step + 1e-9), self.maxSteps)
+
+        t = profiler.begin()
+        for _ in range(n):
+            if self.onFixedUpdate:
+                self.onFixedUpdate(step)
+            self.fixedTime += step
+        profiler.end("fixedUpdate", t)
+
+        # Anything still a full step or more behind is past the cap, drop it so
+        # one slow frame doesn't leave every frame after it running maxSteps
+        self._accum = max(self._accum - n * step, 0.0)
+        drop = int(self._accum / step + 1e-9) * step
+        if drop:
+            self.droppedTime += drop
+            self._accum = max(self._accum - drop, 0.0)
+
+        self.alpha = self._accum / step
+
+    def _renderArgs(self):
+        if self.fixedStep:
+            return self.deltaTime, self.elapseTime, self.alpha
+        return self.deltaTime, self.elapseTime
 
     # endregion
 
@@ -131,6 +340,44 @@ class UseGfxDisplay:
     # endregion
 
 
+# Pick the wgpu adapter, must happen before the first renderer. "cpu" picks a
+# software adapter so scenes run with no GPU, other names match part of the
+# adapter's summary & None is the default high performance one. Only the first
+# call in a process picks one, later calls return it since gfx keeps its device.
+_adapter = None
+
+
+def selectAdapter(name=None):
+    global _adapter
+    if _adapter is not None:
+        return _adapter
+
+    if name is None:
+        adapter = wgpu.gpu.request_adapter_sync(power_preference="high-performance")
+    else:
+        adapters = wgpu.gpu.enumerate_adapters_sync()
+        if name.lower() == "cpu":
+            found = [a for a in adapters if a.info["adapter_type"] == "CPU"]
+        else:
+            found = [a for a in adapters if name.lower() in a.summary.lower()]
+
+        if not found:
+            raise RuntimeError(f"No wgpu adapter matches '{name}'")
+        adapter = found[0]
+
+    select_adapter(adapter)
+    _adapter = adapter
+
+    # Software adapters can't filter float32 textures, gfx asks for it by default
+    if "float32-filterable" not in adapter.features:
+        enable_wgpu_features("!float32-filterable")
+    return adapter
+
+
+def _mixerRunning(mixer):
+    return mixer.time_scale != 0 and any(a.is_running() for a in mixer._actions.values())
+
+
 def useDarkScene(app):
     # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
     # Background
@@ -17,6 +17,7 @@ from pygfx.materials import MeshBasicMaterial, LineMaterial
 from pygfx.objects import WorldObject
 from pygfx.utils.viewport import Viewport
 from pygfx.utils.transform import AffineTransform
+from pgfx.FrameProfiler import profiler
 
 # Colors in hsluv space - https://www.hsluv.org/
 # With H: 0/120/240, S: 100, L: 50
@@ -375,6 +376,7 @@ class TransformGizmo(WorldObject):
         # of all elements need updating anyway, so any other changes
         # to wobject properties (e.g. visibility) are "free" - no need
         # to only update if it actually changes.
+        t = profiler.begin()
         if not self._object_to_control:
             self.visible = False
         elif self._viewport and self._camera:
@@ -383,6 +385,7 @@ class TransformGizmo(WorldObject):
             self._update_directions()
             self._update_gizmo_transform()
             self._update_visibility()
+        profiler.end("gizmo", t)
 
     def _update_ndc_screen_transform(self):
         # Note: screen origin is at top left corner of NDC with Y-axis pointing down
@@ -1,5 +1,6 @@
 from wgpu.utils.imgui import ImguiRenderer
 from imgui_bundle import imgui
+from pgfx.FrameProfiler import profiler
 
 
 class UseImgui:
@@ -18,7 +19,9 @@ class UseImgui:
 
     # Call doing a post render event to draw UI over the scene
     def render(self):
+        t = profiler.begin()
         self.renderer.render()
+        profiler.end("imgui", t)
 
     def _draw(
         self,
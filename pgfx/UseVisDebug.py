@@ -1,21 +1,153 @@
+import numpy as np
+from pgfx import DebugShapes
 from pgfx.DynamicLines import DynamicLines
 from pgfx.DynamicPoints import DynamicPoints
 
+AXES_COLORS = np.array([[1, 0, 0], [0, 1, 0], [0, 0, 1]], dtype=np.float32)
 
-class UseVisDebug:
 
+class UseVisDebug:
+    # pnt & ln are immediate, reset() & redraw them every frame. point() & line()
+    # with a duration go in the retained keepPnt & keepLn instead, they stay until
+    # they expire & are only uploaded when added or removed.
     def __init__(self, App, _props={}):
         props = {"pntSize": 20, "lnSize": 20, "useDepth": True, **_props}
 
+        self.app = App
         self.pnt = DynamicPoints(props["pntSize"], props["useDepth"])
         self.ln = DynamicLines(props["lnSize"], props["useDepth"])
-        App.scene.add(self.pnt)
-        App.scene.add(self.ln)
+        self.keepPnt = DynamicPoints(props["pntSize"], props["useDepth"])
+        self.keepLn = DynamicLines(props["lnSize"], props["useDepth"])
+
+        # Expire time of each retained point & line, by slot
+        self._pntExpire = np.zeros(props["pntSize"], dtype=np.float64)
+        self._lnExpire = np.zeros(props["lnSize"], dtype=np.float64)
+
+        for o in (self.pnt, self.ln, self.keepPnt, self.keepLn):
+            App.scene.add(o)
+
+    # region DRAW
+    # duration in seconds, 0 only draws until the next reset()
+    def point(self, pos, col="#00ff00", size=0.1, duration=0):
+        if duration <= 0:
+            self.pnt.add(pos, col, size)
+            return self
+
+        i = self.keepPnt._dyCount
+        self.keepPnt.add(pos, col, size)
+        self._pntExpire = self._setExpire(self._pntExpire, i, i + 1, duration)
+        return self
+
+    def line(self, apos, bpos, acol="#00ff00", bcol=None, duration=0):
+        if duration <= 0:
+            self.ln.add(apos, bpos, acol, bcol)
+            return self
+
+        i = self.keepLn._dyCount
+        self.keepLn.add(apos, bpos, acol, bcol)
+        self._lnExpire = self._setExpire(self._lnExpire, i, i + 1, duration)
+        return self
+
+    # endregion
+
+    # region SHAPES
+    # Wireframe shapes for N at once. pos is (N,3), rot is None, a quat or (N,4)
+    # quats like a QuatArray. Sizes are a scalar, (N,) or (N,3) per axis. col is a
+    # single color or one per shape. Every shape's segments are added in one go.
+    def circles(self, pos, rot=None, radius=1.0, col="#00ff00", segs=32, duration=0):
+        a, b = DebugShapes.circles(pos, rot, radius, segs)
+        return self._shapes(a, b, col, segs, duration)
+
+    def boxes(self, pos, rot=None, size=1.0, col="#00ff00", duration=0):
+        a, b = DebugShapes.boxes(pos, rot, size)
+        return self._shapes(a, b, col, 12, duration)
+
+    def spheres(self, pos, rot=None, radius=1.0, col="#00ff00", segs=16, duration=0):
+        a, b = DebugShapes.spheres(pos, rot, radius, segs)
+        return self._shapes(a, b, col, segs * 3, duration)
 
+    # X, Y & Z lines colored red, green & blue
+    def axes(self, pos, rot=None, size=1.0, duration=0):
+        a, b = DebugShapes.axes(pos, rot, size)
+        col = np.tile(AXES_COLORS, (a.shape[0] // 3, 1))
+        return self._shapes(a, b, col, 1, duration)
+
+    def grids(self, pos, rot=None, size=1.0, div=10, col="#555555", duration=0):
+        a, b = DebugShapes.grids(pos, rot, size, div)
+        return self._shapes(a, b, col, (div + 1) * 2, duration)
+
+    # Camera frustums looking down -Z, fov in degrees
+    def frustums(
+        self,
+        pos,
+        rot=None,
+        fov=50,
+        aspect=1.0,
+        near=0.1,
+        far=1.0,
+        col="#ffff00",
+        duration=0,
+    ):
+        a, b = DebugShapes.frustums(pos, rot, fov, aspect, near, far)
+        return self._shapes(a, b, col, 12, duration)
+
+    # Arrows from apos to bpos, both (N,3)
+    def arrows(self, apos, bpos, col="#00ff00", head=0.2, duration=0):
+        a, b = DebugShapes.arrows(apos, bpos, head)
+        return self._shapes(a, b, col, 5, duration)
+
+    # endregion
+
+    # region MANAGE
+    # Clear the immediate draws
     def reset(self):
         self.pnt.reset()
         self.ln.reset()
 
+    # Clear the retained draws too
+    def clear(self):
+        self.reset()
+        self.keepPnt.reset()
+        self.keepLn.reset()
+
+    # Call once per frame, drops expired retained draws then uploads changes
     def sync(self):
+        now = self.app.elapseTime
+        self._expire(self.keepPnt, self._pntExpire, now)
+        self._expire(self.keepLn, self._lnExpire, now)
+
         self.pnt.sync()
         self.ln.sync()
+        self.keepPnt.sync()
+        self.keepLn.sync()
+
+    # Compact the live items of a retained buffer & their expire times together
+    def _expire(self, obj, expire, now):
+        n = obj._dyCount
+        alive = expire[:n] > now
+        if not alive.all():
+            k = np.count_nonzero(alive)
+            expire[:k] = expire[:n][alive]
+            obj.keepWhere(alive)
+
+    # Segments of N shapes with segs segments each
+    def _shapes(self, a, b, col, segs, duration):
+        col = DebugShapes.segmentColors(col, segs)
+        if duration <= 0:
+            self.ln.addSegments(a, b, col)
+            return self
+
+        i = self.keepLn._dyCount
+        self.keepLn.addSegments(a, b, col)
+        n = self.keepLn._dyCount
+        self._lnExpire = self._setExpire(self._lnExpire, i, n, duration)
+        return self
+
+    # Expire times of items i:n, grows with their buffer's capacity
+    def _setExpire(self, expire, i, n, duration):
+        if n > expire.shape[0]:
+            expire = np.resize(expire, max(n, expire.shape[0] * 2))
+        expire[i:n] = self.app.elapseTime + duration
+        return expire
+
+    # endregion
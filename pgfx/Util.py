@@ -1,6 +1,10 @@
 import inspect
 import pygfx as gfx
+import numpy as np
 import threading
+import weakref
+from functools import lru_cache
+from bisect import bisect_left
 
 # region OBJECT HIERARCHY
 
@@ -62,6 +66,241 @@ def getGltfSkeleton(gl):
 # endregion
 
 
+# region COLORS
+
+# How many parsed colors to keep around. Debug drawing uses a handful of colors
+# over & over, so parsing each one once saves building a gfx.Color on every add.
+COLOR_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=COLOR_CACHE_SIZE)
+def _parseColor(col):
+    return gfx.Color(col).rgba
+
+
+# Color as an rgba tuple of floats. Strings, tuples & other hashable values are
+# cached, lists & arrays are parsed every time.
+def toRgba(col):
+    try:
+        return _parseColor(col)
+    except TypeError:
+        return gfx.Color(col).rgba
+
+
+# Color as an rgba tuple of 0 to 255 ints, for unorm8 color buffers
+@lru_cache(maxsize=COLOR_CACHE_SIZE)
+def _parseColor8(col):
+    return tuple(int(round(c * 255)) for c in _parseColor(col))
+
+
+def toRgba8(col):
+    try:
+        return _parseColor8(col)
+    except TypeError:
+        return tuple(int(round(c * 255)) for c in gfx.Color(col).rgba)
+
+
+# Hits, misses & size of the color cache
+def colorCacheInfo():
+    return _parseColor.cache_info()
+
+
+# Write colors into an (N,4) rgba buffer. col is a single color, anything gfx.Color
+# takes, broadcast to every row or an (N,3) / (N,4) array with a color per row.
+# uint8 buffers get 0 to 255 unorm8 colors, col is always given as 0 to 1 floats.
+def fillColors(dst, col):
+    isU8 = dst.dtype == np.uint8
+    if np.ndim(col) == 2:
+        col = np.asarray(col, dtype=np.float32)
+        if isU8:
+            col = np.rint(np.clip(col, 0, 1) * 255)
+
+        dst[:, : col.shape[1]] = col
+        if col.shape[1] == 3:
+            dst[:, 3] = 255 if isU8 else 1
+    else:
+        dst[:] = toRgba8(col) if isU8 else toRgba(col)
+
+    return dst
+
+
+# Rows of col for the items in rows when col has a color per item, (N,3) / (N,4)
+# colors or (N,) palette indices. Single colors are returned as is.
+def colorRows(col, rows):
+    if np.ndim(col) == 2:
+        return col[rows]
+    if isinstance(col, np.ndarray) and col.ndim == 1 and col.dtype.kind in "iu":
+        return col[rows]
+    return col
+
+
+# Indexed colors for dynamic geometry. Items store a uint8 ( uint16 past 256 colors )
+# index instead of 4 floats, the index becomes a texcoord on upload & the material
+# looks the color up in a 1D texture of the palette. Colors are added the first time
+# they're used, ints are taken as an index as is. Can be shared between objects.
+class Palette:
+    def __init__(self, colors=(), size=256):
+        # 1D textures are limited to 8192 texels by WebGPU
+        if not 0 < size <= 8192:
+            raise ValueError(f"Palette size must be 1 to 8192, got {size}")
+
+        self.size = size
+        self.dtype = np.uint8 if size <= 256 else np.uint16
+        self.count = 0
+        self.rgba = np.zeros((size, 4), dtype=np.uint8)
+        self.texture = gfx.Texture(self.rgba, dim=1)
+        self.map = gfx.TextureMap(self.texture, filter="nearest", wrap="clamp")
+
+        self._lookup = {}  # Quantized rgba -> Index
+        self._keys = {}  # Color as given -> Index, skips parsing known colors
+
+        for c in colors:
+            self.indexOf(c)
+
+    def __len__(self):
+        return self.count
+
+    # Index of a single color, added to the palette if it's new
+    def indexOf(self, col):
+        if isinstance(col, (int, np.integer)):
+            return int(col)
+
+        try:
+            return self._keys[col]
+        except (KeyError, TypeError):
+            pass
+
+        # Colors that only differ past 8 bits share an entry
+        q = bytes(np.round(np.multiply(toRgba(col), 255)).astype(np.uint8))
+        i = self._lookup.get(q)
+        if i is None:
+            if self.count >= self.size:
+                raise ValueError(f"Palette is full, {self.size} colors")
+
+            i = self._lookup[q] = self.count
+            self.rgba[i] = np.frombuffer(q, dtype=np.uint8)
+            self.texture.update_range((i, 0, 0), (1, 1, 1))
+            self.count += 1
+
+        try:
+            self._keys[col] = i
+        except TypeError:
+            pass
+        return i
+
+    # Indices for a single color, an (N,3) / (N,4) array with a color per row or
+    # an (N,) integer array of indices
+    def indicesOf(self, col):
+        if isinstance(col, np.ndarray) and col.ndim == 1 and col.dtype.kind in "iu":
+            return col.astype(self.dtype, copy=False)
+
+        if np.ndim(col) == 2:
+            rows, inv = np.unique(
+                np.asarray(col, dtype=np.float32), axis=0, return_inverse=True
+            )
+            lut = np.array([self.indexOf(tuple(r.tolist())) for r in rows])
+            return lut.astype(self.dtype)[inv.ravel()]
+
+        return self.indexOf(col)
+
+    # Texcoords at the center of each index's texel
+    def toCoord(self, idx, out=None):
+        return np.multiply(np.add(idx, 0.5, dtype=np.float32), 1 / self.size, out=out)
+
+    # Float rgba of indices
+    def colorOf(self, idx):
+        return self.rgba[idx] / np.float32(255)
+
+
+# endregion
+
+
+# region BUFFERS
+
+# Items per upload chunk for dynamic buffers. gfx splits buffers into 32 chunks by
+# default, which makes a 1 item change on a large buffer upload 1/32 of all of it.
+UPLOAD_CHUNK = 4096
+
+
+# Sorted [start, end) item ranges of a buffer that changed since the last upload.
+# Ranges that touch are merged & past maxRanges the two closest ones are joined,
+# so scattered writes still end up as a handful of partial uploads.
+class DirtyRanges:
+    def __init__(self, maxRanges=4):
+        self.maxRanges = maxRanges
+        self.ranges = []
+
+    def __bool__(self):
+        return len(self.ranges) > 0
+
+    def __repr__(self):
+        return f"DirtyRanges({self.ranges})"
+
+    # Total items covered by all ranges
+    @property
+    def count(self):
+        return sum(e - s for s, e in self.ranges)
+
+    def add(self, start, end):
+        r = self.ranges
+
+        # Appending past the last range is the common case
+        if not r or start > r[-1][1]:
+            r.append([start, end])
+        elif start >= r[-1][0]:
+            r[-1][1] = max(r[-1][1], end)
+            return self
+        else:
+            i = bisect_left(r, [start, end])
+            r.insert(i, [start, end])
+
+            # Merge with any ranges it now touches
+            i = max(i - 1, 0)
+            while i < len(r) - 1:
+                if r[i][1] >= r[i + 1][0]:
+                    r[i][1] = max(r[i][1], r.pop(i + 1)[1])
+                elif r[i][0] > end:
+                    break
+                else:
+                    i += 1
+
+        while len(r) > self.maxRanges:
+            gaps = [r[j + 1][0] - r[j][1] for j in range(len(r) - 1)]
+            j = gaps.index(min(gaps))
+            r[j][1] = r.pop(j + 1)[1]
+
+        return self
+
+    def clear(self):
+        self.ranges = []
+        return self
+
+    # Get the ranges & clear them. Ranges can be snapped outward to multiples of
+    # align & capped at limit, to match how a buffer uploads them in chunks.
+    def take(self, align=1, limit=None):
+        r = self.ranges
+        self.ranges = []
+        if align == 1:
+            return r
+
+        out = []
+        for s, e in r:
+            s = s // align * align
+            e = -(-e // align) * align
+            if limit is not None:
+                e = min(e, limit)
+
+            if out and s <= out[-1][1]:
+                out[-1][1] = max(out[-1][1], e)
+            else:
+                out.append([s, e])
+
+        return out
+
+
+# endregion
+
+
 # region DEBUGGING DATA
 def inspectObj(obj, showUnderScores=False):
     print(f"INSPECT OBJECT :: {obj.__class__.__name__}")
@@ -93,6 +332,25 @@ def printDict(d):
 # endregion
 
 
+# region REDRAW
+# Displays that draw on demand register here so anything that changes the scene,
+# like Dynamic* buffers on sync, can ask for a frame without knowing the display.
+_redrawTargets = weakref.WeakSet()
+
+
+def addRedrawTarget(obj):
+    _redrawTargets.add(obj)
+
+
+# Calls invalidate() on every registered display
+def requestRedraw():
+    for obj in list(_redrawTargets):
+        obj.invalidate()
+
+
+# endregion
+
+
 # region MAIN
 
 
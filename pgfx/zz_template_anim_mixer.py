@@ -1,8 +1,19 @@
+# region Run current file with the project root on the path, pgfx modules import
+# each other as part of the pgfx package
+import sys
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# endregion
+
 # region IMPORTS
-from UseGfxDisplay import gfx, UseGfxDisplay, useDarkScene
-from Util import findFirst, swopClipSkeleton
+from UseGfxDisplay import gfx, UseGfxDisplay, useDarkScene  # noqa: E402
+from Util import findFirst, swopClipSkeleton  # noqa: E402
 
-from pathlib import Path
+from pathlib import Path  # noqa: E402
 
 # endregion
 
@@ -56,6 +67,9 @@ swopClipSkeleton(clip, skel)
 action = mixer.clip_action(clip)
 action.play()
 
+# Keeps drawing while the clip plays when the display is on demand
+App.addMixer(mixer)
+
 # endregion
 
 # region RUN
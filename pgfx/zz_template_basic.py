@@ -1,9 +1,20 @@
+# region Run current file with the project root on the path, pgfx modules import
+# each other as part of the pgfx package
+import sys
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# endregion
+
 # region IMPORTS
-from UseGfxDisplay import UseGfxDisplay, useDarkScene, gfx
-from FacedCube import facedCube
-from Util import inspectObj, dirObj, varObj, printDict
+from UseGfxDisplay import UseGfxDisplay, useDarkScene, gfx  # noqa: E402
+from FacedCube import facedCube  # noqa: E402
+from Util import inspectObj, dirObj, varObj, printDict  # noqa: E402
 
-import math
+import math  # noqa: E402
 
 # endregion
 
@@ -1,8 +1,19 @@
+# region Run current file with the project root on the path, pgfx modules import
+# each other as part of the pgfx package
+import sys
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# endregion
+
 # region IMPORTS
-from UseGfxDisplay import gfx, UseGfxDisplay, useDarkScene
-from DynamicPoints import DynamicPoints
+from UseGfxDisplay import gfx, UseGfxDisplay, useDarkScene  # noqa: E402
+from DynamicPoints import DynamicPoints  # noqa: E402
 # from Util import inspectObj, dirObj, varObj, printDict
-from UseGizmo import useGizmo
+from UseGizmo import useGizmo  # noqa: E402
 
 # endregion
 
@@ -24,7 +35,8 @@ App.scene.add(dyPoints)
 
 # Need an object to store a single value else
 # there is no way to mutate the value when using
-# a global int value
+# a global int value. sel is the handle of the
+# selected point, -1 if nothing is selected
 state = {
     "sel": -1
 }
@@ -34,17 +46,15 @@ points = [
     {"v": [1, 1, 0], "c": "#ff0000"},
 ]
 
-def redrawPoints():
-    dyPoints.reset()
-    pntSize = 0.2
-
-    for p in points:
-        dyPoints.add(p["v"], p["c"], pntSize)
-        print( p["v"] )
+# Handles stay the same for as long as the point
+# exists, so each point only needs to be added once
+for p in points:
+    p["h"] = dyPoints.create(p["v"], p["c"], 0.2)
 
-    dyPoints.sync()
+# Handle -> its entry in points
+byHandle = { p["h"]: p for p in points }
 
-redrawPoints()
+dyPoints.sync()
 
 # endregion
 
@@ -59,10 +69,15 @@ def onPicking(e):
     obj = pi["world_object"]
     match pi:
         case x if "vertex_index" in pi and isinstance(x["world_object"], DynamicPoints):
-            sel = state["sel"] = pi['vertex_index']
+            # vertex_index is the slot the point is in, map it back to its handle
+            sel = obj.handleAt( pi['vertex_index'] )
+            if sel == -1:
+                return
+
+            state["sel"] = sel
             gizmo.set_object( gizObject )
-            gizObject.local.position = points[ sel ]["v"]
-            print(f"DynamicPoint - Id:{obj.id}, Idx:{sel}, pos:{obj.posAt(sel)}")
+            gizObject.local.position = obj.getPos( sel )
+            print(f"DynamicPoint - Id:{obj.id}, Handle:{sel}, pos:{obj.getPos(sel)}")
 
 App.on("pointer_down", onPicking)
 
@@ -82,14 +97,11 @@ def onGizmoMove(v):
     # print(f"GizmoMove: {v}")
     sel = state["sel"]
     if sel != -1:
-        points[ sel ]["v"] = v
-
-def onGizmoDragEnd():
-    # print("GizmoDragEnd")
-    redrawPoints()
+        # Only the selected point's slot gets uploaded
+        byHandle[ sel ]["v"] = v
+        dyPoints.setPos( sel, v ).sync()
 
 gizmo.onMove = onGizmoMove
-gizmo.onDragEnd = onGizmoDragEnd
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # Render Loop
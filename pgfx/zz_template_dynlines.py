@@ -1,7 +1,19 @@
+# region Run current file with the project root on the path, pgfx modules import
+# each other as part of the pgfx package
+import sys
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# endregion
+
 # region IMPORTS
-from UseGfxDisplay import UseGfxDisplay, useDarkScene
-from DynamicLines import DynamicLines
-from Util import setTimeout
+from UseGfxDisplay import UseGfxDisplay, useDarkScene  # noqa: E402
+from DynamicLines import DynamicLines  # noqa: E402
+from Util import setTimeout  # noqa: E402
+import numpy as np  # noqa: E402
 
 # endregion
 
@@ -22,7 +34,13 @@ App.scene.add(dyLines)
 
 
 def doSomething():
-    dyLines.add([0, 1, 0], [1, 1, 0], "#00ff00").sync()
+    dyLines.add([0, 1, 0], [1, 1, 0], "#00ff00")
+
+    # Grid of segments in a single call
+    x = np.linspace(-2, 2, 9)
+    a = np.stack((x, np.zeros_like(x), np.full_like(x, -2)), axis=1)
+    b = np.stack((x, np.zeros_like(x), np.full_like(x, 2)), axis=1)
+    dyLines.addSegments(a, b, "#555555", "#aaaaaa").sync()
 
 
 setTimeout(2, doSomething)
@@ -1,7 +1,19 @@
+# region Run current file with the project root on the path, pgfx modules import
+# each other as part of the pgfx package
+import sys
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# endregion
+
 # region IMPORTS
-from UseGfxDisplay import UseGfxDisplay, useDarkScene
-from DynamicPoints import DynamicPoints
-from Util import setTimeout
+from UseGfxDisplay import UseGfxDisplay, useDarkScene  # noqa: E402
+from DynamicPoints import DynamicPoints  # noqa: E402
+from Util import setTimeout  # noqa: E402
+import numpy as np  # noqa: E402
 
 # endregion
 
@@ -22,7 +34,13 @@ App.scene.add(dyPoints)
 
 
 def doSomething():
-    dyPoints.add((-1, 0.5, 0), "#ff0000", 0.4).add((1, 1.5, 0), "#0000ff", 0.6).sync()
+    dyPoints.add((-1, 0.5, 0), "#ff0000", 0.4).add((1, 1.5, 0), "#0000ff", 0.6)
+
+    # Ring of points in a single call, one color per point
+    rad = np.linspace(0, np.pi * 2, 64, endpoint=False)
+    pos = np.stack((np.cos(rad) * 2, np.zeros_like(rad), np.sin(rad) * 2), axis=1)
+    col = np.stack((rad / (np.pi * 2), np.ones_like(rad), 1 - rad / (np.pi * 2)), axis=1)
+    dyPoints.addMany(pos, col, 0.1).sync()
 
 
 setTimeout(2, doSomething)
@@ -0,0 +1,60 @@
+# region Run current file with the project root on the path, pgfx modules import
+# each other as part of the pgfx package
+import sys
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# endregion
+
+# region IMPORTS
+from UseGfxDisplay import UseGfxDisplay, useDarkScene, gfx  # noqa: E402
+
+import numpy as np  # noqa: E402
+
+# endregion
+
+# region SETUP
+# Physics runs at 20 steps a second no matter the frame rate
+App = useDarkScene(UseGfxDisplay({"title": "Template Fixed Step", "fixedStep": 1 / 20}))
+App.sphericalLook([0, 20], 10, [0, 2, 0])
+# endregion
+
+
+# region MISC
+ball = gfx.Mesh(gfx.sphere_geometry(0.5), gfx.MeshPhongMaterial(color="#00ffff"))
+App.scene.add(ball)
+
+prvPos = np.array([0, 4, 0], dtype=np.float64)
+curPos = prvPos.copy()
+vel = np.array([2, 0, 0], dtype=np.float64)
+# endregion
+
+
+# region RUN
+# Bounce the ball around a box, only ever called with the fixed step
+def onFixedUpdate(step):
+    global prvPos
+    prvPos = curPos.copy()
+    vel[1] -= 9.8 * step
+    curPos[:] += vel * step
+
+    hit = np.abs(curPos[[0, 2]]) > 4
+    vel[[0, 2]] *= np.where(hit, -1, 1)
+    if curPos[1] < 0.5:
+        curPos[1] = 0.5
+        vel[1] = abs(vel[1]) * 0.9
+
+
+# Draw between the last two steps so motion stays smooth at any frame rate
+def onPreRender(dt, et, alpha):
+    ball.local.position = prvPos + (curPos - prvPos) * alpha
+
+
+App.onFixedUpdate = onFixedUpdate
+App.onPreRender = onPreRender
+
+App.show()
+# endregion
@@ -1,8 +1,19 @@
+# region Run current file with the project root on the path, pgfx modules import
+# each other as part of the pgfx package
+import sys
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# endregion
+
 # region IMPORTS
-from UseGfxDisplay import gfx, UseGfxDisplay, useDarkScene
-from Util import inspectObj, dirObj, varObj, printDict
-from FacedCube import facedCube
-from UseGizmo import useGizmo
+from UseGfxDisplay import gfx, UseGfxDisplay, useDarkScene  # noqa: E402
+from Util import inspectObj, dirObj, varObj, printDict  # noqa: E402
+from FacedCube import facedCube  # noqa: E402
+from UseGizmo import useGizmo  # noqa: E402
 
 # endregion
 
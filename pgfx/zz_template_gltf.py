@@ -1,11 +1,22 @@
+# region Run current file with the project root on the path, pgfx modules import
+# each other as part of the pgfx package
+import sys
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# endregion
+
 # region IMPORTS
-from UseGfxDisplay import gfx, UseGfxDisplay, useDarkScene
-from Util import findFirst
-import math
+from UseGfxDisplay import gfx, UseGfxDisplay, useDarkScene  # noqa: E402
+from Util import findFirst  # noqa: E402
+import math  # noqa: E402
 
-import pylinalg as la
+import pylinalg as la  # noqa: E402
 
-from pathlib import Path
+from pathlib import Path  # noqa: E402
 
 # https://github.com/pygfx/pygfx/blob/9501a3174401f07b1d0b810e0826680d052e8960/pygfx/utils/load_gltf.py#L19
 
@@ -1,10 +1,21 @@
+# region Run current file with the project root on the path, pgfx modules import
+# each other as part of the pgfx package
+import sys
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# endregion
+
 # region IMPORTS
-from UseGfxDisplay import UseGfxDisplay, useDarkScene
-from FacedCube import facedCube
+from UseGfxDisplay import UseGfxDisplay, useDarkScene  # noqa: E402
+from FacedCube import facedCube  # noqa: E402
 
-from UseImgui import UseImgui, guiButton, guiFStepSlider
-from imgui_bundle import imgui  # lots of warnings about GLFW being used twice?
-import math
+from UseImgui import UseImgui, guiButton, guiFStepSlider  # noqa: E402
+from imgui_bundle import imgui  # lots of warnings about GLFW being used twice?  # noqa: E402
+import math  # noqa: E402
 
 # endregion
 
@@ -0,0 +1,66 @@
+# region Run current file with the project root on the path, pgfx modules import
+# each other as part of the pgfx package
+import sys
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# endregion
+
+# region IMPORTS
+from UseGfxDisplay import UseGfxDisplay, useDarkScene  # noqa: E402
+from DynamicInstances import instancedBoxes, instancedSpheres  # noqa: E402
+import numpy as np  # noqa: E402
+
+# endregion
+
+# region SETUP
+App = useDarkScene(UseGfxDisplay({"title": "Template Instances"})).sphericalLook([0, 30], 30)
+
+# endregion
+
+# region MISC
+# 10k boxes & 1k spheres, each set is a single draw call
+rng = np.random.default_rng(0)
+cnt = 10_000
+
+boxes = instancedBoxes(initCap=cnt)
+boxPos = rng.uniform(-10, 10, (cnt, 3)) * [1, 0.5, 1] + [0, 5, 0]
+boxRot = rng.normal(size=(cnt, 4))
+boxRot /= np.linalg.norm(boxRot, axis=1, keepdims=True)
+boxHnd = boxes.createMany(boxPos, rng.uniform(0.2, 1, (cnt, 3)), 0.2, boxRot)
+boxes.sync()
+
+spheres = instancedSpheres(initCap=1000)
+spheres.createMany(rng.uniform(-10, 10, (1000, 3)) * [1, 0, 1], "#ffffff", 0.3)
+spheres.sync()
+
+App.scene.add(boxes)
+App.scene.add(spheres)
+
+
+# endregion
+
+# region RUN
+# Bob a few hundred boxes up & down, only their slots get uploaded
+def onPreRender(dt, et):
+    h = boxHnd[:300]
+    pos = boxPos[:300] + [0, np.sin(et * 2), 0]
+    boxes.setTransform(h, pos=pos).sync()
+
+
+# Clicking a box removes it
+def onPicking(e):
+    pi = e.pick_info
+    if pi["world_object"] is boxes:
+        h = boxes.handleAt(pi["instance_index"])
+        if h != -1 and h >= 300:
+            boxes.remove(h).sync()
+
+
+App.onPreRender = onPreRender
+App.on("pointer_down", onPicking)
+App.show()
+# endregion
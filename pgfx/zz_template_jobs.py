@@ -0,0 +1,62 @@
+# region Run current file with the project root on the path, pgfx modules import
+# each other as part of the pgfx package
+import sys
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# endregion
+
+# region IMPORTS
+from UseGfxDisplay import UseGfxDisplay, useDarkScene  # noqa: E402
+from DynamicLines import DynamicLines  # noqa: E402
+import DebugShapes  # noqa: E402
+import numpy as np  # noqa: E402
+
+# endregion
+
+# region SETUP
+# 4 workers for App.jobs
+App = useDarkScene(UseGfxDisplay({"title": "Template Jobs", "jobs": 4}))
+App.sphericalLook([0, 30], 30)
+# endregion
+
+
+# region MISC
+lines = DynamicLines()
+App.scene.add(lines)
+
+rng = np.random.default_rng(0)
+cnt = 4000
+basePos = rng.uniform(-10, 10, (cnt, 3)) * [1, 0, 1]
+phase = rng.uniform(0, np.pi * 2, cnt)
+
+
+# Runs on a worker, only numpy so it overlaps with the frame being rendered
+def buildRipples(et):
+    r = 0.3 + 0.2 * np.sin(et * 3 + phase)
+    pos = basePos + np.stack((np.zeros(cnt), r, np.zeros(cnt)), axis=1)
+    return DebugShapes.circles(pos, radius=r, segs=16)
+
+
+# endregion
+
+
+# region RUN
+# Show the last finished set of circles & start on the next one
+def onPreRender(dt, et):
+    res = App.jobs.slot("ripples")
+    if res.fresh:
+        lines.reset()
+        lines.addSegments(*res.value, "#00ffff")
+        lines.sync()
+
+    if App.jobs.queueDepth < 2:
+        App.jobs.submit(buildRipples, et, slot="ripples")
+
+
+App.onPreRender = onPreRender
+App.show()
+# endregion
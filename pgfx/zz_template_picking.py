@@ -1,13 +1,26 @@
+# region Run current file with the project root on the path, pgfx modules import
+# each other as part of the pgfx package
+import sys
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# endregion
+
 # region IMPORTS
-import numpy as np
-from UseGfxDisplay import UseGfxDisplay, useDarkScene, gfx
-from DynamicPoints import DynamicPoints
-from Util import inspectObj, dirObj, varObj, printDict
+import numpy as np  # noqa: E402
+from UseGfxDisplay import UseGfxDisplay, useDarkScene, gfx  # noqa: E402
+from DynamicPoints import DynamicPoints  # noqa: E402
+from Util import inspectObj, dirObj, varObj, printDict  # noqa: E402
 
 # endregion
 
 # region SETUP
-App = useDarkScene(UseGfxDisplay({"title": "Template Picking"})).sphericalLook([0, 20], 10)
+# Nothing moves on its own, only draw when the camera or the points change
+App = useDarkScene(UseGfxDisplay({"title": "Template Picking", "onDemand": True}))
+App.sphericalLook([0, 20], 10)
 # endregion
 
 # region MISC
@@ -0,0 +1,61 @@
+# region Run current file with the project root on the path, pgfx modules import
+# each other as part of the pgfx package
+import sys
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# endregion
+
+# region IMPORTS
+from UseGfxDisplay import UseGfxDisplay, useDarkScene  # noqa: E402
+from DynamicLines import DynamicLines  # noqa: E402
+from DynamicPoints import DynamicPoints  # noqa: E402
+import numpy as np  # noqa: E402
+
+# endregion
+
+# region SETUP
+App = useDarkScene(UseGfxDisplay({"title": "Template Trail"})).sphericalLook([0, 20], 10)
+
+# endregion
+
+# region MISC
+# Ring buffers keep the last 200 segments & 50 points, older ones get overwritten
+# so the trail never grows & each sync only uploads what was added
+dyTrail = DynamicLines(initCap=200, ring=True, fade=0.0)
+dyDots = DynamicPoints(initCap=50, ring=True, fade=0.2)
+App.scene.add(dyTrail)
+App.scene.add(dyDots)
+
+state = {
+    "prev": None,
+    "dotTime": 0,
+}
+
+
+def getPos(et):
+    return np.array([np.cos(et) * 3, 1 + np.sin(et * 3) * 0.5, np.sin(et * 2) * 2])
+
+
+# endregion
+
+# region RUN
+def onPreRender(dt, et):
+    pos = getPos(et)
+    if state["prev"] is not None:
+        dyTrail.add(state["prev"], pos, "#00ffff").sync()
+    state["prev"] = pos
+
+    # Drop a dot every 0.1s
+    state["dotTime"] += dt
+    if state["dotTime"] >= 0.1:
+        state["dotTime"] = 0
+        dyDots.add(pos, "#ffff00", 0.15).sync()
+
+
+App.onPreRender = onPreRender
+App.show()
+# endregion
@@ -23,6 +23,10 @@ App = useDarkScene(UseGfxDisplay({"title": "Template Visual Debugging"}))
 App.sphericalLook([45, 20], 5, [0, 0.8, 0])
 Debug = UseVisDebug(App)
 
+# Static shapes only need to be added once, they stay until they expire
+Debug.boxes([[0, 2, 0]], size=[[0.8, 0.2, 0.3]], col="#888888", duration=math.inf)
+Debug.circles([[-0.2, 0, 0], [0.2, 0, 0]], radius=0.1, col="#555555", duration=math.inf)
+
 
 def onPreRender(dt, et):
     Debug.reset()
@@ -51,6 +55,13 @@ def calcLeg(et, offset=0, m=2, x=0):
     Debug.pnt.add(thigh, ca, ps).add(knee, cb, ps).add(foot, cc, ps)
     Debug.ln.add(thigh, knee, ca, cb).add(knee, foot, cb, cc)
 
+    # Retained draw, the foot leaves a trail of points that disappear after 1.5s
+    # without having to redraw them every frame
+    Debug.point(foot, "#ffff00", 0.03, duration=1.5)
+
+    # Shapes take arrays, every joint gets an axis triad in one call
+    Debug.axes([thigh, knee, foot], size=0.15)
+
 
 App.onPreRender = onPreRender
 # endregion
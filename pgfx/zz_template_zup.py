@@ -1,7 +1,18 @@
+# region Run current file with the project root on the path, pgfx modules import
+# each other as part of the pgfx package
+import sys
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# endregion
+
 # region IMPORTS
-from UseGfxDisplay import gfx, UseGfxDisplay, useDarkScene
+from UseGfxDisplay import gfx, UseGfxDisplay, useDarkScene  # noqa: E402
 
-from UseVisDebug import UseVisDebug
+from UseVisDebug import UseVisDebug  # noqa: E402
 
 # endregion
 
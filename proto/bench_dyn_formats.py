@@ -0,0 +1,162 @@
+# Memory & upload report of the DynamicPoints / DynamicLines vertex formats
+# Run from the project root, no GPU needed
+#   python -m proto.bench_dyn_formats                  : 1M points / line vertices
+#   python -m proto.bench_dyn_formats --count 100000   : other sizes
+#   python -m proto.bench_dyn_formats --out fmt.json   : save results as JSON
+#
+# cpu & gpu are the bytes held by the numpy arrays & the geometry buffers, full is
+# what the first sync uploads & move is the upload after moving a single item.
+# pack is the time of a full sync including converting to the compact formats.
+# err is the largest position error quantization adds, in world units over a
+# 100 unit wide cloud.
+
+# region IMPORTS
+import argparse
+import json
+import time
+
+import numpy as np
+import pygfx as gfx
+
+from pgfx.DynamicPoints import DynamicPoints
+from pgfx.DynamicLines import DynamicLines
+from pgfx.CompactFormats import dequantizeChunks
+
+# endregion
+
+# region SETUP
+PALETTE = ["#ff0000", "#00ff00", "#0000ff", "#ffff00", "#00ffff", "#ff00ff"]
+
+POINT_FORMATS = {
+    "float32": {},
+    "unorm8 colors": {"compact": ["colors"]},
+    "float16 sizes": {"compact": ["sizes"]},
+    "quant positions": {"compact": ["positions"]},
+    "compact": {"compact": True},
+    "palette": {"palette": PALETTE},
+    "palette + compact": {"palette": PALETTE, "compact": ["positions", "sizes"]},
+}
+
+LINE_FORMATS = {
+    "float32": {},
+    "unorm8 colors": {"compact": ["colors"]},
+    "quant positions": {"compact": ["positions"]},
+    "compact": {"compact": True},
+    "palette": {"palette": PALETTE},
+    "palette + compact": {"palette": PALETTE, "compact": ["positions"]},
+}
+
+
+# Same random data for every format. Colors are picked from the palette, palette
+# mode takes the indices & the rest the rgb rows.
+def makeData(cnt, seed=0):
+    rng = np.random.default_rng(seed)
+    pos = rng.uniform(-50, 50, (cnt, 3)).astype(np.float32)
+    idx = rng.integers(0, len(PALETTE), cnt)
+    rows = np.array([gfx.Color(c).rgb for c in PALETTE], dtype=np.float32)[idx]
+    return pos, idx, rows
+
+
+# endregion
+
+
+# region REPORT
+def measure(obj, fill, moveOne):
+    fill(obj)
+
+    t = time.perf_counter()
+    obj.sync()
+    pack = time.perf_counter() - t
+
+    full = obj.dyStats["lastUpload"]
+    moveOne(obj)
+    obj.sync()
+
+    row = obj.memoryUsage()
+    row.update(full=full, move=obj.dyStats["lastUpload"], pack=pack)
+
+    if obj._qPos is not None:
+        n = obj._dyCount * (2 if isinstance(obj, DynamicLines) else 1)
+        deq = dequantizeChunks(obj._qPos, obj._qChunks, n)
+        row["err"] = float(np.max(np.abs(deq - obj._datPos[:n])))
+    else:
+        row["err"] = 0.0
+    return row
+
+
+def reportPoints(cnt, pos, col, rows):
+    results = {}
+    for name, kw in POINT_FORMATS.items():
+        c = col if "palette" in kw else rows
+
+        def fill(o):
+            o.addMany(pos, c, 0.2)
+
+        def moveOne(o):
+            o.setPos(0, [1, 2, 3])
+
+        results[name] = measure(DynamicPoints(initCap=cnt, **kw), fill, moveOne)
+    return results
+
+
+def reportLines(cnt, pos, col, rows):
+    results = {}
+    half = cnt // 2
+    for name, kw in LINE_FORMATS.items():
+        c = col[:half] if "palette" in kw else rows[:half]
+
+        def fill(o):
+            o.addSegments(pos[:half], pos[half : half * 2], c)
+
+        # Lines can only append, the new segment stands in for a single change
+        def moveOne(o):
+            o.add([0, 0, 0], [1, 2, 3], "#ff0000")
+
+        results[name] = measure(DynamicLines(initCap=half + 1, **kw), fill, moveOne)
+    return results
+
+
+def printTable(title, cnt, results):
+    print(f"\n{title} ({cnt:,} items)")
+    print(
+        f"{'format':<20}{'cpu MB':>9}{'gpu MB':>9}{'full MB':>9}"
+        f"{'move KB':>9}{'B/item':>8}{'x less':>8}{'pack ms':>9}{'err':>10}"
+    )
+
+    base = results["float32"]["gpu"]
+    for name, r in results.items():
+        print(
+            f"{name:<20}{r['cpu'] / 1e6:>9.2f}{r['gpu'] / 1e6:>9.2f}"
+            f"{r['full'] / 1e6:>9.2f}{r['move'] / 1e3:>9.1f}"
+            f"{r['gpu'] / cnt:>8.1f}{base / r['gpu']:>8.2f}"
+            f"{r['pack'] * 1e3:>9.1f}{r['err']:>10.2e}"
+        )
+
+
+# endregion
+
+
+# region MAIN
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--count", type=int, default=1_000_000)
+    ap.add_argument("--out", help="Save results as JSON")
+    args = ap.parse_args()
+
+    cnt = args.count
+    pos, col, rows = makeData(cnt)
+
+    points = reportPoints(cnt, pos, col, rows)
+    lines = reportLines(cnt, pos, col, rows)
+    printTable("DynamicPoints", cnt, points)
+    printTable("DynamicLines, vertices", cnt, lines)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"count": cnt, "points": points, "lines": lines}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
+
+# endregion
@@ -0,0 +1,563 @@
+# Micro benchmarks for the maths package, runs offline with only numpy.
+# Run from the project root
+#   python -m proto.bench_maths                            : print results
+#   python -m proto.bench_maths --out base.json            : save results as JSON
+#   python -m proto.bench_maths --baseline base.json       : fail on regressions
+#   python -m proto.bench_maths --filter Quat --quick      : subset, smaller sizes
+#
+# Every case is timed as "scalar" (one python call per element, Vec3 / Quat / SVec3
+# etc. or a plain float into a module function) and "batch" (one call over an array
+# of n elements, Vec3Array / QuatArray etc. or an ndarray into a module function).
+# ns/op is time per element. alloc is the peak bytes allocated during one call as
+# seen by tracemalloc, which numpy reports its buffers to, per element as well.
+
+# region IMPORTS
+import argparse
+import inspect
+import json
+import math
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+import numpy as np
+from maths import (
+    Easing,
+    Gradient,
+    Lerp,
+    Maths,
+    Quat,
+    QuatArray,
+    SQuat,
+    SVec3,
+    Spline,
+    Transform,
+    TransformArray,
+    Vec3,
+    Vec3Array,
+)
+
+# endregion
+
+# region CONFIG
+SIZES = [1, 1_000, 100_000, 1_000_000]
+QUICK_SIZES = [1, 1_000]
+SCALAR_MAX = 1_000  # Scalar variants loop in python, larger sizes only add runtime
+MIN_TIME = 0.02  # Seconds each timing sample should at least run for
+SAMPLES = 3  # Best of
+
+# Module functions get 0.4 for every required argument unless overridden here,
+# by "function.arg" or just "arg". Overrides stay scalar in batch mode, everything
+# else becomes an ndarray.
+ARG_OVERRIDES = {
+    "min": 0.0,
+    "max": 1.0,
+    "minv": 0.0,
+    "maxv": 1.0,
+    "edge": 0.5,
+    "step": 0.25,
+    "tension": 0.0,
+    "bias": 0.0,
+    "jump": 6.0,
+    "offset": 1.0,
+    "betaDistCurve.a": 2.0,
+    "parabola.k": 0.5,
+    "sigmoid.k": 0.5,
+    "smoothMin.k": 0.5,
+}
+
+# Cases known not to run, by "group.op" or "group.op[mode]", with the reason. They
+# are saved as skipped, anything else that raises is saved as an error.
+SKIP_CASES = {
+    "Lerp.cosine": "uses np.PI, which numpy doesn't have",
+    "Lerp.clerp[batch]": "branches on end - start, scalars only",
+}
+
+# endregion
+
+# region CASES
+# A case builder takes the element count and returns {opName: callable}. Calling
+# the callable once processes all n elements.
+
+
+def vec3Cases(n: int, batch: bool) -> Dict[str, Callable]:
+    rng = np.random.default_rng(0)
+    q = Quat().fromAxisAngle(Vec3(1, 2, 3).norm(), 0.7)
+
+    if batch:
+        a = Vec3Array.fromBuffer(rng.standard_normal((n, 3)).astype(np.float32))
+        b = Vec3Array.fromBuffer(rng.uniform(0.9, 1.1, (n, 3)).astype(np.float32))
+        o = Vec3Array(n)
+        return {
+            "add": lambda: a.add(b, out=o),
+            "sub": lambda: a.sub(b, out=o),
+            "mul": lambda: a.mul(b, out=o),
+            "scale": lambda: a.scale(1.0001, out=o),
+            "norm": lambda: a.norm(out=o),
+            "negate": lambda: a.negate(out=o),
+            "min": lambda: a.minWith(b, out=o),
+            "max": lambda: a.maxWith(b, out=o),
+            "quatTransform": lambda: a.quatTransform(q, out=o),
+            "fromCross": lambda: o.fromCross(a, b),
+            "fromLerp": lambda: o.fromLerp(a, b, 0.3),
+            "dot": lambda: Vec3Array.dot(a, b),
+            "dist": lambda: Vec3Array.dist(a, b),
+        }
+
+    a = Vec3(1, 2, 3)
+    b = Vec3(1.0001, 0.9999, 1.0)
+    o = Vec3()
+    # In place ops run on a copy of a so its values don't drift over the calls,
+    # the copy is part of their time
+    return _loop(
+        n,
+        {
+            "add": lambda: o.copy(a).add(b),
+            "sub": lambda: o.copy(a).sub(b),
+            "mul": lambda: o.copy(a).mul(b),
+            "scale": lambda: o.copy(a).scale(1.0001),
+            "norm": lambda: o.copy(a).norm(),
+            "negate": lambda: o.copy(a).negate(),
+            "min": lambda: o.copy(a).min(b),
+            "max": lambda: o.copy(a).max(b),
+            "quatTransform": lambda: o.copy(a).quatTransform(q),
+            "fromCross": lambda: o.fromCross(a, b),
+            "fromLerp": lambda: o.fromLerp(a, b, 0.3),
+            "dot": lambda: Vec3.dot(a, b),
+            "dist": lambda: Vec3.dist(a, b),
+        },
+    )
+
+
+def svec3Cases(n: int, batch: bool) -> Dict[str, Callable]:
+    if batch:
+        return {}
+
+    q = SQuat().fromAxisAngle(SVec3(1, 2, 3).norm(), 0.7)
+    a = SVec3(1, 2, 3)
+    b = SVec3(1.0001, 0.9999, 1.0)
+    o = SVec3()
+    # In place ops run on a copy of a so its values don't drift over the calls,
+    # the copy is part of their time
+    return _loop(
+        n,
+        {
+            "add": lambda: o.copy(a).add(b),
+            "sub": lambda: o.copy(a).sub(b),
+            "mul": lambda: o.copy(a).mul(b),
+            "scale": lambda: o.copy(a).scale(1.0001),
+            "norm": lambda: o.copy(a).norm(),
+            "negate": lambda: o.copy(a).negate(),
+            "min": lambda: o.copy(a).min(b),
+            "max": lambda: o.copy(a).max(b),
+            "quatTransform": lambda: o.copy(a).quatTransform(q),
+            "fromCross": lambda: o.fromCross(a, b),
+            "fromLerp": lambda: o.fromLerp(a, b, 0.3),
+            "dot": lambda: SVec3.dot(a, b),
+            "dist": lambda: SVec3.dist(a, b),
+        },
+    )
+
+
+def quatCases(n: int, batch: bool) -> Dict[str, Callable]:
+    rng = np.random.default_rng(1)
+    axis = Vec3(1, 2, 3).norm()
+
+    if batch:
+        qa = rng.standard_normal((n, 4)).astype(np.float32)
+        qa /= np.linalg.norm(qa, axis=1, keepdims=True)
+        a = QuatArray.fromBuffer(qa)
+        b = QuatArray(n).fromAxisAngle(axis, 0.3)
+        o = QuatArray(n)
+        v = rng.standard_normal((n, 3)).astype(np.float32)
+        vo = np.empty_like(v)
+        tmp = np.empty((7, n), dtype=np.float32)
+        ang = rng.standard_normal(n)
+        single = Quat().fromAxisAngle(axis, 0.3)
+        return {
+            "mul": lambda: a.mul(b, out=o),
+            "pmul": lambda: a.pmul(b, out=o),
+            "invert": lambda: a.invert(out=o),
+            "norm": lambda: a.norm(out=o),
+            "dotNegate": lambda: a.dotNegate(b, out=o),
+            "fromAxisAngle": lambda: o.fromAxisAngle(axis, ang),
+            "fromEulerOrder": lambda: o.fromEulerOrder(ang, ang, ang),
+            "slerp": lambda: QuatArray.slerp(a, b, 0.3, o),
+            "nblend": lambda: QuatArray.nblend(a, b, 0.3, o),
+            "transformVec3": lambda: a.transformVec3(v, out=vo),
+            "batchTransformVec3": lambda: single.batchTransformVec3(v, axis, out=vo, tmp=tmp),
+        }
+
+    a = Quat().fromAxisAngle(axis, 0.5)
+    b = Quat().fromAxisAngle(axis, 0.3)
+    o = Quat()
+    v = Vec3(1, 2, 3)
+    vo = Vec3()
+    return _loop(
+        n,
+        {
+            "mul": lambda: o.fromMul(a, b),
+            "pmul": lambda: o.copy(a).pmul(b),
+            "invert": lambda: o.fromInvert(a),
+            "norm": lambda: a.norm(),
+            "dotNegate": lambda: a.dotNegate(b),
+            "fromAxisAngle": lambda: o.fromAxisAngle(axis, 0.3),
+            "fromEulerOrder": lambda: o.fromEulerOrder(0.1, 0.2, 0.3),
+            "slerp": lambda: Quat.slerp(a, b, 0.3, o),
+            "nblend": lambda: Quat.nblend(a, b, 0.3, o),
+            "transformVec3": lambda: a.transformVec3(v, vo),
+        },
+    )
+
+
+def squatCases(n: int, batch: bool) -> Dict[str, Callable]:
+    if batch:
+        return {}
+
+    axis = SVec3(1, 2, 3).norm()
+    a = SQuat().fromAxisAngle(axis, 0.5)
+    b = SQuat().fromAxisAngle(axis, 0.3)
+    o = SQuat()
+    v = SVec3(1, 2, 3)
+    vo = SVec3()
+    return _loop(
+        n,
+        {
+            "mul": lambda: o.fromMul(a, b),
+            "pmul": lambda: o.copy(a).pmul(b),
+            "invert": lambda: o.fromInvert(a),
+            "norm": lambda: a.norm(),
+            "dotNegate": lambda: a.dotNegate(b),
+            "fromAxisAngle": lambda: o.fromAxisAngle(axis, 0.3),
+            "fromEulerOrder": lambda: o.fromEulerOrder(0.1, 0.2, 0.3),
+            "slerp": lambda: SQuat.slerp(a, b, 0.3, o),
+            "nblend": lambda: SQuat.nblend(a, b, 0.3, o),
+            "transformVec3": lambda: a.transformVec3(v, vo),
+        },
+    )
+
+
+def transformCases(n: int, batch: bool) -> Dict[str, Callable]:
+    rng = np.random.default_rng(2)
+
+    if batch:
+        # Random tree, every node parented to an earlier one
+        parents = np.concatenate([[-1], rng.integers(0, np.arange(1, n))]) if n > 1 else [-1]
+        ta = TransformArray(n, parents)
+        ta.rot.fromAxisAngle(Vec3(0, 1, 0), rng.standard_normal(n))
+        ta.pos[:] = rng.standard_normal((n, 3))
+        tb = ta.clone()
+        o = TransformArray(n)
+        v = rng.standard_normal((n, 3)).astype(np.float32)
+        vo = np.empty_like(v)
+        return {
+            "fromMul": lambda: o.fromMul(ta, tb),
+            "fromInvert": lambda: o.fromInvert(ta),
+            "transformVec3": lambda: ta.transformVec3(v, vo),
+            "toWorld": lambda: ta.toWorld(o),
+        }
+
+    tp = Transform()
+    tp.rot.fromAxisAngle(Vec3(0, 1, 0), 0.5)
+    tp.pos.xyz(1, 2, 3)
+    tc = Transform().copy(tp)
+    o = Transform()
+    v = Vec3(1, 2, 3)
+    return _loop(
+        n,
+        {
+            "fromMul": lambda: o.fromMul(tp, tc),
+            "fromInvert": lambda: o.fromInvert(tp),
+            "transformVec3": lambda: tp.transformVec3(v, None),
+            "pmul": lambda: o.copy(tc).pmul(tp),
+        },
+    )
+
+
+def splineCases(n: int, batch: bool) -> Dict[str, Callable]:
+    rng = np.random.default_rng(4)
+    pts = rng.standard_normal((1_000, 3)).astype(np.float32)
+    spl = Spline(pts)
+    splK = Spline(pts, knots=np.sort(rng.uniform(0, 1, 1_000)))
+
+    arc = spl.arc
+
+    if batch:
+        u = rng.uniform(0, 1, n)
+        d = u * arc.length
+        p = spl.at(u) + rng.normal(0, 0.01, (n, 3)).astype(np.float32)
+        o = np.empty((n, 3), dtype=np.float32)
+        uo = np.empty(n)
+        return {
+            "at": lambda: spl.at(u, o),
+            "atKnots": lambda: splK.at(u, o),
+            "deriv": lambda: spl.deriv(u, 1, o),
+            "distToU": lambda: arc.distToU(d, out=uo),
+            "closestU": lambda: arc.closestU(p, hint=u, out=uo),
+        }
+
+    # Scalar path is the per sample Lerp call Spline replaces
+    a, b, c, d = pts[:4]
+    return _loop(
+        n,
+        {
+            "at": lambda: Lerp.cubicSmooth(a, b, c, d, 0.4),
+            "atKnots": lambda: splK.at(0.4),
+            "deriv": lambda: spl.deriv(0.4),
+            "distToU": lambda: arc.distToU(0.4 * arc.length),
+            "closestU": lambda: arc.closestU(pts[400], hint=0.4),
+        },
+    )
+
+
+# Every public function of a module (or just the ones in names), scalar args or
+# one ndarray per argument
+def moduleCases(mod, names=None) -> Callable[[int, bool], Dict[str, Callable]]:
+    def build(n: int, batch: bool) -> Dict[str, Callable]:
+        rng = np.random.default_rng(3)
+        rtn = {}
+
+        for name, fn in inspect.getmembers(mod, inspect.isfunction):
+            if name.startswith("_") or fn.__module__ != mod.__name__:
+                continue
+            if names is not None and name not in names:
+                continue
+
+            args = []
+            for p in inspect.signature(fn).parameters.values():
+                if p.default is not inspect.Parameter.empty or p.kind != p.POSITIONAL_OR_KEYWORD:
+                    continue
+                key = f"{name}.{p.name}"
+                if key in ARG_OVERRIDES:
+                    args.append(ARG_OVERRIDES[key])
+                elif p.name in ARG_OVERRIDES:
+                    args.append(ARG_OVERRIDES[p.name])
+                elif batch:
+                    args.append(rng.uniform(0.05, 0.95, n).astype(np.float32))
+                else:
+                    args.append(0.4)
+
+            call = _bind(fn, args)
+            rtn[name] = call if batch else _loop(n, {name: call})[name]
+
+        return rtn
+
+    return build
+
+
+GROUPS = {
+    "Vec3": vec3Cases,
+    "SVec3": svec3Cases,
+    "Quat": quatCases,
+    "SQuat": squatCases,
+    "Transform": transformCases,
+    "Spline": splineCases,
+    "Easing": moduleCases(Easing, Easing.CURVES),
+    "Gradient": moduleCases(Gradient),
+    "Lerp": moduleCases(Lerp),
+    "Maths": moduleCases(Maths, ("fract", "snap", "wrap", "norm", "spherical")),
+}
+
+# endregion
+
+# region MEASURING
+
+
+def _bind(fn: Callable, args: List) -> Callable:
+    return lambda: fn(*args)
+
+
+# Wrap scalar ops so one call runs them n times
+def _loop(n: int, ops: Dict[str, Callable]) -> Dict[str, Callable]:
+    def wrap(op: Callable) -> Callable:
+        def run():
+            for _ in range(n):
+                op()
+
+        return run
+
+    return {k: wrap(v) for k, v in ops.items()}
+
+
+# Best time of one call in seconds, calls are grouped so each sample runs MIN_TIME
+def timeCall(fn: Callable) -> float:
+    reps = 1
+    while True:
+        t = time.perf_counter()
+        for _ in range(reps):
+            fn()
+        dt = time.perf_counter() - t
+        if dt >= MIN_TIME or reps >= 1 << 20:
+            break
+        reps *= 2
+
+    best = dt / reps
+    for _ in range(SAMPLES - 1):
+        t = time.perf_counter()
+        for _ in range(reps):
+            fn()
+        best = min(best, (time.perf_counter() - t) / reps)
+    return best
+
+
+# Peak bytes allocated by one call, over the n elements it processes
+def allocCall(fn: Callable, n: int) -> float:
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return max(0, peak - base) / n
+
+
+def runCases(sizes: List[int], filter: str = "") -> Dict[str, dict]:
+    results = {}
+    for group, build in GROUPS.items():
+        for mode in ("scalar", "batch"):
+            for n in sizes:
+                if mode == "scalar" and n > SCALAR_MAX:
+                    continue
+
+                with np.errstate(all="ignore"):
+                    ops = build(n, mode == "batch")
+
+                for name, fn in ops.items():
+                    key = f"{group}.{name}[{mode},n={n}]"
+                    if filter and filter not in key:
+                        continue
+
+                    skip = SKIP_CASES.get(f"{group}.{name}[{mode}]")
+                    skip = skip or SKIP_CASES.get(f"{group}.{name}")
+                    if skip:
+                        results[key] = {"skipped": skip}
+                        print(f"{key:<52} skipped, {skip}")
+                        continue
+
+                    try:
+                        with np.errstate(all="ignore"):
+                            fn()  # warm up
+                    except Exception as e:
+                        results[key] = {"error": f"{type(e).__name__}: {e}"}
+                        print(f"{key:<52} ERROR {results[key]['error']}")
+                        continue
+
+                    with np.errstate(all="ignore"):
+                        sec = timeCall(fn)
+                        alloc = allocCall(fn, n)
+
+                    results[key] = {
+                        "ns": sec * 1e9 / n,
+                        "alloc": alloc,
+                    }
+                    print(f"{key:<52} {sec * 1e9 / n:12.2f} ns/op {alloc:12.2f} B/op")
+                    sys.stdout.flush()
+
+    return results
+
+
+# Size of a case from its key, "group.op[mode,n=1000]" is 1000
+def caseSize(key: str) -> int:
+    return int(key.rsplit("n=", 1)[1].rstrip("]"))
+
+
+# Every case slower (or allocating more) than baseline by more than threshold,
+# that errors, or that the baseline measured but this run didn't. expected picks
+# the baseline keys this run should have, all of them by default.
+def compare(
+    results: Dict[str, dict],
+    baseline: Dict[str, dict],
+    threshold: float,
+    expected: Callable[[str], bool] = None,
+) -> List[str]:
+    bad = []
+    for key, old in baseline.items():
+        if key in results or "ns" not in old:
+            continue
+        if expected is None or expected(key):
+            bad.append(f"{key}: missing from this run")
+
+    for key, cur in results.items():
+        old = baseline.get(key)
+        if "error" in cur:
+            bad.append(f"{key}: {cur['error']}")
+            continue
+        if not old or "ns" not in old:
+            continue
+        if "skipped" in cur:
+            bad.append(f"{key}: now skipped, {cur['skipped']}")
+            continue
+
+        if cur["ns"] > old["ns"] * (1 + threshold):
+            bad.append(f"{key}: {old['ns']:.2f} -> {cur['ns']:.2f} ns/op")
+
+        # Small slack over the whole call so a few bytes of python objects don't count
+        slack = 256 / caseSize(key)
+        if cur["alloc"] > old["alloc"] * (1 + threshold) + slack:
+            bad.append(f"{key}: {old['alloc']:.2f} -> {cur['alloc']:.2f} B/op alloc")
+
+    return bad
+
+
+# endregion
+
+# region RUN
+def main(argv: List[str] = None) -> int:
+    global MIN_TIME
+
+    ap = argparse.ArgumentParser(description="maths package micro benchmarks")
+    ap.add_argument("--out", help="Write results to this JSON file")
+    ap.add_argument("--baseline", help="Compare against a JSON file from --out")
+    ap.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown, 0.25 = 25%%")
+    ap.add_argument("--filter", default="", help="Only run cases whose key contains this")
+    ap.add_argument("--quick", action="store_true", help=f"Only sizes {QUICK_SIZES}")
+    ap.add_argument("--min-time", type=float, default=MIN_TIME, help="Seconds per sample")
+    args = ap.parse_args(argv)
+
+    MIN_TIME = args.min_time
+    sizes = QUICK_SIZES if args.quick else SIZES
+    results = runCases(sizes, args.filter)
+
+    if args.out:
+        doc = {
+            "meta": {
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "machine": platform.machine(),
+                "time": math.floor(time.time()),
+            },
+            "results": results,
+        }
+        with open(args.out, "w") as f:
+            json.dump(doc, f, indent=2, sort_keys=True)
+        print(f"Saved {len(results)} results to {args.out}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+
+        bad = compare(
+            results,
+            baseline,
+            args.threshold,
+            lambda key: args.filter in key and caseSize(key) in sizes,
+        )
+        if bad:
+            print(f"\n{len(bad)} regressions over {args.threshold:.0%} :")
+            for b in bad:
+                print(f"  {b}")
+            return 1
+
+        print(f"\nNo regressions over {args.threshold:.0%} against {args.baseline}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+# endregion
@@ -0,0 +1,75 @@
+# Benchmark Quat.batchTransformVec3 against the old per row loop
+# Run from the project root : python -m proto.bench_quat_batch
+
+# region IMPORTS
+import time
+import numpy as np
+from maths import Quat, Vec3
+
+# endregion
+
+# region SETUP
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+LOOP_LIMIT = 100_000  # Per row loop gets too slow past this size
+REPEAT = 5
+
+
+# The implementation batchTransformVec3 had before it was vectorized
+def loopTransformVec3(q, buf, translate):
+    out = buf.copy()
+    for i, v in enumerate(buf):
+        q.transformVec3(v, out[i])
+        out[i][0] = out[i][0] + translate[0]
+        out[i][1] = out[i][1] + translate[1]
+        out[i][2] = out[i][2] + translate[2]
+    return out
+
+
+# Best of REPEAT runs, in seconds
+def timeIt(fn, repeat=REPEAT):
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t)
+    return best
+
+
+# endregion
+
+# region RUN
+def main():
+    rng = np.random.default_rng(0)
+    q = Quat().fromAxisAngle(Vec3(1, 2, 3).norm(), 0.7)
+    pos = Vec3(1, 2, 3)
+
+    print(f"{'points':>10} {'loop ms':>10} {'batch ms':>10} {'inplace ms':>11} {'ns/pnt':>8} {'speedup':>8}")
+    for n in SIZES:
+        buf = rng.standard_normal((n, 3)).astype(np.float32)
+        out = np.empty_like(buf)
+        tmp = np.empty((7, n), dtype=np.float32)
+
+        batch = timeIt(lambda: q.batchTransformVec3(buf, pos, out=out, tmp=tmp))
+        inplace = timeIt(lambda: q.batchTransformVec3(out, pos, out=out, tmp=tmp))
+
+        if n <= LOOP_LIMIT:
+            loop = timeIt(lambda: loopTransformVec3(q, buf, pos), repeat=1)
+            ref = loopTransformVec3(q, buf, pos)
+            err = np.abs(ref - q.batchTransformVec3(buf, pos)).max()
+            assert err == 0, f"Batch result differs from loop by {err}"
+            loopTxt = f"{loop * 1e3:10.2f}"
+            speedTxt = f"{loop / batch:7.0f}x"
+        else:
+            loopTxt = f"{'-':>10}"
+            speedTxt = f"{'-':>8}"
+
+        print(
+            f"{n:>10} {loopTxt} {batch * 1e3:10.3f} {inplace * 1e3:11.3f}"
+            f" {batch * 1e9 / n:8.2f} {speedTxt}"
+        )
+
+
+if __name__ == "__main__":
+    main()
+
+# endregion